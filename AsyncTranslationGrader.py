@@ -0,0 +1,114 @@
+import argparse
+import asyncio
+import sys
+
+import Tokenizer
+import SuiteSections
+import LanguagePacks
+from BatchTranslationGrader import format_table
+from GradingResults import PartialResult
+from StreamingTranslationGrader import StreamingTranslationGrader, new_totals, add_line_result, summary_row
+
+"""
+    This program grades a translation of the GenderQueer test suite while it is being
+    produced, e.g. line by line by a decoding process, instead of waiting for the whole
+    translation file. It consumes an async iterator of (line_no, hypothesis) pairs, grades
+    each line with the section graders it belongs to (only_they, singular_we, we_they,
+    names and the terminology) as soon as it arrives, and keeps running totals of the
+    scores. The lines may arrive in any order, and a line which arrives again replaces the
+    earlier translation of it.
+
+    Every report_every lines, a PartialResult with the scores of the lines graded so far
+    is yielded, and a complete one when the iterator is exhausted. A checkpoint which is
+    doing badly can therefore be stopped early by breaking out of the loop:
+
+        async for partial in grade_async(hypotheses):
+            if partial.lines_graded >= 100 and partial.result.accuracy("pronouns", "overall") < 50:
+                break
+
+    The command line runs a decoding command and grades what it writes to stdout, one
+    translated example per line, printing the partial scores as it goes.
+
+    python AsyncTranslationGrader.py --report-every 50 -- python translate.py english_examples.txt
+"""
+
+REPORT_INTERVAL = 50
+
+async def grade_async(hypotheses, english_file="english_examples.txt", grader=None, report_every=REPORT_INTERVAL, system="partial"):
+    if grader is None:
+        grader = StreamingTranslationGrader()
+    with open(english_file, 'r', encoding='utf-8') as f:
+        english_lines = f.readlines()
+    sentence_count = grader.source_sentence_count(english_lines)
+
+    # The results by line number, so that a line which is sent again replaces its earlier
+    # result rather than being counted twice. The totals are then added up again.
+    line_results = {}
+    totals = new_totals()
+    lines_received = 0
+    async for line_no, hypothesis in hypotheses:
+        eng_line = english_lines[(line_no - 1) % len(english_lines)]
+        line_result = grader.grade_line(line_no, eng_line, hypothesis, sentence_count)
+        if line_no in line_results:
+            totals = None
+        elif totals is not None:
+            add_line_result(totals, line_result)
+        line_results[line_no] = line_result
+        lines_received += 1
+        if lines_received % report_every == 0:
+            if totals is None:
+                totals = sum_line_results(line_results)
+            yield PartialResult(len(line_results), summary_row(system, totals, grader.terminology_grader))
+        # Grading a line is short, but the decoding is given a chance to run between lines.
+        await asyncio.sleep(0)
+
+    if grader.cache is not None:
+        grader.cache.flush()
+    if totals is None:
+        totals = sum_line_results(line_results)
+    yield PartialResult(len(line_results), summary_row(system, totals, grader.terminology_grader), complete=True)
+
+def sum_line_results(line_results):
+    totals = new_totals()
+    for line_no in sorted(line_results):
+        add_line_result(totals, line_results[line_no])
+    return totals
+
+async def iter_stream_lines(reader, first_line_no=1):
+    # Turns an asyncio stream, e.g. the stdout of a subprocess, into (line_no, hypothesis) pairs.
+    line_no = first_line_no
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+        yield line_no, line.decode('utf-8')
+        line_no += 1
+
+async def grade_command(command, english_file, report_every, system):
+    process = await asyncio.create_subprocess_exec(*command, stdout=asyncio.subprocess.PIPE)
+    print(format_table([]))
+    async for partial in grade_async(iter_stream_lines(process.stdout), english_file, report_every=report_every, system=system):
+        label = "complete" if partial.complete else f"{partial.lines_graded} lines"
+        partial.result.system = f"{system} ({label})"
+        print(format_table([partial.result]).split("\n", 1)[1], flush=True)
+    return await process.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade a translation of the GenderQueer test suite while it is being produced.")
+    parser.add_argument("command", nargs="+", help="the decoding command, which writes one translated example per line to stdout")
+    parser.add_argument("--english", default="english_examples.txt", help="the English test suite")
+    parser.add_argument("--language", default=LanguagePacks.get_language(), help="the target language of the translations, see LanguagePacks.py")
+    parser.add_argument("--tokenizer", choices=sorted(Tokenizer.BACKENDS), help="the tokenizer backend, see Tokenizer.py, that of the language pack by default")
+    parser.add_argument("--sections", default=SuiteSections.manifest_path, help="the section manifest of the test suite, see SuiteSections.py")
+    parser.add_argument("--report-every", type=int, default=REPORT_INTERVAL, help="print the scores every this many lines")
+    parser.add_argument("--system", default="translation", help="the name of the system in the table")
+    args = parser.parse_args()
+    LanguagePacks.set_language(args.language)
+    if args.tokenizer:
+        Tokenizer.set_backend(args.tokenizer)
+    SuiteSections.set_manifest(args.sections)
+
+    sys.exit(asyncio.run(grade_command(args.command, args.english, args.report_every, args.system)))
+
+if __name__ == "__main__":
+    main()
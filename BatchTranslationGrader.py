@@ -0,0 +1,242 @@
+import argparse
+import glob
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import repeat
+
+import Tokenizer
+import SuiteSections
+import LanguagePacks
+import PronounTranslationGrader
+import GenderedAdjectivesTranslationGrader
+from LGBTQAITranslationGrader import LGBTQAITranslationGrader
+from ExampleIndex import load_example_index
+from References import load_references
+from LineCorpus import LineCorpus
+from GradingResults import GradingResult, render_text, to_json, write_csv, write_parquet
+
+"""
+    This program grades the translations of several MT systems in one pass. The English
+    test suite is parsed, the subjects of the examples are identified and the adjective and
+    terminology databases are loaded only once. The translations of each system are then
+    graded by all three graders against this shared state and the scores are returned as
+    one combined table, with one row per system.
+
+    The English side of the test suite is read from a compiled example index (see
+    ExampleIndex.py), which is only rebuilt when the examples or the databases change.
+
+    The systems are given either as a directory containing one txt file per system or as
+    a glob pattern, e.g. "wmt24/en-is/*.txt". Several directories and patterns can be given.
+
+    With --workers, the systems and the sections of the test suite are graded in parallel
+    on several cores. The scores are the same as when grading on a single core. With
+    --vectorized, the pronouns of all the systems are graded at once with NumPy.
+
+    With --references, the pronoun and adjective forms used in reference translations of
+    the test suite are given full points as well (see References.py).
+
+    With --language, the translations are graded with the pronouns and the databases of
+    the language pack of another target language than Icelandic (see LanguagePacks.py).
+
+    The scores are printed as a table by default. With --format they can instead be
+    written as a report per system or as JSON, CSV or Parquet (see GradingResults.py).
+
+    python BatchTranslationGrader.py wmt24/en-is/ --workers 8 --output scores.tsv
+"""
+
+# The columns of the table and the (grader, category) of the score shown in each of them.
+TABLE_COLUMNS = {
+    "overall_pronoun_accuracy": ("pronouns", "overall"),
+    "long_accuracy": ("pronouns", "long"),
+    "short_accuracy": ("pronouns", "short"),
+    "singular_they_accuracy": ("pronouns", "singular_they"),
+    "feminine_pronoun_accuracy": ("pronouns", "feminine"),
+    "masculine_pronoun_accuracy": ("pronouns", "masculine"),
+    "neuter_pronoun_accuracy": ("pronouns", "neuter"),
+    "adjectives_accuracy": ("adjectives", "overall"),
+    "terminology_accuracy": ("terminology", "correct"),
+    "inappropriate_terminology": ("terminology", "inappropriate"),
+}
+
+def find_system_files(patterns):
+    system_files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "*.txt"))
+        else:
+            matches = glob.glob(pattern)
+        for path in sorted(matches):
+            if path not in system_files:
+                system_files.append(path)
+    return system_files
+
+def load_shared_state(english_file="english_examples.txt", adjectives_file=None, terminology_file=None, reference_files=None, language=None):
+    # The databases of the language pack (see LanguagePacks.py) are used unless others are
+    # given. Without a language, that of the current pack.
+    pack = LanguagePacks.set_language(language)
+    adjective_index = pack["adjective_index"] if adjectives_file is None else GenderedAdjectivesTranslationGrader.build_adjective_index(GenderedAdjectivesTranslationGrader.load_adjective_database(adjectives_file))
+    terminology_grader = pack["terminology_grader"] if terminology_file is None else LGBTQAITranslationGrader(show_details=False, terminology_path=terminology_file)
+    adjectives_file = adjectives_file or pack["adjectives_file"]
+    terminology_file = terminology_file or pack["terminology_file"]
+    example_index = load_example_index(english_file, adjectives_file, terminology_file)
+    with open(english_file, 'r', encoding='utf-8') as f:
+        english_lines = f.readlines()
+
+    return {
+        "pronoun_source": example_index["pronoun_source"],
+        "adjective_source": example_index["adjective_source"],
+        "adjective_index": adjective_index,
+        # The pronouns of the language of the translations, see PronounTranslationGrader.pronoun_tokens.
+        "pronoun_forms": pack["pronoun_forms"],
+        "terminology_grader": terminology_grader,
+        "english_lines": english_lines,
+        "line_terms": example_index["line_terms"],
+        "references": load_references(reference_files, adjectives_file, pack) if reference_files else None,
+    }
+
+def section_references(state, grader):
+    # The forms used in the reference translations of each line of each section of the
+    # pronoun or adjective grader, see References.py.
+    if state["references"] is None:
+        return repeat(None)
+    if grader == "pronouns":
+        return PronounTranslationGrader.split_sections(state["references"]["pronouns"])
+    return GenderedAdjectivesTranslationGrader.split_sections(state["references"]["adjectives"])
+
+def read_system_file(icelandic_file):
+    # The lines are read lazily, as they are graded, see LineCorpus.py.
+    return LineCorpus(icelandic_file)
+
+def system_name(icelandic_file):
+    return os.path.splitext(os.path.basename(icelandic_file))[0]
+
+def build_result(system, pronoun_partials, adjective_partials, terminology_totals, terminology_grader):
+    pronoun_counts, pronoun_correct = PronounTranslationGrader.merge_pronoun_counters(pronoun_partials)
+    pronoun_results = PronounTranslationGrader.compute_accuracies(pronoun_counts, pronoun_correct)
+    adjective_results, adjectives_correct, total_adjectives = GenderedAdjectivesTranslationGrader.merge_results(adjective_partials)
+    total_terms, total_correct, total_inappropriate, _ = terminology_totals
+    return GradingResult(system, PronounTranslationGrader.build_scores(pronoun_results, pronoun_counts, pronoun_correct)
+                         + GenderedAdjectivesTranslationGrader.build_scores(adjective_results, adjectives_correct, total_adjectives)
+                         + terminology_grader.build_scores(total_terms, total_correct, total_inappropriate))
+
+def grade_system(icelandic_file, state, pronoun_partials=None):
+    return grade_translation(system_name(icelandic_file), read_system_file(icelandic_file), state, pronoun_partials)
+
+def grade_translation(system, icelandic_lines, state, pronoun_partials=None):
+    # pronoun_partials can hold the pronoun counters of the system if they have already
+    # been computed, e.g. by VectorizedPronounGrader.py.
+    if pronoun_partials is None:
+        pronoun_partials = [PronounTranslationGrader.grade_section(section, section_lines, state["pronoun_source"], accepted, state["pronoun_forms"])
+                            for section, section_lines, accepted in zip(PronounTranslationGrader.SECTIONS, PronounTranslationGrader.split_sections(icelandic_lines), section_references(state, "pronouns"))]
+    adjective_partials = [GenderedAdjectivesTranslationGrader.grade_section(section, section_lines, state["adjective_source"], state["adjective_index"], accepted)
+                          for section, section_lines, accepted in zip(GenderedAdjectivesTranslationGrader.SECTIONS, GenderedAdjectivesTranslationGrader.split_sections(icelandic_lines), section_references(state, "adjectives"))]
+    terminology_totals = state["terminology_grader"].grade_lines(state["english_lines"], icelandic_lines, state["line_terms"])
+
+    return build_result(system, pronoun_partials, adjective_partials, terminology_totals, state["terminology_grader"])
+
+def initialize_worker(backend, language, manifest_path):
+    # The settings of the main process, which a worker that is not forked from it lacks.
+    LanguagePacks.set_language(language)
+    Tokenizer.set_backend(backend)
+    SuiteSections.set_manifest(manifest_path)
+
+def grade_systems_parallel(system_files, state, workers=None, systems_pronoun_partials=None):
+    # Every (system, section) pair is graded as a separate task. The futures are kept in
+    # the order they were submitted and merged in that order, so the table is identical
+    # to the one produced by grading the systems one at a time.
+    with ProcessPoolExecutor(max_workers=workers, initializer=initialize_worker, initargs=(Tokenizer.get_backend(), LanguagePacks.get_language(), SuiteSections.manifest_path)) as executor:
+        submitted = []
+        for i, icelandic_file in enumerate(system_files):
+            icelandic_lines = read_system_file(icelandic_file)
+            if systems_pronoun_partials is None:
+                pronoun_futures = [executor.submit(PronounTranslationGrader.grade_section, section, section_lines, state["pronoun_source"], accepted, state["pronoun_forms"])
+                                   for section, section_lines, accepted in zip(PronounTranslationGrader.SECTIONS, PronounTranslationGrader.split_sections(icelandic_lines), section_references(state, "pronouns"))]
+            else:
+                pronoun_futures = [completed_future(partial) for partial in systems_pronoun_partials[i]]
+            adjective_futures = [executor.submit(GenderedAdjectivesTranslationGrader.grade_section, section, section_lines, state["adjective_source"], state["adjective_index"], accepted)
+                                 for section, section_lines, accepted in zip(GenderedAdjectivesTranslationGrader.SECTIONS, GenderedAdjectivesTranslationGrader.split_sections(icelandic_lines), section_references(state, "adjectives"))]
+            terminology_future = executor.submit(state["terminology_grader"].grade_lines, state["english_lines"], icelandic_lines, state["line_terms"])
+            submitted.append((icelandic_file, pronoun_futures, adjective_futures, terminology_future))
+
+        return [build_result(system_name(icelandic_file),
+                             [future.result() for future in pronoun_futures],
+                             [future.result() for future in adjective_futures],
+                             terminology_future.result(),
+                             state["terminology_grader"])
+                for icelandic_file, pronoun_futures, adjective_futures, terminology_future in submitted]
+
+def completed_future(result):
+    future = Future()
+    future.set_result(result)
+    return future
+
+def grade_pronouns_vectorized(system_files, state):
+    # NumPy is only needed, and only imported, when the pronouns are graded with
+    # VectorizedPronounGrader.py.
+    import VectorizedPronounGrader
+    weights = VectorizedPronounGrader.build_weights(state["pronoun_source"], state["references"])
+    return [[counters] for counters in VectorizedPronounGrader.grade_systems([read_system_file(icelandic_file) for icelandic_file in system_files], weights, state["pronoun_forms"])]
+
+def grade_systems(patterns, english_file="english_examples.txt", adjectives_file=None, workers=1, terminology_file=None, vectorized=False, reference_files=None, language=None):
+    state = load_shared_state(english_file, adjectives_file, terminology_file, reference_files, language)
+    system_files = find_system_files(patterns)
+    systems_pronoun_partials = grade_pronouns_vectorized(system_files, state) if vectorized else None
+    if workers == 1:
+        if systems_pronoun_partials is None:
+            return [grade_system(icelandic_file, state) for icelandic_file in system_files]
+        return [grade_system(icelandic_file, state, pronoun_partials) for icelandic_file, pronoun_partials in zip(system_files, systems_pronoun_partials)]
+    return grade_systems_parallel(system_files, state, workers, systems_pronoun_partials)
+
+def format_table(results, separator="\t"):
+    lines = [separator.join(["system"] + list(TABLE_COLUMNS))]
+    for result in results:
+        lines.append(separator.join([result.system] + [f"{result.accuracy(grader, category):.2f}" for grader, category in TABLE_COLUMNS.values()]))
+    return "\n".join(lines)
+
+def write_results(results, output_format, output_file=None):
+    if output_format == "csv":
+        write_csv(results, output_file)
+        return
+    elif output_format == "parquet":
+        write_parquet(results, output_file)
+        return
+    elif output_format == "json":
+        output = to_json(results, indent=2)
+    elif output_format == "text":
+        output = "\n\n".join(f"{result.system}\n{render_text(result)}" for result in results)
+    else:
+        output = format_table(results)
+
+    if output_file:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade the translations of several MT systems on the GenderQueer test suite.")
+    parser.add_argument("systems", nargs="+", help="directories or glob patterns of translation files, one file per system")
+    parser.add_argument("--english", default="english_examples.txt", help="the English test suite")
+    parser.add_argument("--language", default=LanguagePacks.get_language(), help="the target language of the translations, see LanguagePacks.py")
+    parser.add_argument("--adjectives", help="the adjective database, that of the language pack by default")
+    parser.add_argument("--terminology", help="the LGBTQAI+ terminology database, that of the language pack by default")
+    parser.add_argument("--tokenizer", choices=sorted(Tokenizer.BACKENDS), help="the tokenizer backend, see Tokenizer.py, that of the language pack by default")
+    parser.add_argument("--sections", default=SuiteSections.manifest_path, help="the section manifest of the test suite, see SuiteSections.py")
+    parser.add_argument("--references", nargs="+", help="reference translations of the test suite whose pronoun and adjective forms are also given full points, see References.py")
+    parser.add_argument("--vectorized", action="store_true", help="grade the pronouns of all systems at once with NumPy, see VectorizedPronounGrader.py")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes, 0 to use all cores")
+    parser.add_argument("--format", default="table", choices=["table", "text", "json", "csv", "parquet"], help="the output format, csv and parquet require --output")
+    parser.add_argument("--output", help="write the scores to this file instead of printing them")
+    args = parser.parse_args()
+    if args.format in ("csv", "parquet") and not args.output:
+        parser.error(f"--format {args.format} requires --output")
+    LanguagePacks.set_language(args.language)
+    if args.tokenizer:
+        Tokenizer.set_backend(args.tokenizer)
+    SuiteSections.set_manifest(args.sections)
+
+    results = grade_systems(args.systems, args.english, args.adjectives, args.workers or None, args.terminology, args.vectorized, args.references, args.language)
+    write_results(results, args.format, args.output)
+
+if __name__ == "__main__":
+    main()
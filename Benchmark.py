@@ -0,0 +1,267 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import Tokenizer
+import PronounTranslationGrader
+import GenderedAdjectivesTranslationGrader
+from LGBTQAITranslationGrader import LGBTQAITranslationGrader, RULES_KEY
+from StreamingTranslationGrader import StreamingTranslationGrader, new_totals, add_line_result
+
+"""
+    This program measures how fast the graders are and how they scale. It generates
+    synthetic corpora made of 10 to 10,000 copies of the gold standard translation, in
+    which the pronouns are swapped and words repeated at random so that the lines differ
+    between copies, and enlarged versions of the adjective and terminology databases,
+    padded with made-up entries. Each corpus is graded with the streaming grader in a
+    separate process, which reports its throughput (lines per second) and peak memory
+    use, and the time spent in each stage of the grading: tokenization, identification of
+    the subjects, matching of the adjectives and matching of the LGBTQAI+ terms. The
+    graders' own entry points (analyze_translations, grade_files and identify_terms) are
+    also timed on the test suite itself.
+
+    The generated corpora are the same for the same seed. The results are saved as a JSON
+    file, and --compare prints the change in throughput against an earlier result file.
+
+    python Benchmark.py --scales 10,100,1000 --db-factors 1,10 --output bench_results/current.json
+    python Benchmark.py --scales 10,100 --compare bench_results/previous.json
+"""
+
+STAGES = ["tokenization", "subject_identification", "adjective_matching", "terminology_matching"]
+DEFAULT_SCALES = [10, 100]
+DEFAULT_DB_FACTORS = [1, 10]
+RESULTS_DIRECTORY = "bench_results"
+
+# Random changes made to the lines of each copy of the gold standard.
+SWAPS = {"þær": ["þeir", "þau", "hán"], "þeir": ["þær", "þau"], "þau": ["þær", "þeir", "hán"], "hán": ["þau", "hún", "hann"],
+         "hún": ["hán", "þær"], "hann": ["hán", "þeir"], "transkona": ["trans kona", "kynskiptingur"], "samkynhneigðir": ["hommar"]}
+
+def perturb_line(line, rng):
+    words = line.rstrip("\n").split(" ")
+    for i, word in enumerate(words):
+        if word in SWAPS and rng.random() < 0.3:
+            words[i] = rng.choice(SWAPS[word])
+    position = rng.randrange(len(words))
+    words.insert(position, words[position])
+    return " ".join(words) + "\n"
+
+def generate_corpus(gold_file, output_file, scale, seed=0):
+    with open(gold_file, 'r', encoding='utf-8') as f:
+        gold_lines = f.readlines()
+    rng = random.Random(seed)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for _ in range(scale):
+            f.writelines(perturb_line(line, rng) for line in gold_lines)
+
+def enlarge_adjectives(adjectives_file, output_file, factor):
+    with open(adjectives_file, 'r', encoding='utf-8') as f:
+        adj_database = json.load(f)
+    enlarged = list(adj_database)
+    for copy in range(1, factor):
+        for adj in adj_database:
+            suffix = f"x{copy}"
+            new_adj = {key: [form + suffix for form in value] if isinstance(value, list) else value for key, value in adj.items()}
+            new_adj['english'] = adj['english'] + suffix
+            enlarged.append(new_adj)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(enlarged, f, ensure_ascii=False)
+
+def enlarge_terminology(terminology_file, output_file, factor):
+    with open(terminology_file, 'r', encoding='utf-8') as f:
+        terminology_db = json.load(f)
+    enlarged = dict(terminology_db)
+    for copy in range(1, factor):
+        for term, translations in terminology_db.items():
+            if term == RULES_KEY:
+                continue
+            suffix = f"x{copy}"
+            enlarged[term + suffix] = {kind: [form + suffix for form in forms] for kind, forms in translations.items()}
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(enlarged, f, ensure_ascii=False)
+
+def iter_copies(icelandic_file, suite_length):
+    with open(icelandic_file, 'r', encoding='utf-8') as f:
+        copy = []
+        for line in f:
+            copy.append(line)
+            if len(copy) == suite_length:
+                yield copy
+                copy = []
+        if copy:
+            yield copy
+
+def time_stages(english_lines, icelandic_file, adjectives_file, terminology_file):
+    # Each stage is timed on its own, one copy of the test suite at a time.
+    adj_database = GenderedAdjectivesTranslationGrader.load_adjective_database(adjectives_file)
+    adjective_index = GenderedAdjectivesTranslationGrader.build_adjective_index(adj_database)
+    terminology_grader = LGBTQAITranslationGrader(terminology_path=terminology_file)
+    adjective_english = [line for lines in GenderedAdjectivesTranslationGrader.split_sections(english_lines) for line in lines]
+    timings = dict.fromkeys(STAGES, 0.0)
+
+    for icelandic_lines in iter_copies(icelandic_file, len(english_lines)):
+        start = time.perf_counter()
+        for line in icelandic_lines:
+            Tokenizer.word_tokenize(line.lower())
+            Tokenizer.sent_tokenize(line)
+        timings["tokenization"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for section, lines in zip(PronounTranslationGrader.SECTIONS, PronounTranslationGrader.split_sections(english_lines)):
+            for line in lines:
+                PronounTranslationGrader.analyze_source_line(section, line)
+        timings["subject_identification"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for eng_line, ice_line in zip(adjective_english, [line for lines in GenderedAdjectivesTranslationGrader.split_sections(icelandic_lines) for line in lines]):
+            GenderedAdjectivesTranslationGrader.find_adjectives(eng_line, adj_database)
+            GenderedAdjectivesTranslationGrader.find_adjective_forms(Tokenizer.word_tokenize(ice_line.lower()), adjective_index)
+        timings["adjective_matching"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        terminology_grader.grade_lines(english_lines, icelandic_lines, terminology_grader.identify_line_terms(english_lines))
+        timings["terminology_matching"] += time.perf_counter() - start
+
+    return timings
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_benchmark(english_file, icelandic_file, adjectives_file, terminology_file, tokenizer):
+    # Runs in a fresh process, so that the peak memory use is that of this run only.
+    Tokenizer.set_backend(tokenizer)
+    with open(english_file, 'r', encoding='utf-8') as f:
+        english_lines = f.readlines()
+
+    start = time.perf_counter()
+    grader = StreamingTranslationGrader(adjectives_file, terminology_file)
+    totals = new_totals()
+    line_count = 0
+    for line_result in grader.grade_files(english_file, icelandic_file):
+        add_line_result(totals, line_result)
+        line_count += 1
+    seconds = time.perf_counter() - start
+
+    Tokenizer.set_backend(tokenizer)
+    stages = time_stages(english_lines, icelandic_file, adjectives_file, terminology_file)
+    return {
+        "lines": line_count,
+        "seconds": seconds,
+        "lines_per_second": line_count / seconds if seconds > 0 else 0,
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": stages,
+    }
+
+def time_function(function, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def time_entry_points(english_file, icelandic_file, adjectives_file, terminology_file, tokenizer, repeat=5):
+    # The best of several runs of the graders' own entry points on the test suite.
+    Tokenizer.set_backend(tokenizer)
+    pronoun_lines = PronounTranslationGrader.load_text_files(icelandic_file, english_file)
+    adjective_lines = GenderedAdjectivesTranslationGrader.load_text_files(icelandic_file, english_file)
+    adj_database = GenderedAdjectivesTranslationGrader.load_adjective_database(adjectives_file)
+    terminology_grader = LGBTQAITranslationGrader(terminology_path=terminology_file)
+    with open(english_file, 'r', encoding='utf-8') as f:
+        english_text = f.read()
+
+    return {
+        "PronounTranslationGrader.analyze_translations": time_function(lambda: PronounTranslationGrader.analyze_translations(*pronoun_lines), repeat),
+        "GenderedAdjectivesTranslationGrader.analyze_translations": time_function(lambda: GenderedAdjectivesTranslationGrader.analyze_translations(*adjective_lines, adj_database), repeat),
+        "LGBTQAITranslationGrader.grade_files": time_function(lambda: terminology_grader.grade_files(english_file, icelandic_file), repeat),
+        "LGBTQAITranslationGrader.identify_terms": time_function(lambda: terminology_grader.identify_terms(english_text), repeat),
+    }
+
+def version_info():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "python": platform.python_version(), "platform": platform.platform(), "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+def run_all(scales, db_factors, tokenizer, seed=0, english_file="english_examples.txt", gold_file="gold_standard.txt",
+            adjectives_file="adjectives.json", terminology_file="terminology.json"):
+    work_directory = tempfile.mkdtemp(prefix="genderqueer_bench_")
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    try:
+        with context.Pool(1) as pool:
+            entry_points = pool.apply(time_entry_points, (english_file, gold_file, adjectives_file, terminology_file, tokenizer))
+        for db_factor in db_factors:
+            enlarged_adjectives = os.path.join(work_directory, f"adjectives_{db_factor}.json")
+            enlarged_terminology = os.path.join(work_directory, f"terminology_{db_factor}.json")
+            enlarge_adjectives(adjectives_file, enlarged_adjectives, db_factor)
+            enlarge_terminology(terminology_file, enlarged_terminology, db_factor)
+            for scale in scales:
+                corpus_file = os.path.join(work_directory, f"corpus_{scale}.txt")
+                if not os.path.exists(corpus_file):
+                    generate_corpus(gold_file, corpus_file, scale, seed)
+                # A new process per run, so that neither memory nor cached tokens carry over.
+                with context.Pool(1) as pool:
+                    run = pool.apply(run_benchmark, (english_file, corpus_file, enlarged_adjectives, enlarged_terminology, tokenizer))
+                run.update({"scale": scale, "db_factor": db_factor})
+                runs.append(run)
+                print(f"scale {scale:>6} db x{db_factor:<4} {run['lines']:>9} lines {run['lines_per_second']:>10.0f} lines/s {run['peak_rss_mb']:>8.1f} MB", flush=True)
+    finally:
+        shutil.rmtree(work_directory, ignore_errors=True)
+
+    return {"version": version_info(), "tokenizer": tokenizer, "seed": seed, "entry_points": entry_points, "runs": runs}
+
+def compare(results, previous):
+    previous_runs = {(run["scale"], run["db_factor"]): run for run in previous["runs"]}
+    lines = [f"Compared with {previous['version'].get('commit') or 'an earlier run'} ({previous['version'].get('time')}):"]
+    for run in results["runs"]:
+        old_run = previous_runs.get((run["scale"], run["db_factor"]))
+        if old_run is None or not old_run["lines_per_second"]:
+            continue
+        ratio = run["lines_per_second"] / old_run["lines_per_second"]
+        lines.append(f"scale {run['scale']:>6} db x{run['db_factor']:<4} {old_run['lines_per_second']:>10.0f} -> {run['lines_per_second']:>10.0f} lines/s ({ratio:.2f}x)")
+    for name, seconds in results["entry_points"].items():
+        old_seconds = previous.get("entry_points", {}).get(name)
+        if old_seconds:
+            lines.append(f"{name}: {old_seconds * 1000:.2f} -> {seconds * 1000:.2f} ms ({old_seconds / seconds:.2f}x)")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the GenderQueer test suite graders on synthetic corpora.")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)), help="comma-separated numbers of copies of the test suite in the corpora")
+    parser.add_argument("--db-factors", default=",".join(map(str, DEFAULT_DB_FACTORS)), help="comma-separated sizes of the databases, as multiples of the real ones")
+    parser.add_argument("--tokenizer", default=Tokenizer.get_backend(), choices=sorted(Tokenizer.BACKENDS), help="the tokenizer backend, see Tokenizer.py")
+    parser.add_argument("--seed", type=int, default=0, help="the seed of the synthetic corpora")
+    parser.add_argument("--output", help=f"the result file, by default a new file in {RESULTS_DIRECTORY}/")
+    parser.add_argument("--compare", help="an earlier result file to compare with")
+    args = parser.parse_args()
+
+    results = run_all([int(scale) for scale in args.scales.split(",")], [int(factor) for factor in args.db_factors.split(",")], args.tokenizer, args.seed)
+    for name, seconds in results["entry_points"].items():
+        print(f"{name}: {seconds * 1000:.2f} ms")
+
+    output_file = args.output or os.path.join(RESULTS_DIRECTORY, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    if os.path.dirname(output_file):
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {output_file}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            print(compare(results, json.load(f)))
+
+if __name__ == "__main__":
+    main()
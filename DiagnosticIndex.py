@@ -0,0 +1,234 @@
+import argparse
+import os
+import sqlite3
+
+import Tokenizer
+import LineCache
+import SuiteSections
+import LanguagePacks
+import PronounTranslationGrader
+import GenderedAdjectivesTranslationGrader
+from PronounCounters import by_name
+from ExampleIndex import expected_pronouns, adjective_slots
+from BatchTranslationGrader import find_system_files
+from LineCorpus import LineCorpus
+from StreamingTranslationGrader import StreamingTranslationGrader
+
+"""
+    This program keeps the evidence behind the grade of every line of every system in an
+    SQLite database, so that the reasons for a score can be looked up without grading the
+    translations again, e.g. which translations of the neuter_cis_children examples a
+    system got wrong and which pronouns it used instead.
+
+    Each line of a translation has one evidence record per category it counts towards:
+    the pronoun categories (neuter_cis_children, long, ...), the adjective genders and
+    sentiments (neuter_negative, ...) and the LGBTQAI+ terms (correct, inappropriate,
+    missing or the kind of the scoring rule which applied, e.g. warning, with the term).
+    A record holds the forms expected by the grader, the forms found in the translation,
+    the points awarded and the points possible.
+    The records are indexed by grader and category and by system and line, so analyses
+    across many systems are queries rather than re-grades. The index is kept in the user's
+    cache (see LineCache.py) unless another file is chosen with --index.
+
+    python DiagnosticIndex.py build wmt24/en-is/
+    python DiagnosticIndex.py query --category neuter_cis_children --missed
+    python DiagnosticIndex.py summary --grader pronouns --category neuter_cis_children
+"""
+
+DEFAULT_INDEX_FILE = os.path.join(LineCache.cache_directory("diagnostics"), "diagnostics.sqlite")
+PRONOUN_SET = frozenset(PronounTranslationGrader.PRONOUNS)
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS systems (id INTEGER PRIMARY KEY, name TEXT UNIQUE, file TEXT)",
+    "CREATE TABLE IF NOT EXISTS lines (system_id INTEGER, line INTEGER, copy INTEGER, example INTEGER, pronoun_section TEXT, adjective_section TEXT, translation TEXT, PRIMARY KEY (system_id, line))",
+    "CREATE TABLE IF NOT EXISTS evidence (system_id INTEGER, line INTEGER, grader TEXT, category TEXT, item TEXT, expected TEXT, matched TEXT, points REAL, total REAL)",
+    "CREATE INDEX IF NOT EXISTS evidence_category ON evidence (grader, category, system_id)",
+    "CREATE INDEX IF NOT EXISTS evidence_line ON evidence (system_id, line)",
+]
+
+def pronoun_evidence(grader, line_result, eng_line, ice_line, sentence_count):
+    section = line_result.pronoun_section
+    line_source = grader.analyze_pronoun_line(section, eng_line)
+    subject = line_source if section == "we_they" else line_source[0]
+    expected = dict(expected_pronouns(section, subject))
+    accepted = grader.accepted_pronouns(section, eng_line, line_result.example - 1, sentence_count)
+    if accepted:
+        expected.update(dict.fromkeys(accepted - expected.keys(), 1))
+    tokens = PronounTranslationGrader.graded_tokens(section, line_source, ice_line, sentence_count, grader.pronoun_forms)
+    expected_text = " ".join(f"{form}={points:g}" for form, points in expected.items())
+    matched_text = " ".join(token for token in tokens if token in PRONOUN_SET)
+    correct = by_name(line_result.pronoun_correct)
+    return [("pronouns", category, None, expected_text, matched_text, correct[category], count)
+            for category, count in by_name(line_result.pronoun_counts, nonzero=True).items()]
+
+def adjective_evidence(grader, line_result, eng_line, ice_line):
+    section = line_result.adjective_section
+    subject, adjectives = grader.analyze_adjective_line(section, eng_line)
+    slots = adjective_slots(section, subject, adjectives)
+    forms = grader.adjective_index["forms"]
+    tokens = GenderedAdjectivesTranslationGrader.graded_tokens(section, ice_line)
+    expected_text = " ".join(f"{english}:{slot}={points:g}" for english, slot, points in slots)
+    matched_text = " ".join(f"{token}:{english}:{slot}" for token in tokens if token in forms for english, slot, _ in forms[token] if english in adjectives)
+    analysis = line_result.adjective_analysis
+    records = []
+    for gender, sentiments in analysis["adjective_counts"].items():
+        for sentiment, count in sentiments.items():
+            if count:
+                item = " ".join(english for english in adjectives if grader.adjective_index["sentiments"][english] == sentiment)
+                records.append(("adjectives", f"{gender}_{sentiment}", item, expected_text, matched_text, analysis["translation_analysis"][gender][sentiment], count))
+    return records
+
+def term_evidence(line_result):
+    # The points are those given by the terminology grader, see its scoring rules.
+    return [("terminology", term_grade.kind, term_grade.term, None, term_grade.form, term_grade.points, 1) for term_grade in line_result.term_details]
+
+def line_evidence(grader, line_result, eng_line, ice_line, sentence_count):
+    records = []
+    if line_result.pronoun_section is not None:
+        records += pronoun_evidence(grader, line_result, eng_line, ice_line, sentence_count)
+    if line_result.adjective_section is not None:
+        records += adjective_evidence(grader, line_result, eng_line, ice_line)
+    return records + term_evidence(line_result)
+
+class DiagnosticIndex:
+    def __init__(self, index_file=DEFAULT_INDEX_FILE):
+        directory = os.path.dirname(index_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(index_file)
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            for statement in SCHEMA:
+                self.connection.execute(statement)
+
+    def add_system(self, icelandic_file, grader, english_lines, name=None):
+        # Grades the translation line by line and replaces the records of the system.
+        if name is None:
+            name = os.path.splitext(os.path.basename(icelandic_file))[0]
+        sentence_count = grader.source_sentence_count(english_lines)
+        lines = []
+        evidence = []
+        for line_no, ice_line in enumerate(LineCorpus(icelandic_file), 1):
+            eng_line = english_lines[(line_no - 1) % grader.suite_length]
+            line_result = grader.grade_line(line_no, eng_line, ice_line, sentence_count)
+            lines.append((line_no, line_result.copy, line_result.example, line_result.pronoun_section, line_result.adjective_section, ice_line.rstrip("\n")))
+            evidence.extend((line_no,) + record for record in line_evidence(grader, line_result, eng_line, ice_line, sentence_count))
+
+        with self.connection:
+            self.remove_system(name)
+            system_id = self.connection.execute("INSERT INTO systems (name, file) VALUES (?, ?)", (name, icelandic_file)).lastrowid
+            self.connection.executemany("INSERT INTO lines VALUES (?, ?, ?, ?, ?, ?, ?)", [(system_id,) + line for line in lines])
+            self.connection.executemany("INSERT INTO evidence VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", [(system_id,) + record for record in evidence])
+        return len(evidence)
+
+    def remove_system(self, name):
+        row = self.connection.execute("SELECT id FROM systems WHERE name = ?", (name,)).fetchone()
+        if row is not None:
+            for table in ("evidence", "lines"):
+                self.connection.execute(f"DELETE FROM {table} WHERE system_id = ?", (row["id"],))
+            self.connection.execute("DELETE FROM systems WHERE id = ?", (row["id"],))
+
+    def systems(self):
+        return [row["name"] for row in self.connection.execute("SELECT name FROM systems ORDER BY id")]
+
+    def query(self, grader=None, category=None, system=None, line=None, missed=False):
+        # The evidence records matching all of the given conditions, with the translation of
+        # the line. missed only keeps the records which were not given full points.
+        conditions = []
+        parameters = []
+        for column, value in (("evidence.grader", grader), ("evidence.category", category), ("systems.name", system), ("evidence.line", line)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        if missed:
+            conditions.append("evidence.points < evidence.total")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.connection.execute(f"""
+            SELECT systems.name AS system, evidence.line, lines.example, evidence.grader, evidence.category, evidence.item,
+                   evidence.expected, evidence.matched, evidence.points, evidence.total, lines.translation
+            FROM evidence JOIN systems ON systems.id = evidence.system_id
+                 JOIN lines ON lines.system_id = evidence.system_id AND lines.line = evidence.line
+            {where} ORDER BY systems.id, evidence.line""", parameters)
+        return [dict(row) for row in rows]
+
+    def summary(self, grader, category):
+        # The points and possible points of a category for each system.
+        rows = self.connection.execute("""
+            SELECT systems.name AS system, SUM(evidence.points) AS points, SUM(evidence.total) AS total, COUNT(*) AS records
+            FROM evidence JOIN systems ON systems.id = evidence.system_id
+            WHERE evidence.grader = ? AND evidence.category = ?
+            GROUP BY systems.id ORDER BY systems.id""", (grader, category))
+        return [dict(row) for row in rows]
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def build_index(patterns, index_file=DEFAULT_INDEX_FILE, english_file="english_examples.txt", adjectives_file=None, terminology_file=None, reference_files=None, language=None):
+    with open(english_file, 'r', encoding='utf-8') as f:
+        english_lines = f.readlines()
+    grader = StreamingTranslationGrader(adjectives_file, terminology_file, reference_files=reference_files, language=language)
+    with DiagnosticIndex(index_file) as index:
+        for icelandic_file in find_system_files(patterns):
+            yield icelandic_file, index.add_system(icelandic_file, grader, english_lines)
+
+def format_records(records, separator="\t"):
+    columns = ["system", "line", "example", "grader", "category", "item", "expected", "matched", "points", "total", "translation"]
+    rows = [separator.join(columns)]
+    for record in records:
+        rows.append(separator.join("" if record[column] is None else f"{record[column]:g}" if isinstance(record[column], float) else str(record[column]) for column in columns))
+    return "\n".join(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Index and query the per-line evidence of the GenderQueer test suite graders.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="grade translations and store the evidence of every line")
+    build_parser.add_argument("systems", nargs="+", help="directories or glob patterns of translation files, one file per system")
+    build_parser.add_argument("--english", default="english_examples.txt", help="the English test suite")
+    build_parser.add_argument("--language", default=LanguagePacks.get_language(), help="the target language of the translations, see LanguagePacks.py")
+    build_parser.add_argument("--adjectives", help="the adjective database, that of the language pack by default")
+    build_parser.add_argument("--terminology", help="the LGBTQAI+ terminology database, that of the language pack by default")
+    build_parser.add_argument("--tokenizer", choices=sorted(Tokenizer.BACKENDS), help="the tokenizer backend, see Tokenizer.py, that of the language pack by default")
+    build_parser.add_argument("--sections", default=SuiteSections.manifest_path, help="the section manifest of the test suite, see SuiteSections.py")
+    build_parser.add_argument("--references", nargs="+", help="reference translations of the test suite whose pronoun and adjective forms are also given full points, see References.py")
+
+    query_parser = subparsers.add_parser("query", help="print the evidence records matching the given conditions")
+    query_parser.add_argument("--grader", choices=["pronouns", "adjectives", "terminology"])
+    query_parser.add_argument("--category", help="e.g. neuter_cis_children, neuter_negative or missing")
+    query_parser.add_argument("--system")
+    query_parser.add_argument("--line", type=int)
+    query_parser.add_argument("--missed", action="store_true", help="only the records which were not given full points")
+
+    summary_parser = subparsers.add_parser("summary", help="print the points of a category for each system")
+    summary_parser.add_argument("--grader", required=True, choices=["pronouns", "adjectives", "terminology"])
+    summary_parser.add_argument("--category", required=True)
+
+    for subparser in (build_parser, query_parser, summary_parser):
+        subparser.add_argument("--index", default=DEFAULT_INDEX_FILE, help="the SQLite file of the index")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        LanguagePacks.set_language(args.language)
+        if args.tokenizer:
+            Tokenizer.set_backend(args.tokenizer)
+        SuiteSections.set_manifest(args.sections)
+        for icelandic_file, record_count in build_index(args.systems, args.index, args.english, args.adjectives, args.terminology, args.references, args.language):
+            print(f"{icelandic_file}: {record_count} records")
+    elif args.command == "query":
+        with DiagnosticIndex(args.index) as index:
+            print(format_records(index.query(args.grader, args.category, args.system, args.line, args.missed)))
+    else:
+        with DiagnosticIndex(args.index) as index:
+            print("system\tpoints\ttotal\taccuracy")
+            for row in index.summary(args.grader, args.category):
+                accuracy = row["points"] / row["total"] * 100 if row["total"] else 0
+                print(f"{row['system']}\t{row['points']:g}\t{row['total']:g}\t{accuracy:.2f}")
+
+if __name__ == "__main__":
+    main()
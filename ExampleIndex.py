@@ -0,0 +1,106 @@
+import hashlib
+import os
+import pickle
+
+import Tokenizer
+import SuiteSections
+import LineCache
+import PronounTranslationGrader
+import GenderedAdjectivesTranslationGrader
+from PronounTranslationGrader import PLURAL_PRONOUNS, SINGULAR_PRONOUNS, HALF_POINT_PRONOUNS
+from LGBTQAITranslationGrader import LGBTQAITranslationGrader
+
+"""
+    This program compiles the English side of the GenderQueer test suite into an index
+    which the graders can load instead of analysing the English examples on every run.
+    The index holds the source analysis in the form used by the pronoun, adjective and
+    terminology graders: the labels of the subject(s) of each example, the number of
+    sentences, whether the subjects are said to have children, the adjectives and the
+    LGBTQAI+ terms found in the example. expected_pronouns and adjective_slots give the
+    translations that are scored for an example.
+
+    The index is saved as a binary file in the user's cache (see LineCache.cache_directory),
+    one per combination of English examples, databases and section manifest (see
+    SuiteSections.py). It holds a hash of the contents of these files and the tokenizer
+    backend, so a change to any of them results in the index being compiled again, and
+    replaced, the next time it is loaded.
+"""
+
+INDEX_VERSION = 4
+INDEX_DIRECTORY = LineCache.cache_directory("example_index")
+
+PLURAL_ADJECTIVE_SLOTS = {"female": "female_plural", "male": "male_plural", "mixed": "neuter_plural"}
+SINGULAR_ADJECTIVE_SLOTS = {"non-binary": ("neuter_singular", "neuter_plural"), "female_singular": ("female_singular", "female_plural"), "male_singular": ("male_singular", "male_plural")}
+
+def index_files(english_file, adjectives_file, terminology_file):
+    return (english_file, adjectives_file, terminology_file, SuiteSections.manifest_path)
+
+def index_path(english_file, adjectives_file, terminology_file, index_directory=INDEX_DIRECTORY):
+    # One index per combination of files, which is replaced when one of them changes.
+    paths = "\x1f".join(os.path.abspath(file_path) for file_path in index_files(english_file, adjectives_file, terminology_file))
+    return os.path.join(index_directory, hashlib.sha256(paths.encode()).hexdigest() + ".pickle")
+
+def index_key(english_file, adjectives_file, terminology_file):
+    # The sentence counts and the adjectives found depend on the tokenizer as well.
+    digest = hashlib.sha256(f"{INDEX_VERSION}\x1f{Tokenizer.get_backend()}".encode())
+    for file_path in index_files(english_file, adjectives_file, terminology_file):
+        with open(file_path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def expected_pronouns(section, subject):
+    # The forms of "they" that are scored, with the points given for each of them.
+    if subject is None:
+        return ()
+    if section == "only_they":
+        return ((PLURAL_PRONOUNS[subject.split("_")[0]], 1),)
+    elif section == "singular_we" and subject in SINGULAR_PRONOUNS:
+        return ((SINGULAR_PRONOUNS[subject], 1), (HALF_POINT_PRONOUNS[subject], 0.5))
+    elif section == "we_they":
+        return ((PLURAL_PRONOUNS[subject[1].split("_")[0]], 1),)
+    return ()
+
+def adjective_slots(section, subject, adjectives):
+    # The gender forms of each adjective that are scored, with the points given for each.
+    if subject is None:
+        return ()
+    if section == "singular_we":
+        if subject in SINGULAR_ADJECTIVE_SLOTS:
+            full, half = SINGULAR_ADJECTIVE_SLOTS[subject]
+            return tuple(slot for adjective in adjectives for slot in ((adjective, full, 1), (adjective, half, 0.5)))
+        return tuple((adjective, PLURAL_ADJECTIVE_SLOTS[subject.split("_")[0]], 1) for adjective in adjectives)
+    return tuple((adjective, PLURAL_ADJECTIVE_SLOTS[label.split("_")[0]], 1) for adjective, label in zip(adjectives, subject))
+
+def build_example_index(english_file="english_examples.txt", adjectives_file="adjectives.json", terminology_file="terminology.json"):
+    with open(english_file, 'r', encoding='utf-8') as f:
+        english_lines = f.readlines()
+    adj_database = GenderedAdjectivesTranslationGrader.load_adjective_database(adjectives_file)
+    terminology_grader = LGBTQAITranslationGrader(terminology_path=terminology_file)
+    return {
+        "pronoun_source": PronounTranslationGrader.analyze_source(*PronounTranslationGrader.split_sections(english_lines)),
+        "adjective_source": GenderedAdjectivesTranslationGrader.analyze_source(*GenderedAdjectivesTranslationGrader.split_sections(english_lines), adj_database),
+        "line_terms": terminology_grader.identify_line_terms(english_lines),
+    }
+
+def load_example_index(english_file="english_examples.txt", adjectives_file="adjectives.json", terminology_file="terminology.json", index_directory=INDEX_DIRECTORY):
+    path = index_path(english_file, adjectives_file, terminology_file, index_directory)
+    key = index_key(english_file, adjectives_file, terminology_file)
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            example_index = pickle.load(f)
+        if example_index["key"] == key:
+            return example_index
+
+    example_index = build_example_index(english_file, adjectives_file, terminology_file)
+    example_index["key"] = key
+    try:
+        LineCache.write_atomically(path, lambda f: pickle.dump(example_index, f, protocol=pickle.HIGHEST_PROTOCOL))
+    except OSError:
+        # The index is compiled again by the next process instead.
+        pass
+    return example_index
+
+if __name__ == "__main__":
+    example_index = load_example_index()
+    print(f"Indexed {sum(len(source) for source in example_index['pronoun_source'].values())} pronoun and "
+          f"{sum(len(source) for source in example_index['adjective_source'].values())} adjective examples in {INDEX_DIRECTORY}")
@@ -1,6 +1,10 @@
 import json
-import re
-from nltk import word_tokenize
+from itertools import repeat
+from Tokenizer import word_tokenize
+import SuiteSections
+import SubjectClassifier
+from LineCorpus import LineCorpus
+from GradingResults import CategoryScore, GradingResult, render_text
 
 """
     This program automatically grades translations of adjectives with respect
@@ -22,299 +26,308 @@ from nltk import word_tokenize
     
 """
 
+GRADER_VERSION = 2 # See PronounTranslationGrader.GRADER_VERSION
+
+ADJECTIVE_SLOTS = ["male_singular", "male_plural", "female_singular", "female_plural", "neuter_singular", "neuter_plural"]
+
+# The gender in the results and the gender form of the adjective expected for plural subjects.
+PLURAL_SUBJECTS = {"female": ("feminine", "female_plural"), "male": ("masculine", "male_plural"), "mixed": ("neuter", "neuter_plural")}
+# The genders in the order they are reported, and the gender of the subject of the
+# examples in the singular_we section.
+GENDERS = ["feminine", "masculine", "neuter"]
+SINGULAR_WE_GENDERS = {"non-binary": "neuter", "female_singular": "feminine", "male_singular": "masculine", "female_plural": "feminine", "male_plural": "masculine", "mixed": "neuter"}
+# The gender form of the adjectives given full points for the subject of the examples in
+# the singular_we section.
+SINGULAR_WE_SLOTS = {"non-binary": "neuter_singular", "female_singular": "female_singular", "male_singular": "male_singular", "female_plural": "female_plural", "male_plural": "male_plural", "mixed": "neuter_plural"}
+
 def load_adjective_database(file_path):
     with open(file_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+def build_adjective_index(adj_database):
+    # Maps every gender form in the database to the adjective(s) and gender slot(s) it is
+    # listed under, so that the adjectives in a translation are found with one lookup per token.
+    forms = {}
+    for adj in adj_database:
+        for slot in ADJECTIVE_SLOTS:
+            for form in adj[slot]:
+                entry = (adj['english'], slot, adj['sentiment'])
+                if entry not in forms.setdefault(form, []):
+                    forms[form].append(entry)
+    return {
+        "forms": {form: tuple(entries) for form, entries in forms.items()},
+        "sentiments": {adj['english']: adj['sentiment'] for adj in adj_database},
+    }
+
+def find_adjective_forms(ice_tokens, adjective_index):
+    forms = adjective_index["forms"]
+    return {(english, slot) for token in ice_tokens if token in forms for english, slot, _ in forms[token]}
+
+def graded_tokens(section, ice_line):
+    # The tokens of the translation of a line in which the adjectives are looked for. The
+    # names section is not lowercased.
+    return word_tokenize(ice_line) if section == "names" else word_tokenize(ice_line.lower())
+
+def accepted_forms(ice_tokens, accepted, expected_slots, adjective_index):
+    # The adjectives of the example which the translation gives in a form used in one of
+    # the reference translations (see References.py), as if given in the form expected.
+    forms = adjective_index["forms"]
+    return {(english, expected_slots[english]) for token in ice_tokens if token in accepted for english, _, _ in forms[token] if english in expected_slots}
+
+def split_sections(lines):
+    return SuiteSections.split_sections(lines, "adjectives", SECTIONS)
+
+def load_sections(file_path):
+    # Only the lines of the sections are read, see LineCorpus.py.
+    return split_sections(LineCorpus(file_path))
+
 def load_text_files(icelandic_file, english_file):
-    with open(icelandic_file, 'r', encoding='utf-8') as f:
-        icelandic_lines_singular_we = f.readlines()[184:265]
-        f.seek(0)
-        icelandic_lines_we_they = f.readlines()[265:319]
-        f.seek(0)
-        icelandic_lines_names = f.readlines()[319:]
-    with open(english_file, 'r', encoding='utf-8') as f:
-        english_lines_singular_we = f.readlines()[184:265]
-        f.seek(0)
-        english_lines_we_they = f.readlines()[265:319]
-        f.seek(0)
-        english_lines_names = f.readlines()[319:]
+    icelandic_lines_singular_we, icelandic_lines_we_they, icelandic_lines_names = load_sections(icelandic_file)
+    english_lines_singular_we, english_lines_we_they, english_lines_names = load_sections(english_file)
     return icelandic_lines_singular_we, english_lines_singular_we, icelandic_lines_we_they, english_lines_we_they, icelandic_lines_names, english_lines_names
 
 def identify_subject_only_we_or_singular(text):
-    if "non-binary person" in text or "genderqueer person" in text or "genderfluid person" in text:
-        return "non-binary"
-    elif "this woman" in text:
-        return "female_singular"
-    elif "this man" in text:
-        return "male_singular"
-    elif "i’m a woman. my friends are women." in text:
-        return "female_plural"
-    elif "i’m a woman. my friends are men." in text:
-        return "mixed"
-    elif "i’m a woman. my friends are a woman and a man." in text:
-        return "mixed"
-    elif "i’m a man. my friends are men." in text:
-        return "male_plural"
-    elif "i’m a man. my friends are women." in text:
-        return "mixed"
-    elif "i’m a man. my friends are a woman and a man." in text:
-        return "mixed"
-    
+    return SubjectClassifier.classify("singular_we", text)
+
 def identify_subject_we_and_they(text):
-    if "I’m a woman. My friends are women." in text:
-        return ["female_we", "female_they"]
-    elif "I’m a woman. My friends are men." in text:
-        return ["mixed_we", "male_they"]
-    elif "I’m a woman. My friends are a woman and a man." in text:
-        return ["mixed_we", "mixed_they"]
-    elif "I’m a man. My friends are men." in text:
-        return ["male_we", "male_they"]
-    elif "I’m a man. My friends are women." in text:
-        return ["mixed_we", "female_they"]
-    elif "I’m a man. My friends are a woman and a man." in text:
-        return ["mixed_we", "mixed_they"]
+    return SubjectClassifier.classify("we_they", text)
 
 def identify_subject_names(text):
-    if "I’m a woman. My friends Mary, Olivia and Sophia are women." in text:
-        return ["female_we", "female_group1", "female_group2"]
-    elif "I’m a woman. My friends Mary and Sophia are women but my friend John is a man." in text:
-        return ["mixed_we", "female_group1", "mixed_group2"]
-    elif "I’m a woman. My friend Mary is a woman but my friends John and Brian are men." in text:
-        return ["mixed_we", "female_group1", "male_group2"]
-    elif "I’m a woman. My friend Charles is a man but my friends Olivia and Sophia are women." in text:
-        return ["mixed_we", "mixed_group1", "female_group2"]
-    elif "I’m a woman. My friends Charles and John are men but my friend Sophia is a woman." in text:
-        return ["mixed_we", "mixed_group1", "mixed_group2"]
-    elif "I’m a woman. My friends Charles, John and Brian are men." in text:
-        return ["mixed_we", "mixed_group1", "male_group2"]
-    elif "I’m a man. My friends Mary, Olivia and Sophia are women." in text:
-        return ["mixed_we", "mixed_group1", "female_group2"]
-    elif "I’m a man. My friends Mary and Sophia are women but my friend John is a man." in text:
-        return ["mixed_we", "mixed_group1", "mixed_group2"]
-    elif "I’m a man. My friend Mary is a woman but my friends John and Brian are men." in text:
-        return ["mixed_we", "mixed_group1", "male_group2"]
-    elif "I’m a man. My friend Charles is a man but my friends Olivia and Sophia are women." in text:
-        return ["mixed_we", "male_group1", "female_group2"]
-    elif "I’m a man. My friends Charles and John are men but my friend Sophia is a woman." in text:
-        return ["mixed_we", "male_group1", "mixed_group2"]
-    elif "I’m a man. My friends Charles, John and Brian are men." in text:
-        return ["male_we", "male_group1", "male_group2"]
-
-
-def analyze_translations(icelandic_lines_singular_we, english_lines_singular_we,icelandic_lines_we_they, english_lines_we_they, icelandic_lines_names, english_lines_names, adj_database):
-
-    results = {
+    return SubjectClassifier.classify("names", text)
+
+def find_adjectives(eng_line, adj_database):
+    eng_tokens = word_tokenize(eng_line.lower())
+    return [adj['english'] for adj in adj_database if adj['english'] in eng_tokens]
+
+SECTIONS = ["singular_we", "we_they", "names"]
+
+def adjectives_per_line(section):
+    # The number of adjectives describing the subject(s) in each example of a section.
+    return SuiteSections.section_spec("adjectives", section)["adjectives_per_line"]
+
+def analyze_source_line(section, eng_line, adj_database):
+    if section == "singular_we":
+        return identify_subject_only_we_or_singular(eng_line.lower()), find_adjectives(eng_line, adj_database)
+    elif section == "we_they":
+        return identify_subject_we_and_they(eng_line), find_adjectives(eng_line, adj_database)
+    elif section == "names":
+        return identify_subject_names(eng_line), find_adjectives(eng_line, adj_database)
+
+def analyze_source(english_lines_singular_we, english_lines_we_they, english_lines_names, adj_database):
+    # Everything the grading needs from the English side, so that it can be computed
+    # once and shared when several translations of the test suite are graded.
+    source_analysis = {}
+    for section, english_lines in zip(SECTIONS, [english_lines_singular_we, english_lines_we_they, english_lines_names]):
+        source_analysis[section] = [analyze_source_line(section, eng_line, adj_database) for eng_line in english_lines]
+        SubjectClassifier.report_unmatched("adjectives", section, [subject for subject, _ in source_analysis[section]])
+    return source_analysis
+
+def new_results():
+    # adjective_counts holds the number of adjectives of each gender and sentiment that
+    # were graded, the denominators of the accuracy per gender and per sentiment.
+    return {
         "translation_analysis": {
             "masculine": {"positive": 0, "negative": 0, "neutral": 0},
             "feminine": {"positive": 0, "negative": 0, "neutral": 0},
             "neuter": {"positive": 0, "negative": 0, "neutral": 0}
+        },
+        "adjective_counts": {
+            "masculine": {"positive": 0, "negative": 0, "neutral": 0},
+            "feminine": {"positive": 0, "negative": 0, "neutral": 0},
+            "neuter": {"positive": 0, "negative": 0, "neutral": 0}
         }
     }
 
+def grade_singular_we_line(ice_line, line_source, adjective_index, results, accepted=None):
+    pronoun, current_adjectives = line_source
+    ice_tokens = word_tokenize(ice_line.lower())
+    found_forms = find_adjective_forms(ice_tokens, adjective_index)
+    if accepted and pronoun in SINGULAR_WE_SLOTS:
+        found_forms |= accepted_forms(ice_tokens, accepted, dict.fromkeys(current_adjectives, SINGULAR_WE_SLOTS[pronoun]), adjective_index)
+    adjectives_correct = 0
+
+    for english in current_adjectives:
+        sentiment = adjective_index["sentiments"][english]
+        if pronoun in SINGULAR_WE_GENDERS:
+            results['adjective_counts'][SINGULAR_WE_GENDERS[pronoun]][sentiment] += 1
+
+        if pronoun == "non-binary":
+            if (english, 'neuter_singular') in found_forms:
+                adjectives_correct += 1
+                results['translation_analysis']['neuter'][sentiment] += 1
+            elif (english, 'neuter_plural') in found_forms:
+                adjectives_correct += 0.5
+                results['translation_analysis']['neuter'][sentiment] += 0.5
+
+        elif pronoun == "female_singular":
+            if (english, 'female_singular') in found_forms:
+                adjectives_correct += 1
+                results['translation_analysis']['feminine'][sentiment] += 1
+            if (english, 'female_plural') in found_forms:
+                adjectives_correct += 0.5
+                results['translation_analysis']['feminine'][sentiment] += 0.5
+
+        elif pronoun == "male_singular":
+            if (english, 'male_singular') in found_forms:
+                adjectives_correct += 1
+                results['translation_analysis']['masculine'][sentiment] += 1
+            if (english, 'male_plural') in found_forms:
+                adjectives_correct += 0.5
+                results['translation_analysis']['masculine'][sentiment] += 0.5
+
+        elif pronoun == "female_plural":
+            if (english, 'female_plural') in found_forms:
+                adjectives_correct += 1
+                results['translation_analysis']['feminine'][sentiment] += 1
+
+        elif pronoun == "male_plural":
+            if (english, 'male_plural') in found_forms:
+                adjectives_correct += 1
+                results['translation_analysis']['masculine'][sentiment] += 1
+
+        elif pronoun == "mixed":
+            if (english, 'neuter_plural') in found_forms:
+                adjectives_correct += 1
+                results['translation_analysis']['neuter'][sentiment] += 1
+
+    return adjectives_correct
+
+def grade_plural_adjectives(results, current_adjectives, subjects, found_forms, adjective_index):
+    # The n-th adjective of the example (in the order of the database) describes the n-th
+    # subject, i.e. "we" or one of the groups of friends.
+    adjectives_correct = 0
+    if subjects is None:
+        return adjectives_correct
+    for english, subject in zip(current_adjectives, subjects):
+        gender, slot = PLURAL_SUBJECTS[subject.split("_")[0]]
+        sentiment = adjective_index["sentiments"][english]
+        results['adjective_counts'][gender][sentiment] += 1
+        if (english, slot) in found_forms:
+            adjectives_correct += 1
+            results['translation_analysis'][gender][sentiment] += 1
+    return adjectives_correct
+
+def plural_slots(current_adjectives, subjects):
+    return {english: PLURAL_SUBJECTS[subject.split("_")[0]][1] for english, subject in zip(current_adjectives, subjects)}
+
+def grade_we_they_line(ice_line, line_source, adjective_index, results, accepted=None):
+    pronouns, current_adjectives = line_source
+    ice_tokens = word_tokenize(ice_line.lower())
+    found_forms = find_adjective_forms(ice_tokens, adjective_index)
+    if accepted and pronouns is not None:
+        found_forms |= accepted_forms(ice_tokens, accepted, plural_slots(current_adjectives, pronouns), adjective_index)
+    return grade_plural_adjectives(results, current_adjectives, pronouns, found_forms, adjective_index)
+
+def grade_names_line(ice_line, line_source, adjective_index, results, accepted=None):
+    pronouns, current_adjectives = line_source
+    ice_tokens = word_tokenize(ice_line)
+    found_forms = find_adjective_forms(ice_tokens, adjective_index)
+    if accepted and pronouns is not None:
+        found_forms |= accepted_forms(ice_tokens, accepted, plural_slots(current_adjectives, pronouns), adjective_index)
+    return grade_plural_adjectives(results, current_adjectives, pronouns, found_forms, adjective_index)
+
+def grade_line(section, ice_line, line_source, adjective_index, results, accepted=None):
+    if section == "singular_we":
+        return grade_singular_we_line(ice_line, line_source, adjective_index, results, accepted)
+    elif section == "we_they":
+        return grade_we_they_line(ice_line, line_source, adjective_index, results, accepted)
+    elif section == "names":
+        return grade_names_line(ice_line, line_source, adjective_index, results, accepted)
+
+def grade_singular_we(icelandic_lines_singular_we, source_singular_we, adjective_index, accepted=None):
+    # accepted holds the adjective forms of the reference translations of each line, if any.
+    results = new_results()
+    total_adjectives = 0
+    adjectives_correct = 0
+    for line_source, ice_line, line_accepted in zip(source_singular_we, icelandic_lines_singular_we, accepted or repeat(None)):
+        total_adjectives += adjectives_per_line("singular_we")
+        adjectives_correct += grade_singular_we_line(ice_line, line_source, adjective_index, results, line_accepted)
+    return results, adjectives_correct, total_adjectives
+
+def grade_we_they(icelandic_lines_we_they, source_we_they, adjective_index, accepted=None):
+    # accepted holds the adjective forms of the reference translations of each line, if any.
+    results = new_results()
+    total_adjectives = 0
+    adjectives_correct = 0
+    for line_source, ice_line, line_accepted in zip(source_we_they, icelandic_lines_we_they, accepted or repeat(None)):
+        total_adjectives += adjectives_per_line("we_they")
+        adjectives_correct += grade_we_they_line(ice_line, line_source, adjective_index, results, line_accepted)
+    return results, adjectives_correct, total_adjectives
+
+def grade_names(icelandic_lines_names, source_names, adjective_index, accepted=None):
+    # accepted holds the adjective forms of the reference translations of each line, if any.
+    results = new_results()
+    total_adjectives = 0
+    adjectives_correct = 0
+    for line_source, ice_line, line_accepted in zip(source_names, icelandic_lines_names, accepted or repeat(None)):
+        total_adjectives += adjectives_per_line("names")
+        adjectives_correct += grade_names_line(ice_line, line_source, adjective_index, results, line_accepted)
+    return results, adjectives_correct, total_adjectives
+
+def grade_section(section, icelandic_lines, source_analysis, adjective_index, accepted=None):
+    if section == "singular_we":
+        return grade_singular_we(icelandic_lines, source_analysis["singular_we"], adjective_index, accepted)
+    elif section == "we_they":
+        return grade_we_they(icelandic_lines, source_analysis["we_they"], adjective_index, accepted)
+    elif section == "names":
+        return grade_names(icelandic_lines, source_analysis["names"], adjective_index, accepted)
+
+def merge_results(partial_results):
+    # The partial results are added up in the order given, so the merged scores are the
+    # same no matter where or in which order the sections were graded.
+    results = new_results()
     total_adjectives = 0
     adjectives_correct = 0
+    for section_results, section_correct, section_total in partial_results:
+        for key in ("translation_analysis", "adjective_counts"):
+            for gender, sentiments in section_results[key].items():
+                for sentiment, score in sentiments.items():
+                    results[key][gender][sentiment] += score
+        adjectives_correct += section_correct
+        total_adjectives += section_total
+    return results, adjectives_correct, total_adjectives
+
+def analyze_translations(icelandic_lines_singular_we, english_lines_singular_we,icelandic_lines_we_they, english_lines_we_they, icelandic_lines_names, english_lines_names, adj_database, source_analysis=None, references=None):
 
-    for eng_line, ice_line in zip(english_lines_singular_we, icelandic_lines_singular_we):
-        total_adjectives += 2
-        pronoun = identify_subject_only_we_or_singular(eng_line.lower())
-        ice_tokens = word_tokenize(ice_line.lower())
-        current_adjectives = []
-
-        eng_tokens = word_tokenize(eng_line.lower())
-        for adj in adj_database:
-            if adj['english'] in eng_tokens:
-                current_adjectives.append(adj['english'])
-
-        for adj in adj_database:
-            for token in current_adjectives:
-                if adj['english']==token:
-
-                    if pronoun == "non-binary":
-                        if any(a in adj['neuter_singular'] for a in ice_tokens):
-                            adjectives_correct += 1
-                            results['translation_analysis']['neuter'][adj["sentiment"]] += 1
-                        elif any(a in adj['neuter_plural'] for a in ice_tokens):
-                            adjectives_correct += 0.5
-                            results['translation_analysis']['neuter'][adj["sentiment"]] += 0.5
-
-                    elif pronoun == "female_singular":
-                        if any(a in adj['female_singular'] for a in ice_tokens):
-                            adjectives_correct += 1
-                            results['translation_analysis']['feminine'][adj["sentiment"]] += 1
-                        if any(a in adj['female_plural'] for a in ice_tokens):
-                            adjectives_correct += 0.5
-                            results['translation_analysis']['feminine'][adj["sentiment"]] += 0.5
-
-                    elif pronoun == "male_singular":
-                        if any(a in adj['male_singular'] for a in ice_tokens):
-                            adjectives_correct += 1
-                            results['translation_analysis']['masculine'][adj["sentiment"]] += 1
-                        if any(a in adj['male_plural'] for a in ice_tokens):
-                            adjectives_correct += 0.5
-                            results['translation_analysis']['masculine'][adj["sentiment"]] += 0.5
-
-                    elif pronoun == "female_plural":
-                        if any(a in adj['female_plural'] for a in ice_tokens):
-                            adjectives_correct += 1
-                            results['translation_analysis']['feminine'][adj["sentiment"]] += 1
-
-                    elif pronoun == "male_plural":
-                        if any(a in adj['male_plural'] for a in ice_tokens):
-                            adjectives_correct += 1
-                            results['translation_analysis']['masculine'][adj["sentiment"]] += 1
-
-                    elif pronoun == "mixed":
-                        if any(a in adj['neuter_plural'] for a in ice_tokens):
-                            adjectives_correct += 1
-                            results['translation_analysis']['neuter'][adj["sentiment"]] += 1
-
-        
-    for eng_line, ice_line in zip(english_lines_we_they, icelandic_lines_we_they):
-        total_adjectives += 2
-        pronouns = identify_subject_we_and_they(eng_line)
-        we_pronoun = pronouns[0]
-        they_pronoun = pronouns[1]
-        current_adjectives = []
-
-        eng_tokens = word_tokenize(eng_line.lower())
-        for adj in adj_database:
-            if adj['english'] in eng_tokens:
-                current_adjectives.append(adj['english'])
-        
-        ice_tokens = word_tokenize(ice_line.lower())
-
-        for adj in adj_database:
-            if adj['english']==current_adjectives[0]:
-
-                if we_pronoun == "female_we":
-                    if any(a in adj['female_plural'] for a in ice_tokens):
-                        adjectives_correct += 1
-                        results['translation_analysis']['feminine'][adj["sentiment"]] += 1        
-                elif we_pronoun == "male_we":
-                    if any(a in adj['male_plural'] for a in ice_tokens):
-                        adjectives_correct += 1
-                        results["translation_analysis"]["masculine"][adj["sentiment"]] += 1
-                elif we_pronoun == "mixed_we":
-                    if any(a in adj['neuter_plural'] for a in ice_tokens):
-                        adjectives_correct += 1
-                        results["translation_analysis"]["neuter"][adj["sentiment"]] += 1
-
-            elif adj['english']==current_adjectives[1]:
-                if they_pronoun == "female_they":
-                    if any(a in adj['female_plural'] for a in ice_tokens):
-                        adjectives_correct += 1
-                        results['translation_analysis']['feminine'][adj["sentiment"]] += 1
-                elif they_pronoun == "male_they":
-                    if any(a in adj['male_plural'] for a in ice_tokens):
-                        adjectives_correct += 1
-                        results["translation_analysis"]["masculine"][adj["sentiment"]] += 1
-                elif they_pronoun == "mixed_they":
-                    if any(a in adj['neuter_plural'] for a in ice_tokens):
-                        adjectives_correct += 1
-                        results["translation_analysis"]["neuter"][adj["sentiment"]] += 1
-
-
-    for eng_line, ice_line in zip(english_lines_names, icelandic_lines_names):
-        total_adjectives += 3
-        ice_tokens = word_tokenize(ice_line)
-        pronouns = identify_subject_names(eng_line)
-        we_pronoun = pronouns[0]
-        group1 = pronouns[1]
-        group2 = pronouns[2]
-        current_adjectives = []
-
-        eng_tokens = word_tokenize(eng_line.lower())
-        for adj in adj_database:
-            if adj['english'] in eng_tokens:
-                current_adjectives.append(adj['english'])        
-
-        for adj in adj_database:
-            if adj['english']==current_adjectives[0]:
-
-                if we_pronoun == "female_we":
-                    if any(a in adj['female_plural'] for a in ice_tokens):
-                        adjectives_correct += 1
-                        results['translation_analysis']['feminine'][adj["sentiment"]] += 1        
-
-                elif we_pronoun == "male_we":
-                    if any(a in adj['male_plural'] for a in ice_tokens):
-                        adjectives_correct += 1
-                        results['translation_analysis']['masculine'][adj["sentiment"]] += 1        
-
-                elif we_pronoun == "mixed_we":
-                    if any(a in adj['neuter_plural'] for a in ice_tokens):
-                        adjectives_correct += 1
-                        results['translation_analysis']['neuter'][adj["sentiment"]] += 1        
-
-            elif adj['english']==current_adjectives[1]:
-
-                if group1 == "female_group1":
-                    if any(a in adj['female_plural'] for a in ice_tokens):
-                        adjectives_correct += 1
-                        results['translation_analysis']['feminine'][adj["sentiment"]] += 1        
-
-                elif group1 == "male_group1":
-                    if any(a in adj['male_plural'] for a in ice_tokens):
-                        adjectives_correct += 1
-                        results['translation_analysis']['masculine'][adj["sentiment"]] += 1        
-
-                elif group1 == "mixed_group1":
-                    if any(a in adj['neuter_plural'] for a in ice_tokens):
-                        adjectives_correct += 1
-                        results['translation_analysis']['neuter'][adj["sentiment"]] += 1        
-
-            elif adj['english']==current_adjectives[2]:
-
-                if group2 == "female_group2":
-                    if any(a in adj['female_plural'] for a in ice_tokens):
-                        adjectives_correct += 1
-                        results['translation_analysis']['feminine'][adj["sentiment"]] += 1        
-
-                elif group2 == "male_group2":
-                    if any(a in adj['male_plural'] for a in ice_tokens):
-                        adjectives_correct += 1
-                        results['translation_analysis']['masculine'][adj["sentiment"]] += 1        
-
-                elif group2 == "mixed_group2":
-                    if any(a in adj['neuter_plural'] for a in ice_tokens):
-                        adjectives_correct += 1
-                        results['translation_analysis']['neuter'][adj["sentiment"]] += 1        
+    if source_analysis is None:
+        source_analysis = analyze_source(english_lines_singular_we, english_lines_we_they, english_lines_names, adj_database)
 
+    adjective_index = build_adjective_index(adj_database)
+    # The adjective forms of the reference translations, see References.py.
+    section_accepted = split_sections(references["adjectives"]) if references is not None else repeat(None)
+    partial_results = [grade_section(section, icelandic_lines, source_analysis, adjective_index, accepted) for section, icelandic_lines, accepted in zip(SECTIONS, [icelandic_lines_singular_we, icelandic_lines_we_they, icelandic_lines_names], section_accepted)]
+    results, adjectives_correct, total_adjectives = merge_results(partial_results)
 
     results["adjectives_accuracy"] = (adjectives_correct / total_adjectives) * 100
 
     return results, adjectives_correct, total_adjectives
 
+def build_scores(results, adjectives_correct, total_adjectives):
+    translation_analysis = results['translation_analysis']
+    adjective_counts = results['adjective_counts']
+    scores = [CategoryScore("adjectives", "overall", adjectives_correct, total_adjectives, (adjectives_correct / total_adjectives) * 100 if total_adjectives > 0 else 0,
+                            "Adjectives translation accuracy with regards to gender form")]
+    for gender in GENDERS:
+        correct = sum(translation_analysis[gender].values())
+        total = sum(adjective_counts[gender].values())
+        scores.append(CategoryScore("adjectives", gender, correct, total, (correct / total) * 100 if total > 0 else 0,
+                                    f"Translation accuracy for {gender} adjectives", 1, "Translation Accuracy Per Gender:"))
+    for gender in GENDERS:
+        for sentiment, total in adjective_counts[gender].items():
+            correct = translation_analysis[gender][sentiment]
+            scores.append(CategoryScore("adjectives", f"{gender}_{sentiment}", correct, total, (correct / total) * 100 if total > 0 else 0,
+                                        f"Translation accuracy for {gender} adjectives with a {sentiment} sentiment", 2, "Sentiment Analysis by Gender:"))
+    return scores
+
 def main():
     adj_database = load_adjective_database('adjectives.json')
 
-    icelandic_lines_singular_we, english_lines_singular_we, icelandic_lines_we_they, english_lines_we_they, icelandic_lines_names, english_lines_names = load_text_files("/home/steinunn/doktorsverkefni/wmttestsuite24/genderqueer/en-is/Unbabel-Tower70B.en-is.txt", "english_examples.txt")
+    icelandic_file = "/home/steinunn/doktorsverkefni/wmttestsuite24/genderqueer/en-is/Unbabel-Tower70B.en-is.txt"
+    icelandic_lines_singular_we, english_lines_singular_we, icelandic_lines_we_they, english_lines_we_they, icelandic_lines_names, english_lines_names = load_text_files(icelandic_file, "english_examples.txt")
 
     results, adjectives_correct, total_adjectives = analyze_translations(icelandic_lines_singular_we, english_lines_singular_we,icelandic_lines_we_they, english_lines_we_they, icelandic_lines_names, english_lines_names, adj_database)
-    
-    print(f"\nAdjectives translation accuracy with regards to gender form: {results['adjectives_accuracy']:.2f}")
-    
-    print(f"\nTotal adjectives analyzed: {total_adjectives}")
-    print(f"Number of adjectives correctly translated with regards to gender: {adjectives_correct}")
-
-    total_adjectives = sum(sum(gender_data.values()) for gender_data in results['translation_analysis'].values())
-
-    print("\nTranslation Accuracy Per Gender:")
-    print(f"Translation accuracy for feminine adjectives: {(sum(results['translation_analysis']['feminine'].values()) / 71)*100:.2f}")
-    print(f"Translation accuracy for masculine adjectives: {(sum(results['translation_analysis']['masculine'].values()) / 71)*100:.2f}")
-    print(f"Translation accuracy for neuter adjectives: {(sum(results['translation_analysis']['neuter'].values()) / 164)*100:.2f}")
-
-    print("\nSentiment Analysis by Gender:")
-    print(f"Translation accuracy for feminine adjectives with a positive sentiment: {(results['translation_analysis']['feminine']['positive'] / 24)*100:.2f}")
-    print(f"Translation accuracy for feminine adjectives with a negative sentiment: {(results['translation_analysis']['feminine']['negative'] / 25)*100:.2f}")
-    print(f"Translation accuracy for feminine adjectives with a neutral sentiment: {(results['translation_analysis']['feminine']['neutral'] / 22)*100:.2f}")
-    print(f"Translation accuracy for masculine adjectives with a positive sentiment: {(results['translation_analysis']['masculine']['positive'] / 24)*100:.2f}")
-    print(f"Translation accuracy for masculine adjectives with a negative sentiment: {(results['translation_analysis']['masculine']['negative'] / 25)*100:.2f}")
-    print(f"Translation accuracy for masculine adjectives with a neutral sentiment: {(results['translation_analysis']['masculine']['neutral'] / 22)*100:.2f}")
-    print(f"Translation accuracy for neuter adjectives with a positive sentiment: {(results['translation_analysis']['neuter']['positive'] / 54)*100:.2f}")
-    print(f"Translation accuracy for neuter adjectives with a negative sentiment: {(results['translation_analysis']['neuter']['negative'] / 52)*100:.2f}")
-    print(f"Translation accuracy for neuter adjectives with a neutral sentiment: {(results['translation_analysis']['neuter']['neutral'] / 58)*100:.2f}")
+
+    print(render_text(GradingResult(icelandic_file, build_scores(results, adjectives_correct, total_adjectives))))
 
 if __name__ == "__main__":
-   main()
\ No newline at end of file
+   main()
@@ -0,0 +1,137 @@
+import csv
+import json
+from array import array
+from dataclasses import dataclass, field, fields, asdict
+
+from PronounCounters import by_name
+
+"""
+    This program holds the results of the graders as typed objects, so that they can be
+    exported in a machine-readable form instead of being parsed from the printed reports.
+
+    A LineResult holds the scores of a single line of a translation, with a TermGrade for
+    each grade given to an LGBTQAI+ term of the line, a CategoryScore the score of one
+    category of one grader, e.g. the feminine 'they' of the pronoun grader, and a
+    GradingResult all the category scores of one translation. A PartialResult holds the
+    scores of a translation which is still being graded. The results of many translations
+    can be exported as JSON, CSV or as columns (one list per field), which can also be
+    written as a Parquet file when pyarrow is installed. Printing the scores is done by
+    render_text.
+"""
+
+@dataclass(slots=True)
+class TermGrade:
+    # The grade of one LGBTQAI+ term of a line. kind is "correct", "inappropriate",
+    # "missing" or that of the scoring rule which gave the points, e.g. "warning". form is
+    # the translation found, None when the term is missing.
+    term: str
+    form: str
+    points: float
+    kind: str
+    detail: str
+
+@dataclass(slots=True)
+class LineResult:
+    line: int
+    copy: int
+    example: int
+    pronoun_section: str = None
+    adjective_section: str = None
+    pronoun_counts: array = None
+    pronoun_correct: array = None
+    adjective_analysis: dict = None
+    adjectives_correct: float = 0
+    total_adjectives: int = 0
+    terms: tuple = ()
+    terms_correct: float = 0
+    terms_inappropriate: int = 0
+    term_details: tuple = ()
+
+    def to_dict(self):
+        # Only the pronoun categories that occur in the line are kept.
+        record = asdict(self)
+        for key in ("pronoun_counts", "pronoun_correct"):
+            if record[key] is not None:
+                record[key] = by_name(record[key], nonzero=True)
+        return record
+
+@dataclass(slots=True)
+class CategoryScore:
+    grader: str
+    category: str
+    correct: float
+    total: float
+    accuracy: float
+    label: str = ""
+    group: int = 0
+    heading: str = ""
+
+@dataclass(slots=True)
+class GradingResult:
+    system: str
+    scores: list = field(default_factory=list)
+
+    def score(self, grader, category):
+        for score in self.scores:
+            if score.grader == grader and score.category == category:
+                return score
+        raise KeyError(f"No score for the category '{category}' of the {grader} grader")
+
+    def accuracy(self, grader, category):
+        return self.score(grader, category).accuracy
+
+    def to_dict(self):
+        return {"system": self.system, "scores": [asdict(score) for score in self.scores]}
+
+@dataclass(slots=True)
+class PartialResult:
+    # The scores of the lines of a translation graded so far.
+    lines_graded: int
+    result: GradingResult
+    complete: bool = False
+
+SCORE_COLUMNS = ["system"] + [f.name for f in fields(CategoryScore) if f.name not in ("label", "group", "heading")]
+
+def iter_score_rows(results):
+    for result in results:
+        for score in result.scores:
+            yield (result.system, score.grader, score.category, score.correct, score.total, score.accuracy)
+
+def to_columns(results):
+    # One list per column, in the long format of one row per system and category.
+    columns = {column: [] for column in SCORE_COLUMNS}
+    appends = [columns[column].append for column in SCORE_COLUMNS]
+    for row in iter_score_rows(results):
+        for append, value in zip(appends, row):
+            append(value)
+    return columns
+
+def to_json(results, indent=None):
+    return json.dumps([result.to_dict() for result in results], ensure_ascii=False, indent=indent)
+
+def write_csv(results, output_file):
+    with open(output_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(SCORE_COLUMNS)
+        writer.writerows(iter_score_rows(results))
+
+def write_parquet(results, output_file):
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Writing Parquet files requires pyarrow (pip install pyarrow)")
+    pyarrow.parquet.write_table(pyarrow.table(to_columns(results)), output_file)
+
+def render_text(result):
+    lines = []
+    previous = None
+    for score in result.scores:
+        if (score.grader, score.group) != previous:
+            if previous is not None:
+                lines.append("")
+            if score.heading:
+                lines.append(score.heading)
+        lines.append(f"{score.label}: {score.accuracy:.2f}% (Correct: {score.correct}, Total: {score.total})")
+        previous = (score.grader, score.group)
+    return "\n".join(lines)
@@ -0,0 +1,184 @@
+import argparse
+import json
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import Tokenizer
+import SuiteSections
+import LanguagePacks
+from BatchTranslationGrader import load_shared_state, grade_translation
+from GradingResults import CategoryScore, GradingResult
+
+"""
+    This program runs the graders as a local HTTP service, so that translations can be
+    graded on demand, e.g. every few hundred steps while training an MT system, without
+    starting Python, loading the tokenizer and the adjective and terminology databases
+    and analysing the English examples on every call. All of these are loaded once when
+    the server starts and shared by the requests, which are handled concurrently.
+
+    A request is a POST to /grade with a JSON body holding either the translation of the
+    test suite as a list of lines:
+
+        {"system": "checkpoint-2000", "hypotheses": ["...", "...", ...]}
+
+    or the translations of several systems, which are graded in one request:
+
+        {"translations": {"checkpoint-2000": [...], "checkpoint-2500": [...]}}
+
+    The response holds the scores of all three graders for each system, in the form of
+    GradingResult.to_dict (see GradingResults.py). GradingClient sends requests to the
+    server and LocalGradingClient grades in the same process, with the same interface.
+
+    python GradingServer.py --port 8331 --tokenizer regex
+"""
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8331
+
+def handle_request(payload, state):
+    if not isinstance(payload, dict):
+        raise ValueError("The request should be a JSON object")
+    if "translations" in payload:
+        translations = payload["translations"]
+    elif "hypotheses" in payload:
+        translations = {payload.get("system", ""): payload["hypotheses"]}
+    else:
+        raise ValueError("The request should hold either 'hypotheses' or 'translations'")
+
+    if not isinstance(translations, dict):
+        raise ValueError("'translations' should map the name of each system to its translation")
+    suite_length = len(state["english_lines"])
+    for system, hypotheses in translations.items():
+        if not isinstance(hypotheses, list) or len(hypotheses) != suite_length:
+            raise ValueError(f"The translation of '{system}' should be a list of {suite_length} lines")
+        if not all(isinstance(hypothesis, str) for hypothesis in hypotheses):
+            raise ValueError(f"The lines of the translation of '{system}' should be strings")
+
+    start = time.perf_counter()
+    results = [grade_translation(system, hypotheses, state) for system, hypotheses in translations.items()]
+    return {"results": [result.to_dict() for result in results], "elapsed_ms": (time.perf_counter() - start) * 1000}
+
+def respond(data, state):
+    # The status and the body of the response to a request to /grade with the given body.
+    try:
+        return 200, handle_request(json.loads(data), state)
+    except (ValueError, KeyError, TypeError) as e:
+        return 400, {"error": str(e)}
+    except Exception as e:
+        # The client is always answered, rather than the connection being dropped.
+        return 500, {"error": f"{type(e).__name__}: {e}"}
+
+def result_from_dict(result):
+    return GradingResult(result["system"], [CategoryScore(**score) for score in result["scores"]])
+
+class GradingRequestHandler(BaseHTTPRequestHandler):
+    # The shared state is set on the server, see serve.
+
+    def send_json(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_json(200, {"status": "ok", "tokenizer": Tokenizer.get_backend(), "lines": len(self.server.state["english_lines"])})
+        else:
+            self.send_json(404, {"error": f"Unknown path '{self.path}'"})
+
+    def do_POST(self):
+        if self.path != "/grade":
+            self.send_json(404, {"error": f"Unknown path '{self.path}'"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            self.send_json(400, {"error": "The Content-Length header should be a number"})
+            return
+        self.send_json(*respond(self.rfile.read(length), self.server.state))
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+def create_server(state, host=DEFAULT_HOST, port=DEFAULT_PORT, verbose=False):
+    server = ThreadingHTTPServer((host, port), GradingRequestHandler)
+    server.daemon_threads = True
+    server.state = state
+    server.verbose = verbose
+    return server
+
+class GradingClient:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=60):
+        self.url = f"http://{host}:{port}"
+        self.timeout = timeout
+
+    def post(self, payload):
+        request = urllib.request.Request(f"{self.url}/grade", data=json.dumps(payload, ensure_ascii=False).encode('utf-8'),
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    def grade(self, hypotheses, system=""):
+        return result_from_dict(self.post({"system": system, "hypotheses": hypotheses})["results"][0])
+
+    def grade_batch(self, translations):
+        return [result_from_dict(result) for result in self.post({"translations": translations})["results"]]
+
+class LocalGradingClient(GradingClient):
+    # Grades in the same process, without a server, e.g. for tests.
+
+    def __init__(self, state=None):
+        self.state = state if state is not None else load_shared_state()
+
+    def request(self, data):
+        # The status and the body of the response of the server to a request with the given
+        # body, which goes through JSON like a response from the server would.
+        status, body = respond(data, self.state)
+        return status, json.loads(json.dumps(body, ensure_ascii=False))
+
+    def post(self, payload):
+        status, body = self.request(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+        if status == 400:
+            raise ValueError(body["error"])
+        if status != 200:
+            raise RuntimeError(body["error"])
+        return body
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the GenderQueer test suite graders over HTTP.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="the address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="the port to listen on")
+    parser.add_argument("--english", default="english_examples.txt", help="the English test suite")
+    parser.add_argument("--language", default=LanguagePacks.get_language(), help="the target language of the translations, see LanguagePacks.py")
+    parser.add_argument("--adjectives", help="the adjective database, that of the language pack by default")
+    parser.add_argument("--terminology", help="the LGBTQAI+ terminology database, that of the language pack by default")
+    parser.add_argument("--tokenizer", choices=sorted(Tokenizer.BACKENDS), help="the tokenizer backend, see Tokenizer.py, that of the language pack by default")
+    parser.add_argument("--sections", default=SuiteSections.manifest_path, help="the section manifest of the test suite, see SuiteSections.py")
+    parser.add_argument("--references", nargs="+", help="reference translations of the test suite whose pronoun and adjective forms are also given full points, see References.py")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+    LanguagePacks.set_language(args.language)
+    if args.tokenizer:
+        Tokenizer.set_backend(args.tokenizer)
+    SuiteSections.set_manifest(args.sections)
+
+    state = load_shared_state(args.english, args.adjectives, args.terminology, args.references, args.language)
+    # The tokenizer is loaded before the first request rather than during it.
+    Tokenizer.word_tokenize(state["english_lines"][0])
+    Tokenizer.sent_tokenize(state["english_lines"][0])
+
+    server = create_server(state, args.host, args.port, args.verbose)
+    print(f"Grading server listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,25 @@
+import argparse
 import json
+import os
+
+from TermMatcher import TermMatcher
+from GradingResults import CategoryScore, GradingResult, TermGrade
+
+GRADER_VERSION = 2 # See PronounTranslationGrader.GRADER_VERSION
+
+# The database shipped with the test suite, found next to this file rather than in the
+# current working directory.
+DEFAULT_TERMINOLOGY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'terminology.json')
+
+# The section of the database holding the scoring rules rather than a term.
+RULES_KEY = "_rules"
+# The points, kind and detail of an acceptable translation which no rule applies to.
+CORRECT_SCORE = (1, "correct", "Correct: '{term}' translated as '{acceptable}'")
+# The kind of the grades given by a rule which does not name one.
+RULE_KIND = "warning"
+
+def rule_applies(rule, acceptable):
+    return acceptable in rule.get("forms", ()) or any(part in acceptable for part in rule.get("contains", ()))
 
 class LGBTQAITranslationGrader:
     """
@@ -13,35 +34,73 @@ class LGBTQAITranslationGrader:
     English sentences of the GenderQueer test suite and the other containing the translations
     in the target language (in this case, Icelandic). The class can be modified to suit
     other languages.
+
+    Some acceptable translations are only given half points, e.g. the compounds
+    "transkona" and "sískarl" rather than "trans kona" and "sís karl". These scoring rules
+    are the "_rules" section of the database, which is applied in order: a rule gives its
+    points and detail to the translations listed in its "forms" or containing one of its
+    "contains" strings, and the first rule that applies to a translation is used. A rule
+    can also give the kind of its grades, "warning" by default. The rules are compiled into a table of the points of every acceptable translation when
+    the database is loaded.
+
+    The class can also be used as a library. The database is then either read from
+    terminology_path or given as an already loaded dict (terminology_db), and the lines are
+    graded in memory with grade or grade_lines, so that a single grader can be kept and
+    used to grade any number of translations without reading any files:
+
+        grader = LGBTQAITranslationGrader(terminology_db=terminology)
+        result = grader.grade(english_lines, icelandic_lines)
+        result.accuracy("terminology", "correct")
     """
 
-    def __init__(self, show_details=False):
-        self.terminology_db = self.load_terminology_db()
+    def __init__(self, show_details=False, terminology_path=DEFAULT_TERMINOLOGY_PATH, terminology_db=None):
+        if terminology_db is None:
+            terminology_db = self.load_terminology_db(terminology_path)
+        self.rules = terminology_db.get(RULES_KEY, [])
+        self.terminology_db = {term: translations for term, translations in terminology_db.items() if term != RULES_KEY}
         self.show_details = show_details # Determines the verbosity of the report
+        self.build_matchers()
+        self.build_acceptable_scores()
 
-    def load_terminology_db(self):
-        with open('terminology.json', 'r', encoding='utf-8') as file:
+    def load_terminology_db(self, terminology_path=DEFAULT_TERMINOLOGY_PATH):
+        with open(terminology_path, 'r', encoding='utf-8') as file:
             return json.load(file)
 
+    def build_matchers(self):
+        # The English terms are matched as whole words, so that e.g. "bi" is not found in
+        # "bisexual" or "pan" in "pansexual". The translations are matched anywhere in the
+        # Icelandic text.
+        self.term_order = {term: i for i, term in enumerate(self.terminology_db)}
+        self.term_matcher = TermMatcher(self.terminology_db, word_boundaries=True)
+        self.translation_matcher = TermMatcher(form for translations in self.terminology_db.values() for form in translations['acceptable'] + translations['inappropriate'])
+
+    def build_acceptable_scores(self):
+        # The (points, kind, detail) of every acceptable translation, from the first rule that
+        # applies to it, so that a translation found is scored with a single lookup.
+        self.acceptable_scores = {}
+        for translations in self.terminology_db.values():
+            for acceptable in translations['acceptable']:
+                if acceptable not in self.acceptable_scores:
+                    rule = next((rule for rule in self.rules if rule_applies(rule, acceptable)), None)
+                    self.acceptable_scores[acceptable] = CORRECT_SCORE if rule is None else (rule['points'], rule.get('kind', RULE_KIND), rule['detail'])
+
     def identify_terms(self, english_text):
-        identified_terms = []
-        for term in self.terminology_db.keys():
-            if term in english_text:
-                if term == "bi":
-                    eng_tokens = english_text.split()
-                    if term in eng_tokens:
-                        identified_terms.append(term)
-                else:        
-                    identified_terms.append(term)
-        return identified_terms
-
-    def grade_translation(self, english_text, icelandic_text):
-        identified_terms = self.identify_terms(english_text)
-        cis_trans_compounds = ["transkona", "transkonur", "transkvenmaður", "transkvenmenn", "transmaður", "transkarl", "transkarlmaður", "transmenn", "transkarlar", "transkarlmenn", "sískona", "cískona", "ciskona", "sískvenmaður", "cískvenmaður", "ciskvenmaður", "sís-kona", "sís-kvenmaður", "cis-kona", "cis-kvenmaður", "cís-kona", "cís-kvenmaður", "sískonur", "cískonur", "ciskonur", "sískvenmenn", "cískvenmenn", "ciskvenmenn", "sís-konur", "sís-kvenmenn", "cis-konur", "cis-kvenmenn", "cís-konur", "cís-kvenmenn", "sísmaður", "cismaður", "císmaður", "sískarl", "ciskarl", "cískarl", "sískarlmaður", "ciskarlmaður", "cískarlmaður", "sís-maður", "sís-karl", "sís-karlmaður", "cis-maður", "cis-karl", "cis-karlmaður", "cís-maður", "cís-karl", "cís-karlmaður", "sísmenn", "cismenn", "císmenn", "sískarlar", "ciskarlar", "cískarlar", "sískarlmenn", "ciskarlmenn", "sís-menn", "sís-karlar", "sís-karlmenn", "cis-menn", "cis-karlar", "cis-karlmenn", "cís-menn", "cís-karlar", "cís-karlmenn"]
+        return sorted(self.term_matcher.find_all(english_text), key=self.term_order.get)
+
+    def identify_line_terms(self, english_lines):
+        return [self.identify_terms(eng_line.strip()) for eng_line in english_lines]
+
+    def grade_translation(self, english_text, icelandic_text, identified_terms=None):
+        # Returns the points, the number of inappropriate translations and a TermGrade for
+        # every grade given to a term.
+        if identified_terms is None:
+            identified_terms = self.identify_terms(english_text)
         
+        # The translation is only searched when the English text has terms to look for.
+        found_translations = self.translation_matcher.find_all(icelandic_text) if identified_terms else set()
         correct_terms = 0
         inappropriate_terms = 0
-        term_details = []
+        term_grades = []
 
         for term in identified_terms:
             translations = self.terminology_db[term]
@@ -49,62 +108,70 @@ class LGBTQAITranslationGrader:
             inappropriate_found = False
 
             for acceptable in translations['acceptable']:
-                if acceptable in icelandic_text:
+                if acceptable in found_translations:
                     correct_found = True
-                    if acceptable in cis_trans_compounds:
-                        term_details.append(f"Warning: '{term}' translated as '{acceptable}' but should be written as two separate words with trans/cis as an adjective (not as a compound). Using the compound is considered inappropriate by many within the trans community as it implies that they are a separate kind of person. This translation is scored as half right (0.5 points).")
-                        correct_terms += 0.5
-                    elif "transkynja" in acceptable or "sískynja" in acceptable or "ciskynja" in acceptable or "cískynja" in acceptable:
-                        term_details.append(f"Warning: '{term}' translated as '{acceptable}'. The adjectives 'transkynja' and 'sískynja' are generally not used though they do exist. A preferable translation of the adjective would be 'trans' or 'sís'. This translation is scored as half right (0.5 points).")
-                        correct_terms += 0.5                               
-                    elif acceptable=="lessur" or acceptable=="bæjarar":
-                        term_details.append(f"Warning: '{term}' translated as '{acceptable}'. The appropriateness of this term is context-dependent. This translation is scored as half right (0.5 points).")
-                        correct_terms += 0.5    
-                    else:
-                        term_details.append(f"Correct: '{term}' translated as '{acceptable}'")
-                        correct_terms += 1
+                    points, kind, detail = self.acceptable_scores[acceptable]
+                    term_grades.append(TermGrade(term, acceptable, points, kind, detail.format(term=term, acceptable=acceptable)))
+                    correct_terms += points
                     break
 
             for inappropriate in translations['inappropriate']:
-                if inappropriate in icelandic_text:
+                if inappropriate in found_translations:
                     inappropriate_terms += 1
                     inappropriate_found = True
-                    term_details.append(f"Inappropriate: '{term}' translated as '{inappropriate}'")
+                    term_grades.append(TermGrade(term, inappropriate, 0, "inappropriate", f"Inappropriate: '{term}' translated as '{inappropriate}'"))
                 break
             if not correct_found and not inappropriate_found:
-                term_details.append(f"Missing: No translation found for '{term}'")
+                term_grades.append(TermGrade(term, None, 0, "missing", f"Missing: No translation found for '{term}'"))
 
-        return correct_terms, inappropriate_terms, term_details
+        return correct_terms, inappropriate_terms, term_grades
 
-    def grade_files(self, english_file_path, icelandic_file_path):
+    def grade_lines(self, english_lines, icelandic_lines, line_terms=None):
+        # line_terms can hold the output of identify_line_terms for the English lines
+        # so that the terms are only identified once when grading several translations.
         total_terms = 0
         total_correct = 0
         total_inappropriate = 0
         all_term_details = []
 
-        try:
-            with open(english_file_path, 'r', encoding='utf-8') as eng_file, \
-                 open(icelandic_file_path, 'r', encoding='utf-8') as ice_file:
-                for i, (eng_line, ice_line) in enumerate(zip(eng_file, ice_file), 1):
-                    identified_terms = self.identify_terms(eng_line.strip())
-                    total_terms += len(identified_terms)
-                    correct, inappropriate, details = self.grade_translation(eng_line.strip(), ice_line.strip())
-                    total_correct += correct
-                    total_inappropriate += inappropriate
-                    if self.show_details:
-                        all_term_details.extend([f"Line {i}: {detail}" for detail in details])
-
-            if total_terms > 0:
-                correct_percentage = (total_correct / total_terms) * 100
+        for i, (eng_line, ice_line) in enumerate(zip(english_lines, icelandic_lines), 1):
+            if line_terms is None:
+                identified_terms = self.identify_terms(eng_line.strip())
             else:
-                correct_percentage = 0
+                identified_terms = line_terms[i - 1]
+            total_terms += len(identified_terms)
+            correct, inappropriate, term_grades = self.grade_translation(eng_line.strip(), ice_line.strip(), identified_terms)
+            total_correct += correct
+            total_inappropriate += inappropriate
+            if self.show_details:
+                all_term_details.extend([f"Line {i}: {term_grade.detail}" for term_grade in term_grades])
+
+        return total_terms, total_correct, total_inappropriate, all_term_details
+
+    def build_scores(self, total_terms, total_correct, total_inappropriate):
+        return [
+            CategoryScore("terminology", "correct", total_correct, total_terms, total_correct / total_terms * 100 if total_terms > 0 else 0,
+                          "Correct translation percentage of LGBTQAI+ terms"),
+            CategoryScore("terminology", "inappropriate", total_inappropriate, total_terms, total_inappropriate / total_terms * 100 if total_terms > 0 else 0,
+                          "Inappropriate or outdated translations of LGBTQAI+ terms"),
+        ]
+
+    def grade(self, english_lines, icelandic_lines, system=""):
+        total_terms, total_correct, total_inappropriate, _ = self.grade_lines(english_lines, icelandic_lines)
+        return GradingResult(system, self.build_scores(total_terms, total_correct, total_inappropriate))
 
-            report = f"""
+    def format_report(self, total_terms, total_correct, total_inappropriate, all_term_details):
+        if total_terms > 0:
+            correct_percentage = (total_correct / total_terms) * 100
+        else:
+            correct_percentage = 0
+
+        report = f"""
 LGBTQAI+ Terminology Translation Report:
 ---------------------------------------
 Total LGBTQAI+ terms identified: {total_terms}
 Correctly translated terms: {total_correct}
-Inappropriate or outdated translations: {total_inappropriate} ({(total_inappropriate / total_terms)* 100:.2f}%)
+Inappropriate or outdated translations: {total_inappropriate} ({(total_inappropriate / total_terms) * 100 if total_terms > 0 else 0:.2f}%)
 Correct translation percentage: {correct_percentage:.2f}%
 
 Overall Assessment:
@@ -112,11 +179,17 @@ Overall Assessment:
 There were {total_inappropriate} instance(s) of inappropriate terminology.
                     """
 
-            if self.show_details:
-                report += "\nDetailed breakdown:\n"
-                report += "\n".join(all_term_details)
+        if self.show_details:
+            report += "\nDetailed breakdown:\n"
+            report += "\n".join(all_term_details)
 
-            return report
+        return report
+
+    def grade_files(self, english_file_path, icelandic_file_path):
+        try:
+            with open(english_file_path, 'r', encoding='utf-8') as eng_file, \
+                 open(icelandic_file_path, 'r', encoding='utf-8') as ice_file:
+                return self.format_report(*self.grade_lines(eng_file, ice_file))
 
         except FileNotFoundError as e:
             return f"Error: File not found - {str(e)}"
@@ -124,8 +197,16 @@ There were {total_inappropriate} instance(s) of inappropriate terminology.
             return f"An error occurred while processing the files: {str(e)}"
 
 
-grader = LGBTQAITranslationGrader(show_details=False)  # Set to False to hide detailed breakdown
-english_file_path = "english_examples.txt"
-icelandic_file_path = "gold_standard.txt"
-report = grader.grade_files(english_file_path, icelandic_file_path)
-print(report)
\ No newline at end of file
+def main():
+    parser = argparse.ArgumentParser(description="Grade the translation of LGBTQAI+ terms in a translation of the GenderQueer test suite.")
+    parser.add_argument("english", nargs="?", default="english_examples.txt", help="the English test suite")
+    parser.add_argument("icelandic", nargs="?", default="gold_standard.txt", help="the translation to grade")
+    parser.add_argument("--terminology", default=DEFAULT_TERMINOLOGY_PATH, help="the LGBTQAI+ terminology database")
+    parser.add_argument("--details", action="store_true", help="list the grade of every term")
+    args = parser.parse_args()
+
+    grader = LGBTQAITranslationGrader(show_details=args.details, terminology_path=args.terminology)
+    print(grader.grade_files(args.english, args.icelandic))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
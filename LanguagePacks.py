@@ -0,0 +1,201 @@
+import argparse
+import hashlib
+import json
+import os
+import pickle
+
+import Tokenizer
+import LineCache
+import GenderedAdjectivesTranslationGrader
+from PronounTranslationGrader import PRONOUNS, PRONOUN_SLOTS
+from LGBTQAITranslationGrader import LGBTQAITranslationGrader, GRADER_VERSION as TERMINOLOGY_GRADER_VERSION
+
+"""
+    This program loads the language packs, which hold what the graders need to know about
+    the target language of the translations: the pronouns that translate "they", the
+    adjective database, the LGBTQAI+ terminology database and, optionally, the tokenizer
+    backend (see Tokenizer.py). The packs are described in languages.json by language code,
+    with the files relative to languages.json:
+
+        "is": {
+            "name": "Icelandic",
+            "pronouns": {"feminine_plural": ["þær"], "masculine_plural": ["þeir"], ...},
+            "adjectives": "adjectives.json",
+            "terminology": "terminology.json"
+        }
+
+    The rules of the pronoun grader are written with the Icelandic pronouns, so a pack gives
+    the pronoun(s) of its language that stand for each of them, see PRONOUN_SLOTS in
+    PronounTranslationGrader.py. Packs for other languages can be added to languages.json,
+    to another file chosen with set_registry or the GENDERQUEER_LANGUAGES environment
+    variable, or at run time with register_language_pack.
+
+    A pack is compiled the first time it is used into a binary file in the user's cache
+    (see LineCache.cache_directory) holding its pronoun table, adjective index and
+    terminology database, only plain data. The file is named after a hash of the pack and
+    its databases, so the pack is only compiled again when one of them changes. The
+    terminology grader and its automata (see TermMatcher.py) are built from the database
+    when the pack is loaded. A loaded pack is kept for the rest of the process, so
+    translations into several languages can be graded in a single process. The graders
+    are given the pronoun table of the pack they grade with (see
+    PronounTranslationGrader.pronoun_tokens), so loading another pack does not change
+    how a grader that is already set up reads the pronouns:
+
+        for language in ["is", "fo"]:
+            grade_systems([f"translations/{language}/"], language=language)
+
+    python LanguagePacks.py is
+"""
+
+PACK_VERSION = 2
+PACK_DIRECTORY = LineCache.cache_directory("language_packs")
+DEFAULT_REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "languages.json")
+DEFAULT_LANGUAGE = "is"
+
+registry_path = os.environ.get("GENDERQUEER_LANGUAGES", DEFAULT_REGISTRY_PATH)
+registry = None
+# The packs registered with register_language_pack, which take precedence over the registry.
+registered_packs = {}
+# The compiled packs, by the hash of the pack and its databases.
+loaded_packs = {}
+language = DEFAULT_LANGUAGE
+current_pack = None
+
+def resolve_pack(definition, directory):
+    pack = dict(definition)
+    for key in ("adjectives", "terminology"):
+        pack[key] = os.path.join(directory, pack[key])
+    unknown_slots = set(pack.get("pronouns", {})) - set(PRONOUN_SLOTS)
+    if unknown_slots:
+        raise ValueError(f"Unknown pronoun(s) {', '.join(sorted(unknown_slots))} in the language pack, expected: {', '.join(PRONOUN_SLOTS)}")
+    tokenizer = pack.get("tokenizer")
+    if tokenizer is not None and tokenizer not in Tokenizer.BACKENDS:
+        raise ValueError(f"Unknown tokenizer backend '{tokenizer}' in the language pack, expected one of: {', '.join(Tokenizer.BACKENDS)}")
+    return pack
+
+def load_registry(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        loaded = json.load(f)
+    directory = os.path.dirname(os.path.abspath(file_path))
+    return {code: resolve_pack(definition, directory) for code, definition in loaded.items()}
+
+def set_registry(file_path):
+    global registry_path, registry
+    registry_path = file_path
+    registry = None
+
+def get_registry():
+    global registry
+    if registry is None:
+        registry = load_registry(registry_path)
+    return registry
+
+def register_language_pack(code, definition, directory="."):
+    registered_packs[code] = resolve_pack(definition, directory)
+
+def languages():
+    return sorted(set(get_registry()) | set(registered_packs))
+
+def pack_definition(code):
+    if code in registered_packs:
+        return registered_packs[code]
+    if code not in get_registry():
+        raise ValueError(f"Unknown language '{code}', expected one of: {', '.join(languages())}")
+    return get_registry()[code]
+
+def pack_key(code, definition):
+    digest = hashlib.sha256(f"{PACK_VERSION}\x1f{GenderedAdjectivesTranslationGrader.GRADER_VERSION}\x1f{TERMINOLOGY_GRADER_VERSION}\x1f{code}".encode())
+    digest.update(json.dumps(definition, sort_keys=True).encode())
+    for file_path in (definition["adjectives"], definition["terminology"]):
+        with open(file_path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def compile_pronoun_forms(pronouns):
+    # The Icelandic pronoun for each pronoun of the language, None for Icelandic, whose
+    # pronouns are graded as they are. An Icelandic pronoun which is not a pronoun of the
+    # language is mapped to "", so that a word spelled like it is not counted.
+    forms = {form.lower(): PRONOUN_SLOTS[slot] for slot, slot_forms in pronouns.items() for form in slot_forms}
+    if forms == {pronoun: pronoun for pronoun in PRONOUNS}:
+        return None
+    for pronoun in PRONOUNS:
+        forms.setdefault(pronoun, "")
+    return forms
+
+def compile_pack(code, definition, key):
+    # Only plain data, so that a saved pack never holds objects of an older version of
+    # the graders.
+    adj_database = GenderedAdjectivesTranslationGrader.load_adjective_database(definition["adjectives"])
+    with open(definition["terminology"], 'r', encoding='utf-8') as f:
+        terminology_db = json.load(f)
+    return {
+        "language": code,
+        "name": definition.get("name", code),
+        "key": key,
+        "tokenizer": definition.get("tokenizer"),
+        "adjectives_file": definition["adjectives"],
+        "terminology_file": definition["terminology"],
+        # Without a pronoun table, the pack uses the Icelandic pronouns.
+        "pronoun_forms": compile_pronoun_forms(definition["pronouns"]) if "pronouns" in definition else None,
+        "adjective_database": adj_database,
+        "adjective_index": GenderedAdjectivesTranslationGrader.build_adjective_index(adj_database),
+        "terminology_db": terminology_db,
+    }
+
+def load_language_pack(code, pack_directory=PACK_DIRECTORY):
+    definition = pack_definition(code)
+    key = pack_key(code, definition)
+    if key in loaded_packs:
+        return loaded_packs[key]
+
+    pack_path = os.path.join(pack_directory, key + ".pickle")
+    if os.path.exists(pack_path):
+        with open(pack_path, 'rb') as f:
+            pack = pickle.load(f)
+    else:
+        pack = compile_pack(code, definition, key)
+        try:
+            LineCache.write_atomically(pack_path, lambda f: pickle.dump(pack, f, protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError:
+            # The pack is compiled again by the next process instead.
+            pass
+    pack["terminology_grader"] = LGBTQAITranslationGrader(show_details=False, terminology_db=pack["terminology_db"])
+    loaded_packs[key] = pack
+    return pack
+
+def set_language(code=None):
+    # Makes the graders expect translations into the given language, or loads the pack of
+    # the current language again if None, and returns the compiled pack. The tokenizer
+    # backend of the pack is only chosen when the pack changes, so that a backend chosen
+    # afterwards, e.g. with --tokenizer, is kept.
+    global language, current_pack
+    pack = load_language_pack(code or language)
+    if pack is not current_pack and pack["tokenizer"] is not None and pack["tokenizer"] != Tokenizer.get_backend():
+        Tokenizer.set_backend(pack["tokenizer"])
+    language = pack["language"]
+    current_pack = pack
+    return pack
+
+def get_language():
+    return language
+
+def get_pack():
+    if current_pack is None:
+        return set_language()
+    return current_pack
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the language packs of the GenderQueer test suite graders.")
+    parser.add_argument("languages", nargs="*", help="the language codes, all the languages of the registry by default")
+    parser.add_argument("--registry", default=registry_path, help="the file describing the language packs")
+    args = parser.parse_args()
+    set_registry(args.registry)
+
+    for code in args.languages or languages():
+        pack = load_language_pack(code)
+        pronouns = "Icelandic pronouns" if pack["pronoun_forms"] is None else f"{len(pack['pronoun_forms'])} pronoun forms"
+        print(f"{code} ({pack['name']}): {pronouns}, {len(pack['adjective_index']['forms'])} adjective forms, "
+              f"{len(pack['terminology_grader'].terminology_db)} terms, {os.path.join(PACK_DIRECTORY, pack['key'])}.pickle")
+
+if __name__ == "__main__":
+    main()
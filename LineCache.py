@@ -0,0 +1,131 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+
+"""
+    This program keeps the grades of single lines of a translation in an SQLite database
+    on disk, so that when a new version of a translation is graded, e.g. a new checkpoint
+    of an MT system in which only a few lines have changed, only the lines that changed
+    are graded again.
+
+    A grade is stored under a key made of the name and version of the grader, the English
+    example, its translation and anything else the grade depends on, e.g. the version of
+    the adjective or terminology database and the tokenizer. A change to any of them
+    therefore results in a new key rather than an outdated grade.
+
+    The cache is kept in the user's cache (see cache_directory) unless another file is
+    given. The size of the cache is capped. When it grows past the cap, the grades that
+    were used least recently are removed.
+"""
+
+MAX_SIZE = 64 * 1024 * 1024
+# The number of grades kept in memory before they are written to the database.
+FLUSH_INTERVAL = 10000
+
+def cache_directory(name):
+    # A directory of the user's cache rather than of the current working directory, for the
+    # files the graders compile. GENDERQUEER_CACHE chooses another place for all of them.
+    base = os.environ.get("GENDERQUEER_CACHE") or os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "genderqueer")
+    return os.path.join(base, name)
+
+CACHE_FILE = os.path.join(cache_directory("line_cache"), "grades.sqlite")
+
+def write_atomically(path, write):
+    # Writes a file through a temporary file in the same directory, which then replaces it,
+    # so that a grader running at the same time never reads a half-written file. write is
+    # given the temporary file, opened in binary mode.
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Named after the process and thread, e.g. of the grading server, which writes it.
+    temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temporary_path, 'wb') as f:
+            write(f)
+        os.replace(temporary_path, path)
+    except BaseException:
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+        raise
+
+def file_version(file_path):
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def cache_key(grader, key_parts):
+    digest = hashlib.sha256(grader.encode())
+    for part in key_parts:
+        digest.update(b"\x1f" + repr(part).encode())
+    return digest.hexdigest()
+
+class LineCache:
+    def __init__(self, cache_file=CACHE_FILE, max_size=MAX_SIZE):
+        self.max_size = max_size
+        directory = os.path.dirname(cache_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(cache_file)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS grades (key TEXT PRIMARY KEY, grade BLOB, size INTEGER, last_used INTEGER)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS grades_last_used ON grades (last_used)")
+        self.clock = self.connection.execute("SELECT COALESCE(MAX(last_used), 0) FROM grades").fetchone()[0]
+        self.pending_grades = {}
+        self.pending_uses = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, grader, key_parts):
+        key = cache_key(grader, key_parts)
+        self.clock += 1
+        if key in self.pending_grades:
+            self.hits += 1
+            return pickle.loads(self.pending_grades[key][0])
+        row = self.connection.execute("SELECT grade FROM grades WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # The time of use is written with the next flush rather than on every hit.
+        self.pending_uses[key] = self.clock
+        return pickle.loads(row[0])
+
+    def put(self, grader, key_parts, grade):
+        self.clock += 1
+        self.pending_grades[cache_key(grader, key_parts)] = (pickle.dumps(grade, protocol=pickle.HIGHEST_PROTOCOL), self.clock)
+        if len(self.pending_grades) >= FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        with self.connection:
+            self.connection.executemany("UPDATE grades SET last_used = ? WHERE key = ?", [(clock, key) for key, clock in self.pending_uses.items()])
+            self.connection.executemany("INSERT OR REPLACE INTO grades VALUES (?, ?, ?, ?)",
+                                        [(key, grade, len(grade), clock) for key, (grade, clock) in self.pending_grades.items()])
+            self.pending_uses = {}
+            self.pending_grades = {}
+            self.evict()
+
+    def evict(self):
+        total_size = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM grades").fetchone()[0]
+        if total_size <= self.max_size:
+            return
+        # The least recently used grades are removed until the cache is back under the cap.
+        removed = []
+        for key, size in self.connection.execute("SELECT key, size FROM grades ORDER BY last_used"):
+            if total_size <= self.max_size:
+                break
+            removed.append((key,))
+            total_size -= size
+        self.connection.executemany("DELETE FROM grades WHERE key = ?", removed)
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
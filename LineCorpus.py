@@ -0,0 +1,160 @@
+import hashlib
+import mmap
+import os
+from array import array
+from collections.abc import Sequence
+
+import LineCache
+
+"""
+    This program reads the lines of a large text file, e.g. the translations of hundreds
+    of MT systems concatenated into one file, without loading the file into memory. The
+    file is memory-mapped and the offset of every line is indexed once, so a LineCorpus
+    is a sequence of lines like the list returned by readlines, but a line is only read
+    and decoded when it is used. Slicing a LineCorpus gives another lazy sequence, so a
+    grader which only grades some sections of the test suite only decodes their lines.
+
+    The line index of a large file is saved in the user's cache (see LineCache.py), in a
+    binary file named after the path of the file, along with the size and modification
+    time of the file, so it is built again and replaces the old one when the file changes.
+    The index file is memory-mapped as well, which keeps the memory use of a LineCorpus the
+    same whatever the size of the file. Smaller files, and files whose index cannot be
+    saved, e.g. in a read-only cache, are indexed in memory.
+
+    As with files opened in text mode, the lines end with "\n", also where the file has
+    Windows line endings.
+"""
+
+INDEX_DIRECTORY = LineCache.cache_directory("corpus_index")
+INDEX_VERSION = 2
+OFFSET_TYPE = 'q'
+# Files smaller than this are scanned on every run, which takes little time, rather than
+# given a saved index.
+MIN_SAVED_SIZE = 1 << 26
+# A saved index starts with the version of the index and the size and modification time
+# of the file.
+HEADER_LENGTH = 3
+# The file is scanned for line breaks in blocks of this many bytes.
+BLOCK_SIZE = 1 << 24
+
+def index_path(file_path, index_directory=INDEX_DIRECTORY):
+    # One index per file, which is replaced when the file changes.
+    return os.path.join(index_directory, hashlib.sha256(os.path.abspath(file_path).encode()).hexdigest() + ".offsets")
+
+def index_header(file_path):
+    stat = os.stat(file_path)
+    return [INDEX_VERSION, stat.st_size, stat.st_mtime_ns]
+
+def build_offsets(data):
+    # The offset of the start of every line, followed by the size of the file.
+    offsets = array(OFFSET_TYPE, [0])
+    size = len(data)
+    start = 0
+    while start < size:
+        block = data[start:start + BLOCK_SIZE]
+        position = block.find(b"\n")
+        while position != -1:
+            offsets.append(start + position + 1)
+            position = block.find(b"\n", position + 1)
+        start += len(block)
+    if offsets[-1] != size:
+        # The last line has no line break.
+        offsets.append(size)
+    return offsets
+
+def read_index(path, header):
+    # The offsets of the saved index, None if there is none or it is out of date.
+    try:
+        with open(path, 'rb') as f:
+            index = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)).cast(OFFSET_TYPE)
+    except (OSError, ValueError, TypeError):
+        # No index, an empty one, or one whose size is not a whole number of offsets.
+        return None
+    if len(index) <= HEADER_LENGTH or index[:HEADER_LENGTH].tolist() != header:
+        return None
+    return index[HEADER_LENGTH:]
+
+def save_index(path, header, offsets):
+    def write(f):
+        array(OFFSET_TYPE, header).tofile(f)
+        offsets.tofile(f)
+    LineCache.write_atomically(path, write)
+
+def load_offsets(file_path, data, index_directory=INDEX_DIRECTORY):
+    if len(data) < MIN_SAVED_SIZE:
+        return build_offsets(data)
+    path = index_path(file_path, index_directory)
+    header = index_header(file_path)
+    offsets = read_index(path, header)
+    if offsets is None:
+        offsets = build_offsets(data)
+        try:
+            save_index(path, header, offsets)
+        except OSError:
+            # The index is kept in memory instead.
+            pass
+    return offsets
+
+class LineCorpus(Sequence):
+    def __init__(self, file_path, index_directory=INDEX_DIRECTORY, encoding='utf-8'):
+        self.file_path = file_path
+        self.index_directory = index_directory
+        self.encoding = encoding
+        with open(file_path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+        self.offsets = load_offsets(file_path, self.data, index_directory)
+
+    def line(self, i):
+        line = self.data[self.offsets[i]:self.offsets[i + 1]].decode(self.encoding)
+        if line.endswith("\r\n"):
+            line = line[:-2] + "\n"
+        return line
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return CorpusSlice(self, range(len(self))[i])
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("line index out of range")
+        return self.line(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.line(i)
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __reduce__(self):
+        # A corpus sent to another process is opened there again rather than copied.
+        return LineCorpus, (self.file_path, self.index_directory, self.encoding)
+
+class CorpusSlice(Sequence):
+    def __init__(self, corpus, line_numbers):
+        self.corpus = corpus
+        self.line_numbers = line_numbers
+
+    def __len__(self):
+        return len(self.line_numbers)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return CorpusSlice(self.corpus, self.line_numbers[i])
+        return self.corpus.line(self.line_numbers[i])
+
+    def __iter__(self):
+        for i in self.line_numbers:
+            yield self.corpus.line(i)
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
@@ -0,0 +1,221 @@
+import argparse
+import functools
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+
+"""
+    This program measures where the time of a grading run goes. When a Profiler is
+    enabled, the functions listed in TARGETS, i.e. the tokenizer, the identify_subject_*
+    functions, the adjective matching, the terminology matching and the graders of single
+    lines of the three graders, are replaced by wrappers which record the wall time and
+    the number of calls of each function and a histogram of the time taken by each call.
+    Disabling the profiler puts the original functions back, so when it is not enabled,
+    which is the default, the graders run exactly as they would without it.
+
+    The time of a function is also counted without the time of the profiled functions it
+    calls, and added up per stage (tokenization, subject identification, adjective matching,
+    terminology matching and grading). The profile can be saved as JSON, or as collapsed
+    stacks ("frame;frame;frame microseconds" per line) which flamegraph.pl, speedscope and
+    similar tools turn into a flame graph.
+
+        with Profiler() as profiler:
+            grade_systems(["translations/"])
+        profiler.write_json("profile.json")
+
+    Calls made in other processes are not recorded, so runs of BatchTranslationGrader.py
+    should be profiled with a single worker. The command line profiles the main function
+    of one of the programs of the test suite:
+
+    python Profiler.py --output profile -- BatchTranslationGrader translations/ --tokenizer regex
+"""
+
+# The functions that are profiled, as (module, function or Class.method, stage).
+TARGETS = [
+    ("Tokenizer", "word_tokenize", "tokenization"),
+    ("Tokenizer", "sent_tokenize", "tokenization"),
+    ("PronounTranslationGrader", "identify_subject_only_they", "subject_identification"),
+    ("PronounTranslationGrader", "identify_subject_only_we_or_singular", "subject_identification"),
+    ("PronounTranslationGrader", "identify_subject_we_and_they", "subject_identification"),
+    ("PronounTranslationGrader", "grade_only_they_line", "pronoun_grading"),
+    ("PronounTranslationGrader", "grade_singular_we_line", "pronoun_grading"),
+    ("PronounTranslationGrader", "grade_we_they_line", "pronoun_grading"),
+    ("GenderedAdjectivesTranslationGrader", "identify_subject_only_we_or_singular", "subject_identification"),
+    ("GenderedAdjectivesTranslationGrader", "identify_subject_we_and_they", "subject_identification"),
+    ("GenderedAdjectivesTranslationGrader", "identify_subject_names", "subject_identification"),
+    ("GenderedAdjectivesTranslationGrader", "find_adjectives", "adjective_matching"),
+    ("GenderedAdjectivesTranslationGrader", "find_adjective_forms", "adjective_matching"),
+    ("GenderedAdjectivesTranslationGrader", "grade_singular_we_line", "adjective_grading"),
+    ("GenderedAdjectivesTranslationGrader", "grade_we_they_line", "adjective_grading"),
+    ("GenderedAdjectivesTranslationGrader", "grade_names_line", "adjective_grading"),
+    ("TermMatcher", "TermMatcher.find_all", "terminology_matching"),
+    ("LGBTQAITranslationGrader", "LGBTQAITranslationGrader.grade_translation", "terminology_grading"),
+]
+
+# The histogram buckets hold calls shorter than 1, 2, 4, ... microseconds, up to about 17 seconds.
+HISTOGRAM_BUCKETS = [2 ** i for i in range(25)]
+
+def new_function_stats(stage):
+    return {"stage": stage, "calls": 0, "total_seconds": 0.0, "self_seconds": 0.0, "histogram": [0] * (len(HISTOGRAM_BUCKETS) + 1)}
+
+def histogram_bucket(seconds):
+    # The index of the smallest bucket the time fits in, the last one for longer calls.
+    return min(int(seconds * 1e6).bit_length(), len(HISTOGRAM_BUCKETS))
+
+def repo_modules():
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for module in list(sys.modules.values()):
+        module_file = getattr(module, "__file__", None)
+        if module_file and os.path.dirname(os.path.abspath(module_file)) == directory:
+            yield module
+
+class Profiler:
+    def __init__(self, targets=TARGETS):
+        self.targets = targets
+        self.functions = {}
+        self.stacks = {}
+        self.patches = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.wall_seconds = 0.0
+        self.started = None
+
+    def wrap(self, name, stage, function):
+        stats = self.functions.setdefault(name, new_function_stats(stage))
+        profiler = self
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            frames = profiler.frames()
+            frames.append([name, 0.0])
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler.record(frames, stats, time.perf_counter() - start)
+
+        # The tokenizer's set_backend clears the caches through the wrapper.
+        for attribute in ("cache_clear", "cache_info"):
+            if hasattr(function, attribute):
+                setattr(wrapper, attribute, getattr(function, attribute))
+        return wrapper
+
+    def frames(self):
+        # The profiled calls in progress in this thread, as [name, time spent in profiled calls].
+        if not hasattr(self.local, "frames"):
+            self.local.frames = []
+        return self.local.frames
+
+    def record(self, frames, stats, seconds):
+        stack = ";".join(frame[0] for frame in frames)
+        self_seconds = seconds - frames.pop()[1]
+        if frames:
+            frames[-1][1] += seconds
+        with self.lock:
+            stats["calls"] += 1
+            stats["total_seconds"] += seconds
+            stats["self_seconds"] += self_seconds
+            stats["histogram"][histogram_bucket(seconds)] += 1
+            self.stacks[stack] = self.stacks.get(stack, 0.0) + self_seconds
+
+    def patch(self, owner, attribute, replacement):
+        self.patches.append((owner, attribute, getattr(owner, attribute)))
+        setattr(owner, attribute, replacement)
+
+    def enable(self):
+        if self.patches:
+            return self
+        for module_name, path, stage in self.targets:
+            owner = importlib.import_module(module_name)
+            class_name, _, attribute = path.rpartition(".")
+            if class_name:
+                owner = getattr(owner, class_name)
+            original = getattr(owner, attribute)
+            wrapper = self.wrap(f"{module_name}.{path}", stage, original)
+            self.patch(owner, attribute, wrapper)
+            if not class_name:
+                # Modules which imported the function by name, e.g. from Tokenizer import
+                # word_tokenize, hold their own reference to it.
+                for module in repo_modules():
+                    for name, value in list(vars(module).items()):
+                        if value is original:
+                            self.patch(module, name, wrapper)
+        self.started = time.perf_counter()
+        return self
+
+    def disable(self):
+        for owner, attribute, original in reversed(self.patches):
+            setattr(owner, attribute, original)
+        self.patches = []
+        if self.started is not None:
+            self.wall_seconds += time.perf_counter() - self.started
+            self.started = None
+
+    def __enter__(self):
+        return self.enable()
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def stage_seconds(self):
+        stages = {}
+        for stats in self.functions.values():
+            stages[stats["stage"]] = stages.get(stats["stage"], 0.0) + stats["self_seconds"]
+        return stages
+
+    def to_dict(self):
+        functions = {}
+        for name, stats in self.functions.items():
+            if not stats["calls"]:
+                continue
+            histogram = {f"<{bound}us": count for bound, count in zip(HISTOGRAM_BUCKETS, stats["histogram"]) if count}
+            if stats["histogram"][-1]:
+                histogram[f">={HISTOGRAM_BUCKETS[-1]}us"] = stats["histogram"][-1]
+            functions[name] = dict(stats, mean_seconds=stats["total_seconds"] / stats["calls"], histogram=histogram)
+        return {"wall_seconds": self.wall_seconds, "stages": self.stage_seconds(), "functions": functions}
+
+    def collapsed_stacks(self):
+        return "".join(f"{stack} {round(seconds * 1e6)}\n" for stack, seconds in sorted(self.stacks.items()) if seconds > 0)
+
+    def write_json(self, output_file):
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def write_collapsed(self, output_file):
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(self.collapsed_stacks())
+
+    def report(self):
+        profile = self.to_dict()
+        lines = [f"Profiled wall time: {profile['wall_seconds']:.3f} s", "", "Time per stage (without profiled calls to other stages):"]
+        for stage, seconds in sorted(profile["stages"].items(), key=lambda item: -item[1]):
+            lines.append(f"  {stage:<24} {seconds:>9.3f} s")
+        lines += ["", f"  {'function':<68} {'calls':>9} {'total s':>9} {'self s':>9} {'mean us':>9}"]
+        for name, stats in sorted(profile["functions"].items(), key=lambda item: -item[1]["self_seconds"]):
+            lines.append(f"  {name:<68} {stats['calls']:>9} {stats['total_seconds']:>9.3f} {stats['self_seconds']:>9.3f} {stats['mean_seconds'] * 1e6:>9.1f}")
+        return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile a run of one of the GenderQueer test suite graders.")
+    parser.add_argument("--output", default="profile", help="the profile is written to OUTPUT.json and OUTPUT.collapsed")
+    parser.add_argument("module", help="the program to profile, e.g. BatchTranslationGrader, whose main function is run")
+    parser.add_argument("arguments", nargs=argparse.REMAINDER, help="the arguments of the program")
+    args = parser.parse_args()
+
+    # The program is imported rather than run as __main__ so that its own functions are profiled too.
+    module = importlib.import_module(args.module[:-3] if args.module.endswith(".py") else args.module)
+    sys.argv = [module.__file__] + args.arguments
+    profiler = Profiler()
+    try:
+        with profiler:
+            module.main()
+    finally:
+        profiler.write_json(args.output + ".json")
+        profiler.write_collapsed(args.output + ".collapsed")
+        print(profiler.report(), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+from array import array
+from enum import IntEnum
+from operator import add
+from types import SimpleNamespace
+
+"""
+    This program holds the counters the pronoun grader keeps for each category of
+    examples (feminine, masculine_trans_children, short, ...): the number of times the
+    category was graded and the points scored in it. The categories are numbered by the
+    Category enum, and the counters of a translation, or of part of it, are a pair of
+    flat arrays indexed by it, (counts, correct), which are cheap to add up, to pickle
+    and to send between processes. Single lines are graded into lists, which are faster
+    to update one category at a time, and turned into arrays when a section is graded.
+
+    The counters of several translations can be stacked into two NumPy matrices of shape
+    (translations, categories), e.g. to compare MT systems category by category. NumPy is
+    only imported when they are.
+"""
+
+PRONOUN_CATEGORIES = ["singular_they", "feminine", "masculine", "neuter", "feminine_unspecified", "feminine_trans", "feminine_cis", "masculine_unspecified", "masculine_trans", "masculine_cis", "neuter_unspecified", "neuter_trans", "neuter_cis", "neuter_cis_and_trans", "feminine_unspecified_children", "feminine_trans_children", "feminine_cis_children", "masculine_unspecified_children", "masculine_trans_children", "masculine_cis_children", "neuter_unspecified_children", "neuter_trans_children", "neuter_cis_children", "neuter_cis_and_trans_children", "feminine_unspecified_nochildren", "feminine_trans_nochildren", "feminine_cis_nochildren", "masculine_unspecified_nochildren", "masculine_trans_nochildren", "masculine_cis_nochildren", "neuter_unspecified_nochildren", "neuter_trans_nochildren", "neuter_cis_nochildren", "neuter_cis_and_trans_nochildren", "singular_they_children", "singular_they_nochildren", "short", "long"]
+
+Category = IntEnum("Category", PRONOUN_CATEGORIES, start=0)
+# The same numbers as plain ints, for the line graders, since looking a member up in the
+# enum takes longer than the addition it is used for.
+CATEGORY = SimpleNamespace(**{category.name: category.value for category in Category})
+
+# The counts are whole numbers, the points may be halves.
+COUNT_TYPE = 'q'
+CORRECT_TYPE = 'd'
+
+def new_counters():
+    return array(COUNT_TYPE, [0]) * len(Category), array(CORRECT_TYPE, [0.0]) * len(Category)
+
+def new_line_counters():
+    # Counters for grading lines one addition at a time, as lists, which are faster to
+    # update item by item than arrays. They are turned into arrays with to_arrays.
+    return [0] * len(Category), [0] * len(Category)
+
+def to_arrays(counts, correct):
+    return array(COUNT_TYPE, counts), array(CORRECT_TYPE, correct)
+
+def add_counters(total, counters):
+    # Adds the counters to the total in place.
+    total_counts, total_correct = total
+    counts, correct = counters
+    total_counts[:] = array(COUNT_TYPE, map(add, total_counts, counts))
+    total_correct[:] = array(CORRECT_TYPE, map(add, total_correct, correct))
+
+def merge_counters(partial_counters):
+    # The partial counters are added up in the order given, so the merged counters are
+    # the same no matter where or in which order the parts were graded.
+    total = new_counters()
+    for counters in partial_counters:
+        add_counters(total, counters)
+    return total
+
+def accuracies(counts, correct):
+    return [points / count * 100 if count > 0 else 0 for count, points in zip(counts, correct)]
+
+def to_sparse(values):
+    # The non-zero values by category number, e.g. to keep the counters of a single line.
+    return {i: value for i, value in enumerate(values) if value}
+
+def from_sparse(sparse_counts, sparse_correct):
+    counts, correct = new_counters()
+    for i, value in sparse_counts.items():
+        counts[i] = value
+    for i, value in sparse_correct.items():
+        correct[i] = value
+    return counts, correct
+
+def by_name(values, nonzero=False):
+    return {category: value for category, value in zip(PRONOUN_CATEGORIES, values) if value or not nonzero}
+
+def stack_counters(systems_counters):
+    # The counts and points of several translations as two matrices of shape
+    # (translations, categories), with no copy of the arrays until they are stacked.
+    import numpy as np
+    counts = np.vstack([np.frombuffer(counts, dtype=np.int64) for counts, _ in systems_counters])
+    correct = np.vstack([np.frombuffer(correct, dtype=np.float64) for _, correct in systems_counters])
+    return counts, correct
+
+def accuracy_matrix(counts, correct):
+    # The accuracy of every category of every translation, 0 where a category was not graded.
+    import numpy as np
+    return np.divide(correct * 100, counts, out=np.zeros(correct.shape), where=counts > 0)
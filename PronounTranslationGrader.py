@@ -1,6 +1,12 @@
 import json
-import re
-from nltk import word_tokenize, sent_tokenize
+from itertools import repeat
+from Tokenizer import word_tokenize, sent_tokenize
+import SuiteSections
+import SubjectClassifier
+from LineCorpus import LineCorpus
+import PronounCounters
+from PronounCounters import PRONOUN_CATEGORIES, Category, CATEGORY
+from GradingResults import CategoryScore, GradingResult, render_text
 
 """
     This program automatically grades translations of text examples including explicitly
@@ -50,506 +56,494 @@ def load_adjective_database(file_path):
     with open(file_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+def split_sections(lines):
+    return SuiteSections.split_sections(lines, "pronouns", SECTIONS)
+
+def load_sections(file_path):
+    # Only the lines of the sections are read, see LineCorpus.py.
+    return split_sections(LineCorpus(file_path))
+
 def load_text_files(icelandic_file, english_file):
-    with open(icelandic_file, 'r', encoding='utf-8') as f:
-        icelandic_lines_only_they = f.readlines()[:169]
-        f.seek(0)
-        icelandic_lines_singular_we = f.readlines()[169:265]
-        f.seek(0)
-        icelandic_lines_we_they = f.readlines()[265:319]
-    with open(english_file, 'r', encoding='utf-8') as f:
-        english_lines_only_they = f.readlines()[:169]
-        f.seek(0)
-        english_lines_singular_we = f.readlines()[169:265]
-        f.seek(0)
-        english_lines_we_they = f.readlines()[265:319]
+    icelandic_lines_only_they, icelandic_lines_singular_we, icelandic_lines_we_they = load_sections(icelandic_file)
+    english_lines_only_they, english_lines_singular_we, english_lines_we_they = load_sections(english_file)
     return icelandic_lines_only_they, english_lines_only_they, icelandic_lines_singular_we, english_lines_singular_we, icelandic_lines_we_they, english_lines_we_they
 
 def identify_subject_only_they(text):
-    if "these women" in text:
-        return "female_plural_unspecified"
-    elif "these trans women" in text: 
-        return "female_plural_trans"
-    elif "these cis women" in text:
-        return "female_plural_cis"
-    elif "these men" in text:
-        return "male_plural_unspecified"
-    elif "these trans men" in text: 
-        return "male_plural_trans"    
-    elif "these cis men" in text:
-        return "male_plural_cis"
-    elif "this man and this woman" in text:
-        return "mixed_unspecified"
-    elif "this woman and this man" in text:
-        return "mixed_unspecified"
-    elif "this cis woman and this trans man" in text:
-        return "mixed_trans_cis"
-    elif "this trans woman and this cis man" in text: 
-        return "mixed_trans_cis" 
-    elif "this cis woman and this cis man" in text: 
-        return "mixed_cis"
-    elif "this trans woman and this trans man" in text:
-        return "mixed_trans"
+    return SubjectClassifier.classify("only_they", text)
 
 def identify_subject_only_we_or_singular(text):
-    if "non-binary person" in text or "genderqueer person" in text or "genderfluid person" in text:
-        return "non-binary"
-    elif "this woman" in text:
-        return "female_singular"
-    elif "this man" in text:
-        return "male_singular"
-    elif "i’m a woman. my friends are women." in text:
-        return "female_plural"
-    elif "i’m a woman. my friends are men." in text:
-        return "mixed"
-    elif "i’m a woman. my friends are a woman and a man." in text:
-        return "mixed"
-    elif "i’m a man. my friends are men." in text:
-        return "male_plural"
-    elif "i’m a man. my friends are women." in text:
-        return "mixed"
-    elif "i’m a man. my friends are a woman and a man." in text:
-        return "mixed"
-    
-def identify_subject_we_and_they(text):
-    if "i’m a woman. my friends are women." in text:
-        return ["female_we", "female_they"]
-    elif "i’m a woman. my friends are men." in text:
-        return ["mixed_we", "male_they"]
-    elif "i’m a woman. my friends are a woman and a man." in text:
-        return ["mixed_we", "mixed_they"]
-    elif "i’m a man. my friends are men." in text:
-        return ["male_we", "male_they"]
-    elif "i’m a man. my friends are women." in text:
-        return ["mixed_we", "female_they"]
-    elif "i’m a man. my friends are a woman and a man." in text:
-        return ["mixed_we", "mixed_they"]
-
-def analyze_translations(icelandic_lines_only_they, english_lines_only_they, icelandic_lines_singular_we, english_lines_singular_we, icelandic_lines_we_they, english_lines_we_they):
-
-    results = {
-        "overall_pronoun_accuracy": 0,
-        "singular_they_accuracy": 0,
-        "feminine_pronoun_accuracy": 0,
-        "masculine_pronoun_accuracy": 0,
-        "neuter_pronoun_accuracy": 0,
-        "feminine_unspecified_accuracy": 0,
-        "masculine_unspecified_accuracy": 0,
-        "neuter_unspecified_accuracy": 0,
-        "feminine_trans_accuracy": 0,
-        "masculine_trans_accuracy": 0,
-        "neuter_trans_accuracy": 0,
-        "feminine_cis_accuracy": 0,
-        "masculine_cis_accuracy": 0,
-        "neuter_cis_accuracy": 0,
-        "neuter_cis_and_trans_accuracy": 0,
-
-        "feminine_unspecified_children_accuracy": 0,
-        "masculine_unspecified_children_accuracy": 0,
-        "neuter_unspecified_children_accuracy": 0,
-        "feminine_trans_children_accuracy": 0,
-        "masculine_trans_children_accuracy": 0,
-        "neuter_trans_children_accuracy": 0,
-        "feminine_cis_children_accuracy": 0,
-        "masculine_cis_children_accuracy": 0,
-        "neuter_cis_children_accuracy": 0,
-        "neuter_cis_and_trans_children_accuracy": 0,
-        "singular_they_children_accuracy": 0,
-
-        "feminine_unspecified_nochildren_accuracy": 0,
-        "masculine_unspecified_nochildren_accuracy": 0,
-        "neuter_unspecified_nochildren_accuracy": 0,
-        "feminine_trans_nochildren_accuracy": 0,
-        "masculine_trans_nochildren_accuracy": 0,
-        "neuter_trans_nochildren_accuracy": 0,
-        "feminine_cis_nochildren_accuracy": 0,
-        "masculine_cis_nochildren_accuracy": 0,
-        "neuter_cis_nochildren_accuracy": 0,
-        "neuter_cis_and_trans_nochildren_accuracy": 0,
-        "singular_they_nochildren_accuracy": 0,
-
-        "short_accuracy": 0,
-        "long_accuracy": 0
-
-    }
-
-    pronoun_counts = {"singular_they": 0, "feminine": 0, "masculine": 0, "neuter": 0, "feminine_unspecified": 0, "feminine_trans": 0, "feminine_cis": 0, "masculine_unspecified": 0, "masculine_trans": 0, "masculine_cis": 0, "neuter_unspecified": 0, "neuter_trans": 0, "neuter_cis": 0, "neuter_cis_and_trans": 0, "feminine_unspecified_children": 0, "feminine_trans_children": 0, "feminine_cis_children": 0, "masculine_unspecified_children": 0, "masculine_trans_children": 0, "masculine_cis_children": 0, "neuter_unspecified_children": 0, "neuter_trans_children": 0, "neuter_cis_children": 0, "neuter_cis_and_trans_children": 0, "feminine_unspecified_nochildren": 0, "feminine_trans_nochildren": 0, "feminine_cis_nochildren": 0, "masculine_unspecified_nochildren": 0, "masculine_trans_nochildren": 0, "masculine_cis_nochildren": 0, "neuter_unspecified_nochildren": 0, "neuter_trans_nochildren": 0, "neuter_cis_nochildren": 0, "neuter_cis_and_trans_nochildren": 0, "singular_they_children": 0, "singular_they_nochildren": 0, "short" : 0, "long": 0}
-    pronoun_correct = {"singular_they": 0, "feminine": 0, "masculine": 0, "neuter": 0, "feminine_unspecified": 0, "feminine_trans": 0, "feminine_cis": 0, "masculine_unspecified": 0, "masculine_trans": 0, "masculine_cis": 0, "neuter_unspecified": 0, "neuter_trans": 0, "neuter_cis": 0, "neuter_cis_and_trans": 0, "feminine_unspecified_children": 0, "feminine_trans_children": 0, "feminine_cis_children": 0, "masculine_unspecified_children": 0, "masculine_trans_children": 0, "masculine_cis_children": 0, "neuter_unspecified_children": 0, "neuter_trans_children": 0, "neuter_cis_children": 0, "neuter_cis_and_trans_children": 0, "feminine_unspecified_nochildren": 0, "feminine_trans_nochildren": 0, "feminine_cis_nochildren": 0, "masculine_unspecified_nochildren": 0, "masculine_trans_nochildren": 0, "masculine_cis_nochildren": 0, "neuter_unspecified_nochildren": 0, "neuter_trans_nochildren": 0, "neuter_cis_nochildren": 0, "neuter_cis_and_trans_nochildren": 0, "singular_they_children": 0, "singular_they_nochildren": 0, "short" : 0, "long": 0}
-
-    for eng_line, ice_line in zip(english_lines_only_they, icelandic_lines_only_they):
-        ice_tokens = word_tokenize(ice_line.lower())
-        pronoun = identify_subject_only_they(eng_line.lower())
-        no_sents = sent_tokenize(eng_line)
-        
-        if len(no_sents) < 3:
-            if pronoun == "female_plural_unspecified" or pronoun == "female_plural_cis" or pronoun == "female_plural_trans":
-                pronoun_counts["short"] += 1
-                pronoun_correct["short"] += ice_tokens.count("þær")
-            elif pronoun == "male_plural_unspecified" or pronoun == "male_plural_cis" or pronoun == "male_plural_trans":
-                pronoun_counts["short"] += 1
-                pronoun_correct["short"] += ice_tokens.count("þeir")
-            elif pronoun == "mixed_unspecified" or pronoun == "mixed_cis" or pronoun == "mixed_trans":
-                pronoun_counts["short"] += 1
-                pronoun_correct["short"] += ice_tokens.count("þau")
+    return SubjectClassifier.classify("singular_we", text)
 
-        else:
-            ice_sents = ice_line.strip().split(". ")
-            if len(ice_sents) != len(no_sents):
-                ice_tokens = word_tokenize(ice_line.lower())
+def identify_subject_we_and_they(text):
+    return SubjectClassifier.classify("we_they", text)
+
+# Increased whenever a change to the grading changes the grades, so that grades cached
+# by LineCache.py are not reused.
+GRADER_VERSION = 2
+
+
+SECTIONS = ["only_they", "singular_we", "we_they"]
+
+# The rules below are written with the Icelandic pronouns. A language pack gives the
+# pronouns of its language for each of them, see LanguagePacks.py.
+PRONOUN_SLOTS = {"feminine_plural": "þær", "masculine_plural": "þeir", "neuter_plural": "þau",
+                 "neuter_singular": "hán", "feminine_singular": "hún", "masculine_singular": "hann"}
+PRONOUNS = list(PRONOUN_SLOTS.values())
+PRONOUN_SET = frozenset(PRONOUNS)
+# The translation of "they" given full points for each subject.
+PLURAL_PRONOUNS = {"female": "þær", "male": "þeir", "mixed": "þau"}
+SINGULAR_PRONOUNS = {"non-binary": "hán", "female_singular": "hún", "male_singular": "hann"}
+# The plural translation of "they" given half points for a single person.
+HALF_POINT_PRONOUNS = {"non-binary": "þau", "female_singular": "þær", "male_singular": "þeir"}
+
+def analyze_source_line(section, eng_line):
+    if section == "only_they":
+        return identify_subject_only_they(eng_line.lower()), len(sent_tokenize(eng_line)), "they have two children" in eng_line.lower()
+    elif section == "singular_we":
+        return identify_subject_only_we_or_singular(eng_line.lower()), "they have two children" in eng_line.lower()
+    elif section == "we_they":
+        return identify_subject_we_and_they(eng_line.lower())
+
+def analyze_source(english_lines_only_they, english_lines_singular_we, english_lines_we_they):
+    # Everything the grading needs from the English side, so that it can be computed
+    # once and shared when several translations of the test suite are graded.
+    source_analysis = {}
+    for section, english_lines in zip(SECTIONS, [english_lines_only_they, english_lines_singular_we, english_lines_we_they]):
+        source_analysis[section] = [analyze_source_line(section, eng_line) for eng_line in english_lines]
+        SubjectClassifier.report_unmatched("pronouns", section, [source if section == "we_they" else source[0] for source in source_analysis[section]])
+    return source_analysis
+
+def new_pronoun_counters():
+    # The (counts, correct) lists indexed by Category which the lines are graded into,
+    # see PronounCounters.py.
+    return PronounCounters.new_line_counters()
+
+def pronoun_tokens(ice_line, pronoun_forms=None):
+    # The lowercased tokens of a translation, with its pronouns in their Icelandic form.
+    # pronoun_forms maps each pronoun of the target language to its Icelandic form, it is
+    # None when the translations are in Icelandic, see LanguagePacks.py.
+    ice_tokens = word_tokenize(ice_line.lower())
+    if pronoun_forms is None:
+        return ice_tokens
+    return [pronoun_forms.get(token, token) for token in ice_tokens]
+
+def scored_tokens(ice_line, sentence_count, pronoun_forms=None):
+    # When the translation has as many sentences as the English example, its first
+    # sentence, which introduces the subjects, is left out.
+    ice_sents = ice_line.strip().split(". ")
+    if len(ice_sents) != sentence_count:
+        return pronoun_tokens(ice_line, pronoun_forms)
+    return pronoun_tokens(" ".join(ice_sents[1:]), pronoun_forms)
+
+def graded_tokens(section, line_source, ice_line, sentence_count, pronoun_forms=None):
+    # The tokens of the translation of a line in which the pronouns are counted.
+    if section == "only_they" and line_source[1] < 3:
+        return pronoun_tokens(ice_line, pronoun_forms)
+    return scored_tokens(ice_line, line_source[1] if section == "only_they" else sentence_count, pronoun_forms)
+
+def expected_pronoun(section, line_source):
+    # The translation of "they" given full points in an example, None if it is not graded.
+    if section == "singular_we":
+        return SINGULAR_PRONOUNS.get(line_source[0])
+    subject = line_source[0] if section == "only_they" else line_source and line_source[1]
+    return PLURAL_PRONOUNS.get(subject.split("_")[0]) if subject else None
+
+def reference_pronouns(ref_line, pronoun_forms=None):
+    # The pronouns of a reference translation of a line (see References.py), in the whole
+    # line and without its first sentence, and its number of sentences, so that those of
+    # the sentences in which a translation is graded can be chosen, see graded_references.
+    ref_sents = ref_line.strip().split(". ")
+    whole_line = frozenset(token for token in pronoun_tokens(ref_line, pronoun_forms) if token in PRONOUN_SET)
+    without_first = frozenset(token for token in pronoun_tokens(" ".join(ref_sents[1:]), pronoun_forms) if token in PRONOUN_SET)
+    return len(ref_sents), whole_line, without_first
+
+def graded_references(section, line_source, line_references, sentence_count):
+    # The pronouns used by the reference translations of a line in the sentences in which
+    # the pronouns of a translation are counted, as chosen by graded_tokens.
+    if section == "only_they":
+        sentence_count = line_source[1] if line_source[1] >= 3 else None
+    return frozenset().union(*(without_first if ref_sentence_count == sentence_count else whole_line
+                               for ref_sentence_count, whole_line, without_first in line_references))
+
+def accept_references(ice_tokens, accepted, expected):
+    # The pronouns used in a reference translation of the example (see References.py) are
+    # counted as the one expected.
+    if expected is None:
+        return ice_tokens
+    return [expected if token in accepted else token for token in ice_tokens]
+
+def grade_only_they_line(ice_line, line_source, pronoun_counts, pronoun_correct, accepted=None, pronoun_forms=None):
+    pronoun, sentence_count, has_children = line_source
+    if sentence_count < 3:
+        ice_tokens = pronoun_tokens(ice_line, pronoun_forms)
+        if accepted:
+            ice_tokens = accept_references(ice_tokens, accepted, expected_pronoun("only_they", line_source))
+        if pronoun == "female_plural_unspecified" or pronoun == "female_plural_cis" or pronoun == "female_plural_trans":
+            pronoun_counts[CATEGORY.short] += 1
+            pronoun_correct[CATEGORY.short] += ice_tokens.count("þær")
+        elif pronoun == "male_plural_unspecified" or pronoun == "male_plural_cis" or pronoun == "male_plural_trans":
+            pronoun_counts[CATEGORY.short] += 1
+            pronoun_correct[CATEGORY.short] += ice_tokens.count("þeir")
+        elif pronoun == "mixed_unspecified" or pronoun == "mixed_cis" or pronoun == "mixed_trans":
+            pronoun_counts[CATEGORY.short] += 1
+            pronoun_correct[CATEGORY.short] += ice_tokens.count("þau")
+
+    else:
+        ice_tokens = scored_tokens(ice_line, sentence_count, pronoun_forms)
+        if accepted:
+            ice_tokens = accept_references(ice_tokens, accepted, expected_pronoun("only_they", line_source))
+
+        if pronoun == "female_plural_unspecified":
+            if has_children:
+                pronoun_counts[CATEGORY.feminine_unspecified_children] += 2
+                pronoun_correct[CATEGORY.feminine_unspecified_children] += ice_tokens.count("þær")
             else:
-                ice_sents = ice_sents[1:]
-                ice_tokens = word_tokenize(" ".join(ice_sents).lower())
-
-            if pronoun == "female_plural_unspecified":
-                if "they have two children" in eng_line.lower():
-                    pronoun_counts["feminine_unspecified_children"] += 2
-                    pronoun_correct["feminine_unspecified_children"] += ice_tokens.count("þær")
-                else:
-                    pronoun_counts["feminine_unspecified_nochildren"] += 2
-                    pronoun_correct["feminine_unspecified_nochildren"] += ice_tokens.count("þær")
-
-                pronoun_counts["feminine"] += 2
-                pronoun_counts["feminine_unspecified"] += 2
-                pronoun_counts["long"] += 2              
-                pronoun_correct["feminine"] += ice_tokens.count("þær")
-                pronoun_correct["feminine_unspecified"] += ice_tokens.count("þær")
-                pronoun_correct["long"] += ice_tokens.count("þær")
-
-            elif pronoun == "female_plural_trans": 
-                if "they have two children" in eng_line.lower():
-                    pronoun_counts["feminine_trans_children"] += 2
-                    pronoun_correct["feminine_trans_children"] += ice_tokens.count("þær")
-                else:
-                    pronoun_counts["feminine_trans_nochildren"] += 2
-                    pronoun_correct["feminine_trans_nochildren"] += ice_tokens.count("þær")
-
-                pronoun_counts["feminine"] += 2
-                pronoun_counts["feminine_trans"] += 2
-                pronoun_counts["long"] += 2                
-                pronoun_correct["feminine"] += ice_tokens.count("þær")
-                pronoun_correct["feminine_trans"] += ice_tokens.count("þær")
-                pronoun_correct["long"] += ice_tokens.count("þær")
-
-            elif pronoun == "female_plural_cis":
-                if "they have two children" in eng_line.lower():
-                    pronoun_counts["feminine_cis_children"] += 2
-                    pronoun_correct["feminine_cis_children"] += ice_tokens.count("þær")
-                else:
-                    pronoun_counts["feminine_cis_nochildren"] += 2
-                    pronoun_correct["feminine_cis_nochildren"] += ice_tokens.count("þær")
-
-                pronoun_counts["feminine"] += 2
-                pronoun_counts["feminine_cis"] += 2
-                pronoun_counts["long"] += 2
-                pronoun_correct["feminine"] += ice_tokens.count("þær")
-                pronoun_correct["feminine_cis"] += ice_tokens.count("þær")
-                pronoun_correct["long"] += ice_tokens.count("þær")
-
-            elif pronoun == "male_plural_unspecified":
-                if "they have two children" in eng_line.lower():
-                    pronoun_counts["masculine_unspecified_children"] += 2
-                    pronoun_correct["masculine_unspecified_children"] += ice_tokens.count("þeir")
-                else:
-                    pronoun_counts["masculine_unspecified_nochildren"] += 2
-                    pronoun_correct["masculine_unspecified_nochildren"] += ice_tokens.count("þeir")
-
-                pronoun_counts["masculine"] += 2
-                pronoun_counts["masculine_unspecified"] += 2        
-                pronoun_counts["long"] += 2                
-                pronoun_correct["masculine"] += ice_tokens.count("þeir")
-                pronoun_correct["masculine_unspecified"] += ice_tokens.count("þeir")
-                pronoun_correct["long"] += ice_tokens.count("þeir")
-
-            elif pronoun == "male_plural_trans": 
-                if "they have two children" in eng_line.lower():
-                    pronoun_counts["masculine_trans_children"] += 2
-                    pronoun_correct["masculine_trans_children"] += ice_tokens.count("þeir")
-                else:
-                    pronoun_counts["masculine_trans_nochildren"] += 2
-                    pronoun_correct["masculine_trans_nochildren"] += ice_tokens.count("þeir")
-
-                pronoun_counts["masculine"] += 2
-                pronoun_counts["masculine_trans"] += 2
-                pronoun_counts["long"] += 2
-                pronoun_correct["masculine"] += ice_tokens.count("þeir")
-                pronoun_correct["masculine_trans"] += ice_tokens.count("þeir")
-                pronoun_correct["long"] += ice_tokens.count("þeir")
-
-            elif pronoun == "male_plural_cis":
-                if "they have two children" in eng_line.lower():
-                    pronoun_counts["masculine_cis_children"] += 2
-                    pronoun_correct["masculine_cis_children"] += ice_tokens.count("þeir")
-                else:
-                    pronoun_counts["masculine_cis_nochildren"] += 2
-                    pronoun_correct["masculine_cis_nochildren"] += ice_tokens.count("þeir")
-
-                pronoun_counts["masculine"] += 2
-                pronoun_counts["masculine_cis"] += 2
-                pronoun_counts["long"] += 2
-                pronoun_correct["masculine"] += ice_tokens.count("þeir")
-                pronoun_correct["masculine_cis"] += ice_tokens.count("þeir")
-                pronoun_correct["long"] += ice_tokens.count("þeir")
-
-            elif pronoun == "mixed_unspecified": 
-                if "they have two children" in eng_line.lower():
-                    pronoun_counts["neuter_unspecified_children"] += 2
-                    pronoun_correct["neuter_unspecified_children"] += ice_tokens.count("þau")
-                else:
-                    pronoun_counts["neuter_unspecified_nochildren"] += 2
-                    pronoun_correct["neuter_unspecified_nochildren"] += ice_tokens.count("þau")
-
-                pronoun_counts["neuter"] += 2
-                pronoun_counts["neuter_unspecified"] += 2
-                pronoun_counts["long"] += 2
-                pronoun_correct["neuter"] += ice_tokens.count("þau")
-                pronoun_correct["neuter_unspecified"] += ice_tokens.count("þau")
-                pronoun_correct["long"] += ice_tokens.count("þau")
-
-            elif pronoun == "mixed_trans": 
-                if "they have two children" in eng_line.lower():
-                    pronoun_counts["neuter_trans_children"] += 2
-                    pronoun_correct["neuter_trans_children"] += ice_tokens.count("þau")
-                else:
-                    pronoun_counts["neuter_trans_nochildren"] += 2
-                    pronoun_correct["neuter_trans_nochildren"] += ice_tokens.count("þau")
-
-                pronoun_counts["neuter"] += 2
-                pronoun_counts["neuter_trans"] += 2
-                pronoun_counts["long"] += 2
-                pronoun_correct["neuter"] += ice_tokens.count("þau")
-                pronoun_correct["neuter_trans"] += ice_tokens.count("þau")
-                pronoun_correct["long"] += ice_tokens.count("þau")
-
-            elif pronoun == "mixed_cis": 
-                if "they have two children" in eng_line.lower():
-                    pronoun_counts["neuter_cis_children"] += 2
-                    pronoun_correct["neuter_cis_children"] += ice_tokens.count("þau")
-                else:
-                    pronoun_counts["neuter_cis_nochildren"] += 2
-                    pronoun_correct["neuter_cis_nochildren"] += ice_tokens.count("þau")
-
-                pronoun_counts["neuter"] += 2
-                pronoun_counts["neuter_cis"] += 2
-                pronoun_counts["long"] += 2
-                pronoun_correct["neuter"] += ice_tokens.count("þau")
-                pronoun_correct["neuter_cis"] += ice_tokens.count("þau")
-                pronoun_correct["long"] += ice_tokens.count("þau")
-
-            elif pronoun == "mixed_trans_cis":
-                if "they have two children" in eng_line.lower():
-                    pronoun_counts["neuter_cis_and_trans_children"] += 2
-                    pronoun_correct["neuter_cis_and_trans_children"] += ice_tokens.count("þau")
-                else:
-                    pronoun_counts["neuter_cis_and_trans_nochildren"] += 2
-                    pronoun_correct["neuter_cis_and_trans_nochildren"] += ice_tokens.count("þau")
-
-                pronoun_counts["neuter"] += 2
-                pronoun_counts["neuter_cis_and_trans"] += 2            
-                pronoun_counts["long"] += 2
-                pronoun_correct["neuter"] += ice_tokens.count("þau")
-                pronoun_correct["neuter_cis_and_trans"] += ice_tokens.count("þau")
-                pronoun_correct["long"] += ice_tokens.count("þau")
-
-    for eng_line, ice_line in zip(english_lines_singular_we, icelandic_lines_singular_we):
-        pronoun = identify_subject_only_we_or_singular(eng_line.lower())
-        ice_sents = ice_line.strip().split(". ")
-        if len(ice_sents) != len(no_sents):
-            ice_tokens = word_tokenize(ice_line.lower())
-        else:
-            ice_sents = ice_sents[1:]
-            ice_tokens = word_tokenize(" ".join(ice_sents).lower())
-
-        if pronoun == "non-binary" or pronoun == "female_singular" or pronoun == "male_singular":
-            pronoun_counts["singular_they"] += 2
-
-        if pronoun == "non-binary":
-            if "they have two children" in eng_line.lower():
-                pronoun_counts["singular_they_children"] += 2
-                pronoun_correct["singular_they_children"] += ice_tokens.count("hán")
-                pronoun_correct["singular_they_children"] += (ice_tokens.count("þau") / 2)
+                pronoun_counts[CATEGORY.feminine_unspecified_nochildren] += 2
+                pronoun_correct[CATEGORY.feminine_unspecified_nochildren] += ice_tokens.count("þær")
+
+            pronoun_counts[CATEGORY.feminine] += 2
+            pronoun_counts[CATEGORY.feminine_unspecified] += 2
+            pronoun_counts[CATEGORY.long] += 2              
+            pronoun_correct[CATEGORY.feminine] += ice_tokens.count("þær")
+            pronoun_correct[CATEGORY.feminine_unspecified] += ice_tokens.count("þær")
+            pronoun_correct[CATEGORY.long] += ice_tokens.count("þær")
+
+        elif pronoun == "female_plural_trans": 
+            if has_children:
+                pronoun_counts[CATEGORY.feminine_trans_children] += 2
+                pronoun_correct[CATEGORY.feminine_trans_children] += ice_tokens.count("þær")
             else:
-                pronoun_counts["singular_they_nochildren"] += 2
-                pronoun_correct["singular_they_nochildren"] += ice_tokens.count("hán")
-                pronoun_correct["singular_they_nochildren"] += (ice_tokens.count("þau") / 2)
-
-            pronoun_correct["singular_they"] += ice_tokens.count("hán")
-            pronoun_correct["singular_they"] += (ice_tokens.count("þau") / 2)
-            pronoun_counts["long"] += 2
-            pronoun_correct["long"] += ice_tokens.count("hán")
-            pronoun_correct["long"] += (ice_tokens.count("þau") / 2)
-        elif pronoun == "female_singular":
-            if "they have two children" in eng_line.lower():
-                pronoun_counts["singular_they_children"] += 2
-                pronoun_correct["singular_they_children"] += ice_tokens.count("hún")
-                pronoun_correct["singular_they_children"] += (ice_tokens.count("þær") / 2)
+                pronoun_counts[CATEGORY.feminine_trans_nochildren] += 2
+                pronoun_correct[CATEGORY.feminine_trans_nochildren] += ice_tokens.count("þær")
+
+            pronoun_counts[CATEGORY.feminine] += 2
+            pronoun_counts[CATEGORY.feminine_trans] += 2
+            pronoun_counts[CATEGORY.long] += 2                
+            pronoun_correct[CATEGORY.feminine] += ice_tokens.count("þær")
+            pronoun_correct[CATEGORY.feminine_trans] += ice_tokens.count("þær")
+            pronoun_correct[CATEGORY.long] += ice_tokens.count("þær")
+
+        elif pronoun == "female_plural_cis":
+            if has_children:
+                pronoun_counts[CATEGORY.feminine_cis_children] += 2
+                pronoun_correct[CATEGORY.feminine_cis_children] += ice_tokens.count("þær")
             else:
-                pronoun_counts["singular_they_nochildren"] += 2
-                pronoun_correct["singular_they_nochildren"] += ice_tokens.count("hún")
-                pronoun_correct["singular_they_nochildren"] += (ice_tokens.count("þær") / 2)
-
-            pronoun_correct["singular_they"] += ice_tokens.count("hún")
-            pronoun_correct["singular_they"] += (ice_tokens.count("þær") / 2)
-            pronoun_counts["long"] += 2
-            pronoun_correct["long"] += ice_tokens.count("hún")
-            pronoun_correct["long"] += (ice_tokens.count("þær") / 2)
-
-        elif pronoun == "male_singular":
-            if "they have two children" in eng_line.lower():
-                pronoun_counts["singular_they_children"] += 2
-                pronoun_correct["singular_they_children"] += ice_tokens.count("hann")
-                pronoun_correct["singular_they_children"] += (ice_tokens.count("þeir") / 2)
+                pronoun_counts[CATEGORY.feminine_cis_nochildren] += 2
+                pronoun_correct[CATEGORY.feminine_cis_nochildren] += ice_tokens.count("þær")
+
+            pronoun_counts[CATEGORY.feminine] += 2
+            pronoun_counts[CATEGORY.feminine_cis] += 2
+            pronoun_counts[CATEGORY.long] += 2
+            pronoun_correct[CATEGORY.feminine] += ice_tokens.count("þær")
+            pronoun_correct[CATEGORY.feminine_cis] += ice_tokens.count("þær")
+            pronoun_correct[CATEGORY.long] += ice_tokens.count("þær")
+
+        elif pronoun == "male_plural_unspecified":
+            if has_children:
+                pronoun_counts[CATEGORY.masculine_unspecified_children] += 2
+                pronoun_correct[CATEGORY.masculine_unspecified_children] += ice_tokens.count("þeir")
             else:
-                pronoun_counts["singular_they_nochildren"] += 2
-                pronoun_correct["singular_they_nochildren"] += ice_tokens.count("hann")
-                pronoun_correct["singular_they_nochildren"] += (ice_tokens.count("þeir") / 2)
-
-            pronoun_correct["singular_they"] += ice_tokens.count("hann")
-            pronoun_correct["singular_they"] += (ice_tokens.count("þeir") / 2)
-            pronoun_counts["long"] += 2
-            pronoun_correct["long"] += ice_tokens.count("hann")
-            pronoun_correct["long"] += (ice_tokens.count("þeir") / 2)
-
-    for eng_line, ice_line in zip(english_lines_we_they, icelandic_lines_we_they):
-
-        pronouns = identify_subject_we_and_they(eng_line.lower())
-        they_pronoun = pronouns[1]
-
-        ice_sents = ice_line.strip().split(". ")
-        if len(ice_sents) != len(no_sents):
-            ice_tokens = word_tokenize(ice_line.lower())
+                pronoun_counts[CATEGORY.masculine_unspecified_nochildren] += 2
+                pronoun_correct[CATEGORY.masculine_unspecified_nochildren] += ice_tokens.count("þeir")
+
+            pronoun_counts[CATEGORY.masculine] += 2
+            pronoun_counts[CATEGORY.masculine_unspecified] += 2        
+            pronoun_counts[CATEGORY.long] += 2                
+            pronoun_correct[CATEGORY.masculine] += ice_tokens.count("þeir")
+            pronoun_correct[CATEGORY.masculine_unspecified] += ice_tokens.count("þeir")
+            pronoun_correct[CATEGORY.long] += ice_tokens.count("þeir")
+
+        elif pronoun == "male_plural_trans": 
+            if has_children:
+                pronoun_counts[CATEGORY.masculine_trans_children] += 2
+                pronoun_correct[CATEGORY.masculine_trans_children] += ice_tokens.count("þeir")
+            else:
+                pronoun_counts[CATEGORY.masculine_trans_nochildren] += 2
+                pronoun_correct[CATEGORY.masculine_trans_nochildren] += ice_tokens.count("þeir")
+
+            pronoun_counts[CATEGORY.masculine] += 2
+            pronoun_counts[CATEGORY.masculine_trans] += 2
+            pronoun_counts[CATEGORY.long] += 2
+            pronoun_correct[CATEGORY.masculine] += ice_tokens.count("þeir")
+            pronoun_correct[CATEGORY.masculine_trans] += ice_tokens.count("þeir")
+            pronoun_correct[CATEGORY.long] += ice_tokens.count("þeir")
+
+        elif pronoun == "male_plural_cis":
+            if has_children:
+                pronoun_counts[CATEGORY.masculine_cis_children] += 2
+                pronoun_correct[CATEGORY.masculine_cis_children] += ice_tokens.count("þeir")
+            else:
+                pronoun_counts[CATEGORY.masculine_cis_nochildren] += 2
+                pronoun_correct[CATEGORY.masculine_cis_nochildren] += ice_tokens.count("þeir")
+
+            pronoun_counts[CATEGORY.masculine] += 2
+            pronoun_counts[CATEGORY.masculine_cis] += 2
+            pronoun_counts[CATEGORY.long] += 2
+            pronoun_correct[CATEGORY.masculine] += ice_tokens.count("þeir")
+            pronoun_correct[CATEGORY.masculine_cis] += ice_tokens.count("þeir")
+            pronoun_correct[CATEGORY.long] += ice_tokens.count("þeir")
+
+        elif pronoun == "mixed_unspecified": 
+            if has_children:
+                pronoun_counts[CATEGORY.neuter_unspecified_children] += 2
+                pronoun_correct[CATEGORY.neuter_unspecified_children] += ice_tokens.count("þau")
+            else:
+                pronoun_counts[CATEGORY.neuter_unspecified_nochildren] += 2
+                pronoun_correct[CATEGORY.neuter_unspecified_nochildren] += ice_tokens.count("þau")
+
+            pronoun_counts[CATEGORY.neuter] += 2
+            pronoun_counts[CATEGORY.neuter_unspecified] += 2
+            pronoun_counts[CATEGORY.long] += 2
+            pronoun_correct[CATEGORY.neuter] += ice_tokens.count("þau")
+            pronoun_correct[CATEGORY.neuter_unspecified] += ice_tokens.count("þau")
+            pronoun_correct[CATEGORY.long] += ice_tokens.count("þau")
+
+        elif pronoun == "mixed_trans": 
+            if has_children:
+                pronoun_counts[CATEGORY.neuter_trans_children] += 2
+                pronoun_correct[CATEGORY.neuter_trans_children] += ice_tokens.count("þau")
+            else:
+                pronoun_counts[CATEGORY.neuter_trans_nochildren] += 2
+                pronoun_correct[CATEGORY.neuter_trans_nochildren] += ice_tokens.count("þau")
+
+            pronoun_counts[CATEGORY.neuter] += 2
+            pronoun_counts[CATEGORY.neuter_trans] += 2
+            pronoun_counts[CATEGORY.long] += 2
+            pronoun_correct[CATEGORY.neuter] += ice_tokens.count("þau")
+            pronoun_correct[CATEGORY.neuter_trans] += ice_tokens.count("þau")
+            pronoun_correct[CATEGORY.long] += ice_tokens.count("þau")
+
+        elif pronoun == "mixed_cis": 
+            if has_children:
+                pronoun_counts[CATEGORY.neuter_cis_children] += 2
+                pronoun_correct[CATEGORY.neuter_cis_children] += ice_tokens.count("þau")
+            else:
+                pronoun_counts[CATEGORY.neuter_cis_nochildren] += 2
+                pronoun_correct[CATEGORY.neuter_cis_nochildren] += ice_tokens.count("þau")
+
+            pronoun_counts[CATEGORY.neuter] += 2
+            pronoun_counts[CATEGORY.neuter_cis] += 2
+            pronoun_counts[CATEGORY.long] += 2
+            pronoun_correct[CATEGORY.neuter] += ice_tokens.count("þau")
+            pronoun_correct[CATEGORY.neuter_cis] += ice_tokens.count("þau")
+            pronoun_correct[CATEGORY.long] += ice_tokens.count("þau")
+
+        elif pronoun == "mixed_trans_cis":
+            if has_children:
+                pronoun_counts[CATEGORY.neuter_cis_and_trans_children] += 2
+                pronoun_correct[CATEGORY.neuter_cis_and_trans_children] += ice_tokens.count("þau")
+            else:
+                pronoun_counts[CATEGORY.neuter_cis_and_trans_nochildren] += 2
+                pronoun_correct[CATEGORY.neuter_cis_and_trans_nochildren] += ice_tokens.count("þau")
+
+            pronoun_counts[CATEGORY.neuter] += 2
+            pronoun_counts[CATEGORY.neuter_cis_and_trans] += 2            
+            pronoun_counts[CATEGORY.long] += 2
+            pronoun_correct[CATEGORY.neuter] += ice_tokens.count("þau")
+            pronoun_correct[CATEGORY.neuter_cis_and_trans] += ice_tokens.count("þau")
+            pronoun_correct[CATEGORY.long] += ice_tokens.count("þau")
+
+def grade_only_they(icelandic_lines_only_they, source_only_they, accepted=None, pronoun_forms=None):
+    # accepted holds the pronouns of the reference translations of each line, if any, see
+    # reference_pronouns.
+    pronoun_counts, pronoun_correct = new_pronoun_counters()
+    for line_source, ice_line, line_references in zip(source_only_they, icelandic_lines_only_they, accepted or repeat(None)):
+        line_accepted = graded_references("only_they", line_source, line_references, None) if line_references else None
+        grade_only_they_line(ice_line, line_source, pronoun_counts, pronoun_correct, line_accepted, pronoun_forms)
+    return PronounCounters.to_arrays(pronoun_counts, pronoun_correct)
+
+def grade_singular_we_line(ice_line, line_source, sentence_count, pronoun_counts, pronoun_correct, accepted=None, pronoun_forms=None):
+    pronoun, has_children = line_source
+    ice_tokens = scored_tokens(ice_line, sentence_count, pronoun_forms)
+    if accepted:
+        ice_tokens = accept_references(ice_tokens, accepted, expected_pronoun("singular_we", line_source))
+
+    if pronoun == "non-binary" or pronoun == "female_singular" or pronoun == "male_singular":
+        pronoun_counts[CATEGORY.singular_they] += 2
+
+    if pronoun == "non-binary":
+        if has_children:
+            pronoun_counts[CATEGORY.singular_they_children] += 2
+            pronoun_correct[CATEGORY.singular_they_children] += ice_tokens.count("hán")
+            pronoun_correct[CATEGORY.singular_they_children] += (ice_tokens.count("þau") / 2)
         else:
-            ice_sents = ice_sents[1:]
-            ice_tokens = word_tokenize(" ".join(ice_sents).lower())
-
-        if they_pronoun == "female_they":
-            pronoun_counts["feminine"] += 1
-            pronoun_counts["feminine_unspecified"] += 1
-            pronoun_correct["feminine"] += ice_tokens.count("þær")
-            pronoun_correct["feminine_unspecified"] += ice_tokens.count("þær")
-            pronoun_counts["long"] += 1
-            pronoun_correct["long"] += ice_tokens.count("þær")
-        elif they_pronoun == "male_they":
-            pronoun_counts["masculine"] += 1
-            pronoun_counts["masculine_unspecified"] += 1
-            pronoun_correct["masculine"] += ice_tokens.count("þeir")
-            pronoun_correct["masculine_unspecified"] += ice_tokens.count("þeir")
-            pronoun_counts["long"] += 1
-            pronoun_correct["long"] += ice_tokens.count("þeir")
-        elif they_pronoun == "mixed_they":
-            pronoun_counts["neuter"] += 1
-            pronoun_counts["neuter_unspecified"] += 1
-            pronoun_correct["neuter"] += ice_tokens.count("þau")
-            pronoun_correct["neuter_unspecified"] += ice_tokens.count("þau")
-            pronoun_counts["long"] += 1
-            pronoun_correct["long"] += ice_tokens.count("þau")
-
-    results["singular_they_accuracy"] = pronoun_correct["singular_they"] / pronoun_counts["singular_they"] * 100 if pronoun_counts["singular_they"] > 0 else 0
-
-    results["feminine_pronoun_accuracy"] = pronoun_correct["feminine"] / pronoun_counts["feminine"] * 100 if pronoun_counts["feminine"] > 0 else 0
-    results["masculine_pronoun_accuracy"] = pronoun_correct["masculine"] / pronoun_counts["masculine"] * 100 if pronoun_counts["masculine"] > 0 else 0
-    results["neuter_pronoun_accuracy"] = pronoun_correct["neuter"] / pronoun_counts["neuter"] * 100 if pronoun_counts["neuter"] > 0 else 0
-    results["overall_pronoun_accuracy"] = (pronoun_correct["feminine"] + pronoun_correct["masculine"] + pronoun_correct["neuter"] + pronoun_correct["singular_they"] + pronoun_correct["short"]) / (pronoun_counts["feminine"] + pronoun_counts["masculine"] + pronoun_counts["neuter"] + pronoun_counts["singular_they"] + pronoun_counts["short"]) * 100 if (pronoun_counts["feminine"] + pronoun_counts["masculine"] + pronoun_counts["neuter"] + pronoun_counts["singular_they"] + pronoun_counts["short"]) > 0 else 0
-    
-    results["feminine_unspecified_accuracy"] = pronoun_correct["feminine_unspecified"] / pronoun_counts["feminine_unspecified"] * 100 if pronoun_counts["feminine_unspecified"] > 0 else 0
-    results["masculine_unspecified_accuracy"] = pronoun_correct["masculine_unspecified"] / pronoun_counts["masculine_unspecified"] * 100 if pronoun_counts["masculine_unspecified"] > 0 else 0
-    results["neuter_unspecified_accuracy"] = pronoun_correct["neuter_unspecified"] / pronoun_counts["neuter_unspecified"] * 100 if pronoun_counts["neuter_unspecified"] > 0 else 0
-    results["feminine_trans_accuracy"] = pronoun_correct["feminine_trans"] / pronoun_counts["feminine_trans"] * 100 if pronoun_counts["feminine_trans"] > 0 else 0
-    results["masculine_trans_accuracy"] = pronoun_correct["masculine_trans"] / pronoun_counts["masculine_trans"] * 100 if pronoun_counts["masculine_trans"] > 0 else 0
-    results["neuter_trans_accuracy"] = pronoun_correct["neuter_trans"] / pronoun_counts["neuter_trans"] * 100 if pronoun_counts["neuter_trans"] > 0 else 0    
-    results["feminine_cis_accuracy"] = pronoun_correct["feminine_cis"] / pronoun_counts["feminine_cis"] * 100 if pronoun_counts["feminine_cis"] > 0 else 0
-    results["masculine_cis_accuracy"] = pronoun_correct["masculine_cis"] / pronoun_counts["masculine_cis"] * 100 if pronoun_counts["masculine_cis"] > 0 else 0
-    results["neuter_cis_accuracy"] = pronoun_correct["neuter_cis"] / pronoun_counts["neuter_cis"] * 100 if pronoun_counts["neuter_cis"] > 0 else 0
-    results["neuter_cis_and_trans_accuracy"] = pronoun_correct["neuter_cis_and_trans"] / pronoun_counts["neuter_cis_and_trans"] * 100 if pronoun_counts["neuter_cis_and_trans"] > 0 else 0
-
-    results["feminine_unspecified_children_accuracy"] = pronoun_correct["feminine_unspecified_children"] / pronoun_counts["feminine_unspecified_children"] * 100 if pronoun_counts["feminine_unspecified_children"] > 0 else 0
-    results["masculine_unspecified_children_accuracy"] = pronoun_correct["masculine_unspecified_children"] / pronoun_counts["masculine_unspecified_children"] * 100 if pronoun_counts["masculine_unspecified_children"] > 0 else 0
-    results["neuter_unspecified_children_accuracy"] = pronoun_correct["neuter_unspecified_children"] / pronoun_counts["neuter_unspecified_children"] * 100 if pronoun_counts["neuter_unspecified_children"] > 0 else 0
-    results["feminine_trans_children_accuracy"] = pronoun_correct["feminine_trans_children"] / pronoun_counts["feminine_trans_children"] * 100 if pronoun_counts["feminine_trans_children"] > 0 else 0
-    results["masculine_trans_children_accuracy"] = pronoun_correct["masculine_trans_children"] / pronoun_counts["masculine_trans_children"] * 100 if pronoun_counts["masculine_trans_children"] > 0 else 0
-    results["neuter_trans_children_accuracy"] = pronoun_correct["neuter_trans_children"] / pronoun_counts["neuter_trans_children"] * 100 if pronoun_counts["neuter_trans_children"] > 0 else 0    
-    results["feminine_cis_children_accuracy"] = pronoun_correct["feminine_cis_children"] / pronoun_counts["feminine_cis_children"] * 100 if pronoun_counts["feminine_cis_children"] > 0 else 0
-    results["masculine_cis_children_accuracy"] = pronoun_correct["masculine_cis_children"] / pronoun_counts["masculine_cis_children"] * 100 if pronoun_counts["masculine_cis_children"] > 0 else 0
-    results["neuter_cis_children_accuracy"] = pronoun_correct["neuter_cis_children"] / pronoun_counts["neuter_cis_children"] * 100 if pronoun_counts["neuter_cis_children"] > 0 else 0
-    results["neuter_cis_and_trans_children_accuracy"] = pronoun_correct["neuter_cis_and_trans_children"] / pronoun_counts["neuter_cis_and_trans_children"] * 100 if pronoun_counts["neuter_cis_and_trans_children"] > 0 else 0
-
-    results["feminine_unspecified_nochildren_accuracy"] = pronoun_correct["feminine_unspecified_nochildren"] / pronoun_counts["feminine_unspecified_nochildren"] * 100 if pronoun_counts["feminine_unspecified_nochildren"] > 0 else 0
-    results["masculine_unspecified_nochildren_accuracy"] = pronoun_correct["masculine_unspecified_nochildren"] / pronoun_counts["masculine_unspecified_nochildren"] * 100 if pronoun_counts["masculine_unspecified_nochildren"] > 0 else 0
-    results["neuter_unspecified_nochildren_accuracy"] = pronoun_correct["neuter_unspecified_nochildren"] / pronoun_counts["neuter_unspecified_nochildren"] * 100 if pronoun_counts["neuter_unspecified_nochildren"] > 0 else 0
-    results["feminine_trans_nochildren_accuracy"] = pronoun_correct["feminine_trans_nochildren"] / pronoun_counts["feminine_trans_nochildren"] * 100 if pronoun_counts["feminine_trans_nochildren"] > 0 else 0
-    results["masculine_trans_nochildren_accuracy"] = pronoun_correct["masculine_trans_nochildren"] / pronoun_counts["masculine_trans_nochildren"] * 100 if pronoun_counts["masculine_trans_nochildren"] > 0 else 0
-    results["neuter_trans_nochildren_accuracy"] = pronoun_correct["neuter_trans_nochildren"] / pronoun_counts["neuter_trans_nochildren"] * 100 if pronoun_counts["neuter_trans_nochildren"] > 0 else 0    
-    results["feminine_cis_nochildren_accuracy"] = pronoun_correct["feminine_cis_nochildren"] / pronoun_counts["feminine_cis_nochildren"] * 100 if pronoun_counts["feminine_cis_nochildren"] > 0 else 0
-    results["masculine_cis_nochildren_accuracy"] = pronoun_correct["masculine_cis_nochildren"] / pronoun_counts["masculine_cis_nochildren"] * 100 if pronoun_counts["masculine_cis_nochildren"] > 0 else 0
-    results["neuter_cis_nochildren_accuracy"] = pronoun_correct["neuter_cis_nochildren"] / pronoun_counts["neuter_cis_nochildren"] * 100 if pronoun_counts["neuter_cis_nochildren"] > 0 else 0
-    results["neuter_cis_and_trans_nochildren_accuracy"] = pronoun_correct["neuter_cis_and_trans_nochildren"] / pronoun_counts["neuter_cis_and_trans_nochildren"] * 100 if pronoun_counts["neuter_cis_and_trans_nochildren"] > 0 else 0
-    
-    results["singular_they_children_accuracy"] = pronoun_correct["singular_they_children"] / pronoun_counts["singular_they_children"] * 100 if pronoun_counts["neuter_cis_and_trans_nochildren"] > 0 else 0
-    results["singular_they_nochildren_accuracy"] = pronoun_correct["singular_they_nochildren"] / pronoun_counts["singular_they_nochildren"] * 100 if pronoun_counts["neuter_cis_and_trans_nochildren"] > 0 else 0
-
-    results["long_accuracy"] = pronoun_correct["long"] / pronoun_counts["long"] * 100 if pronoun_counts["long"] > 0 else 0
-    results["short_accuracy"] = pronoun_correct["short"] / pronoun_counts["short"] * 100 if pronoun_counts["short"] > 0 else 0
-
-    return results, pronoun_counts, pronoun_correct
-
+            pronoun_counts[CATEGORY.singular_they_nochildren] += 2
+            pronoun_correct[CATEGORY.singular_they_nochildren] += ice_tokens.count("hán")
+            pronoun_correct[CATEGORY.singular_they_nochildren] += (ice_tokens.count("þau") / 2)
+
+        pronoun_correct[CATEGORY.singular_they] += ice_tokens.count("hán")
+        pronoun_correct[CATEGORY.singular_they] += (ice_tokens.count("þau") / 2)
+        pronoun_counts[CATEGORY.long] += 2
+        pronoun_correct[CATEGORY.long] += ice_tokens.count("hán")
+        pronoun_correct[CATEGORY.long] += (ice_tokens.count("þau") / 2)
+    elif pronoun == "female_singular":
+        if has_children:
+            pronoun_counts[CATEGORY.singular_they_children] += 2
+            pronoun_correct[CATEGORY.singular_they_children] += ice_tokens.count("hún")
+            pronoun_correct[CATEGORY.singular_they_children] += (ice_tokens.count("þær") / 2)
+        else:
+            pronoun_counts[CATEGORY.singular_they_nochildren] += 2
+            pronoun_correct[CATEGORY.singular_they_nochildren] += ice_tokens.count("hún")
+            pronoun_correct[CATEGORY.singular_they_nochildren] += (ice_tokens.count("þær") / 2)
+
+        pronoun_correct[CATEGORY.singular_they] += ice_tokens.count("hún")
+        pronoun_correct[CATEGORY.singular_they] += (ice_tokens.count("þær") / 2)
+        pronoun_counts[CATEGORY.long] += 2
+        pronoun_correct[CATEGORY.long] += ice_tokens.count("hún")
+        pronoun_correct[CATEGORY.long] += (ice_tokens.count("þær") / 2)
+
+    elif pronoun == "male_singular":
+        if has_children:
+            pronoun_counts[CATEGORY.singular_they_children] += 2
+            pronoun_correct[CATEGORY.singular_they_children] += ice_tokens.count("hann")
+            pronoun_correct[CATEGORY.singular_they_children] += (ice_tokens.count("þeir") / 2)
+        else:
+            pronoun_counts[CATEGORY.singular_they_nochildren] += 2
+            pronoun_correct[CATEGORY.singular_they_nochildren] += ice_tokens.count("hann")
+            pronoun_correct[CATEGORY.singular_they_nochildren] += (ice_tokens.count("þeir") / 2)
+
+        pronoun_correct[CATEGORY.singular_they] += ice_tokens.count("hann")
+        pronoun_correct[CATEGORY.singular_they] += (ice_tokens.count("þeir") / 2)
+        pronoun_counts[CATEGORY.long] += 2
+        pronoun_correct[CATEGORY.long] += ice_tokens.count("hann")
+        pronoun_correct[CATEGORY.long] += (ice_tokens.count("þeir") / 2)
+
+def grade_singular_we(icelandic_lines_singular_we, source_singular_we, sentence_count, accepted=None, pronoun_forms=None):
+    # accepted holds the pronouns of the reference translations of each line, if any, see
+    # reference_pronouns.
+    pronoun_counts, pronoun_correct = new_pronoun_counters()
+    for line_source, ice_line, line_references in zip(source_singular_we, icelandic_lines_singular_we, accepted or repeat(None)):
+        line_accepted = graded_references("singular_we", line_source, line_references, sentence_count) if line_references else None
+        grade_singular_we_line(ice_line, line_source, sentence_count, pronoun_counts, pronoun_correct, line_accepted, pronoun_forms)
+    return PronounCounters.to_arrays(pronoun_counts, pronoun_correct)
+
+def grade_we_they_line(ice_line, line_source, sentence_count, pronoun_counts, pronoun_correct, accepted=None, pronoun_forms=None):
+    pronouns = line_source
+    they_pronoun = pronouns[1] if pronouns is not None else None
+
+    ice_tokens = scored_tokens(ice_line, sentence_count, pronoun_forms)
+    if accepted:
+        ice_tokens = accept_references(ice_tokens, accepted, expected_pronoun("we_they", line_source))
+
+    if they_pronoun == "female_they":
+        pronoun_counts[CATEGORY.feminine] += 1
+        pronoun_counts[CATEGORY.feminine_unspecified] += 1
+        pronoun_correct[CATEGORY.feminine] += ice_tokens.count("þær")
+        pronoun_correct[CATEGORY.feminine_unspecified] += ice_tokens.count("þær")
+        pronoun_counts[CATEGORY.long] += 1
+        pronoun_correct[CATEGORY.long] += ice_tokens.count("þær")
+    elif they_pronoun == "male_they":
+        pronoun_counts[CATEGORY.masculine] += 1
+        pronoun_counts[CATEGORY.masculine_unspecified] += 1
+        pronoun_correct[CATEGORY.masculine] += ice_tokens.count("þeir")
+        pronoun_correct[CATEGORY.masculine_unspecified] += ice_tokens.count("þeir")
+        pronoun_counts[CATEGORY.long] += 1
+        pronoun_correct[CATEGORY.long] += ice_tokens.count("þeir")
+    elif they_pronoun == "mixed_they":
+        pronoun_counts[CATEGORY.neuter] += 1
+        pronoun_counts[CATEGORY.neuter_unspecified] += 1
+        pronoun_correct[CATEGORY.neuter] += ice_tokens.count("þau")
+        pronoun_correct[CATEGORY.neuter_unspecified] += ice_tokens.count("þau")
+        pronoun_counts[CATEGORY.long] += 1
+        pronoun_correct[CATEGORY.long] += ice_tokens.count("þau")
+
+def grade_we_they(icelandic_lines_we_they, source_we_they, sentence_count, accepted=None, pronoun_forms=None):
+    # accepted holds the pronouns of the reference translations of each line, if any, see
+    # reference_pronouns.
+    pronoun_counts, pronoun_correct = new_pronoun_counters()
+    for line_source, ice_line, line_references in zip(source_we_they, icelandic_lines_we_they, accepted or repeat(None)):
+        line_accepted = graded_references("we_they", line_source, line_references, sentence_count) if line_references else None
+        grade_we_they_line(ice_line, line_source, sentence_count, pronoun_counts, pronoun_correct, line_accepted, pronoun_forms)
+    return PronounCounters.to_arrays(pronoun_counts, pronoun_correct)
+
+def grade_section(section, icelandic_lines, source_analysis, accepted=None, pronoun_forms=None):
+    if section == "only_they":
+        return grade_only_they(icelandic_lines, source_analysis["only_they"], accepted, pronoun_forms)
+
+    # The translations in the singular_we and we_they sections are compared to the number
+    # of sentences in the last example of the only_they section.
+    sentence_count = source_analysis["only_they"][-1][1] if source_analysis["only_they"] else None
+    if section == "singular_we":
+        return grade_singular_we(icelandic_lines, source_analysis["singular_we"], sentence_count, accepted, pronoun_forms)
+    elif section == "we_they":
+        return grade_we_they(icelandic_lines, source_analysis["we_they"], sentence_count, accepted, pronoun_forms)
+
+def merge_pronoun_counters(partial_counters):
+    return PronounCounters.merge_counters(partial_counters)
+
+# The key of the accuracy of each category in the results of compute_accuracies.
+ACCURACY_KEYS = [f"{category}_pronoun_accuracy" if category in ("feminine", "masculine", "neuter") else f"{category}_accuracy" for category in PRONOUN_CATEGORIES]
+
+def compute_accuracies(pronoun_counts, pronoun_correct):
+    results = dict(zip(ACCURACY_KEYS, PronounCounters.accuracies(pronoun_counts, pronoun_correct)))
+    overall_count = sum(pronoun_counts[Category[category]] for category in OVERALL_CATEGORIES)
+    overall_correct = sum(pronoun_correct[Category[category]] for category in OVERALL_CATEGORIES)
+    results["overall_pronoun_accuracy"] = overall_correct / overall_count * 100 if overall_count > 0 else 0
+    return results
+
+def grade_translations(icelandic_lines_only_they, english_lines_only_they, icelandic_lines_singular_we, english_lines_singular_we, icelandic_lines_we_they, english_lines_we_they, source_analysis=None, references=None, pronoun_forms=None):
+    # The (counts, correct) counters of the translations, indexed by Category.
+    if source_analysis is None:
+        source_analysis = analyze_source(english_lines_only_they, english_lines_singular_we, english_lines_we_they)
+
+    # The pronouns of the reference translations, see References.py.
+    section_accepted = split_sections(references["pronouns"]) if references is not None else repeat(None)
+    partial_counters = [grade_section(section, icelandic_lines, source_analysis, accepted, pronoun_forms) for section, icelandic_lines, accepted in zip(SECTIONS, [icelandic_lines_only_they, icelandic_lines_singular_we, icelandic_lines_we_they], section_accepted)]
+    return merge_pronoun_counters(partial_counters)
+
+def analyze_translations(icelandic_lines_only_they, english_lines_only_they, icelandic_lines_singular_we, english_lines_singular_we, icelandic_lines_we_they, english_lines_we_they, source_analysis=None, references=None, pronoun_forms=None):
+    # The accuracies and the counters of the translations, the counters by category name.
+    pronoun_counts, pronoun_correct = grade_translations(icelandic_lines_only_they, english_lines_only_they, icelandic_lines_singular_we, english_lines_singular_we,
+                                                         icelandic_lines_we_they, english_lines_we_they, source_analysis, references, pronoun_forms)
+    return compute_accuracies(pronoun_counts, pronoun_correct), PronounCounters.by_name(pronoun_counts), PronounCounters.by_name(pronoun_correct)
+
+
+def build_report():
+    # The categories in the order they are reported, in groups of (heading, categories),
+    # with the key of their accuracy in the results of compute_accuracies and their label.
+    report = [
+        (None, [("overall", "overall_pronoun_accuracy", "Overall translation accuracy")]),
+        (None, [("long", "long_accuracy", "Translation accuracy for long text examples (> 3 sentences)"),
+                ("short", "short_accuracy", "Translation accuracy for short text examples (< 3 sentences)")]),
+        ("The following only applies to the long examples:", [("singular_they", "singular_they_accuracy", "Overall translation accuracy for singular 'they'")] +
+            [(gender, f"{gender}_pronoun_accuracy", f"Overall translation accuracy for {gender} 'they'") for gender in ("feminine", "masculine", "neuter")]),
+    ]
+    for suffix, subject in [("", "'they'"), ("_children", "'they have two children'"), ("_nochildren", "'they' with no mention of having children")]:
+        for specification, description in [("unspecified", "when unspecified"), ("trans", "when specified to be trans"), ("cis", "when specified to be cis")]:
+            group = [(f"{gender}_{specification}{suffix}", f"{gender}_{specification}{suffix}_accuracy", f"Translation accuracy for {gender} {subject} {description}") for gender in ("feminine", "masculine", "neuter")]
+            if specification == "cis":
+                group.append((f"neuter_cis_and_trans{suffix}", f"neuter_cis_and_trans{suffix}_accuracy", f"Translation accuracy for neuter {subject} when specified to be cis and trans"))
+            report.append((None, group))
+    report.append((None, [("singular_they_children", "singular_they_children_accuracy", "Translation accuracy for singular 'they have two children'"),
+                          ("singular_they_nochildren", "singular_they_nochildren_accuracy", "Translation accuracy for singular 'they' with no mention of children")]))
+    return report
+
+PRONOUN_REPORT = build_report()
+
+# The categories which together make up the overall accuracy.
+OVERALL_CATEGORIES = ["feminine", "masculine", "neuter", "singular_they", "short"]
+
+def build_scores(results, pronoun_counts, pronoun_correct):
+    scores = []
+    for group, (heading, categories) in enumerate(PRONOUN_REPORT):
+        for category, result_key, label in categories:
+            if category == "overall":
+                correct = sum(pronoun_correct[Category[c]] for c in OVERALL_CATEGORIES)
+                total = sum(pronoun_counts[Category[c]] for c in OVERALL_CATEGORIES)
+            else:
+                correct = pronoun_correct[Category[category]]
+                total = pronoun_counts[Category[category]]
+            scores.append(CategoryScore("pronouns", category, correct, total, results[result_key], label, group, heading or ""))
+    return scores
 
 def main():
-    icelandic_lines_only_they, english_lines_only_they, icelandic_lines_singular_we, english_lines_singular_we, icelandic_lines_we_they, english_lines_we_they = load_text_files("/home/steinunn/doktorsverkefni/wmttestsuite24/genderqueer/en-is/Unbabel-Tower70B.en-is.txt", "english_examples.txt")
-
-    results, pronoun_counts, pronoun_correct = analyze_translations(icelandic_lines_only_they, english_lines_only_they, icelandic_lines_singular_we, english_lines_singular_we, icelandic_lines_we_they, english_lines_we_they)
-    
-    print(f"Overall translation accuracy: {results['overall_pronoun_accuracy']:.2f}% (Correct: {(pronoun_correct['feminine'] + pronoun_correct['masculine'] + pronoun_correct['neuter'] + pronoun_correct['singular_they'] + pronoun_correct['short'])}, Total: {(pronoun_counts['feminine'] + pronoun_counts['masculine'] + pronoun_counts['neuter'] + pronoun_counts['singular_they'] + pronoun_counts['short'])}) \n")
-
-    print(f"Translation accuracy for long text examples (> 3 sentences): {results['long_accuracy']:.2f}% (Correct: {pronoun_correct['long']}, Total: {pronoun_counts['long']})")
-    print(f"Translation accuracy for short text examples (< 3 sentences): {results['short_accuracy']:.2f}% (Correct: {pronoun_correct['short']}, Total: {pronoun_counts['short']}) \n")
-
-    print("The following only applies to the long examples:")
-    print(f"Overall translation accuracy for singular 'they': {results['singular_they_accuracy']:.2f}% (Correct: {pronoun_correct['singular_they']}, Total: {pronoun_counts['singular_they']})")
-    print(f"Overall translation accuracy for feminine 'they': {results['feminine_pronoun_accuracy']:.2f}% (Correct: {pronoun_correct['feminine']}, Total: {pronoun_counts['feminine']})")
-    print(f"Overall translation accuracy for masculine 'they': {results['masculine_pronoun_accuracy']:.2f}% (Correct: {pronoun_correct['masculine']}, Total: {pronoun_counts['masculine']})")
-    print(f"Overall translation accuracy for neuter 'they': {results['neuter_pronoun_accuracy']:.2f}% (Correct: {pronoun_correct['neuter']}, Total: {pronoun_counts['neuter']}) \n")
-    
-    print(f"Translation accuracy for feminine 'they' when unspecified: {results['feminine_unspecified_accuracy']:.2f}% (Correct: {pronoun_correct['feminine_unspecified']}, Total: {pronoun_counts['feminine_unspecified']})")
-    print(f"Translation accuracy for masculine 'they' when unspecified: {results['masculine_unspecified_accuracy']:.2f}% (Correct: {pronoun_correct['masculine_unspecified']}, Total: {pronoun_counts['masculine_unspecified']})")
-    print(f"Translation accuracy for neuter 'they' when unspecified: {results['neuter_unspecified_accuracy']:.2f}% (Correct: {pronoun_correct['neuter_unspecified']}, Total: {pronoun_counts['neuter_unspecified']}) \n")
-
-    print(f"Translation accuracy for feminine 'they' when specified to be trans: {results['feminine_trans_accuracy']:.2f}% (Correct: {pronoun_correct['feminine_trans']}, Total: {pronoun_counts['feminine_trans']})")
-    print(f"Translation accuracy for masculine 'they' when specified to be trans: {results['masculine_trans_accuracy']:.2f}% (Correct: {pronoun_correct['masculine_trans']}, Total: {pronoun_counts['masculine_trans']})")
-    print(f"Translation accuracy for neuter 'they' when specified to be trans: {results['neuter_trans_accuracy']:.2f}% (Correct: {pronoun_correct['neuter_trans']}, Total: {pronoun_counts['neuter_trans']}) \n")
-
-    print(f"Translation accuracy for feminine 'they' when specified to be cis: {results['feminine_cis_accuracy']:.2f}% (Correct: {pronoun_correct['feminine_cis']}, Total: {pronoun_counts['feminine_cis']})")
-    print(f"Translation accuracy for masculine 'they' when specified to be cis: {results['masculine_cis_accuracy']:.2f}% (Correct: {pronoun_correct['masculine_cis']}, Total: {pronoun_counts['masculine_cis']})")
-    print(f"Translation accuracy for neuter 'they' when specified to be cis: {results['neuter_cis_accuracy']:.2f}% (Correct: {pronoun_correct['neuter_cis']}, Total: {pronoun_counts['neuter_cis']})")
-    print(f"Translation accuracy for neuter 'they' when specified to be cis and trans: {results['neuter_cis_and_trans_accuracy']:.2f}% (Correct: {pronoun_correct['neuter_cis_and_trans']}, Total: {pronoun_counts['neuter_cis_and_trans']}) \n")
-
-    print(f"Translation accuracy for feminine 'they have two children' when unspecified: {results['feminine_unspecified_children_accuracy']:.2f}% (Correct: {pronoun_correct['feminine_unspecified_children']}, Total: {pronoun_counts['feminine_unspecified_children']})")
-    print(f"Translation accuracy for masculine 'they have two children' when unspecified: {results['masculine_unspecified_children_accuracy']:.2f}% (Correct: {pronoun_correct['masculine_unspecified_children']}, Total: {pronoun_counts['masculine_unspecified_children']})")
-    print(f"Translation accuracy for neuter 'they have two children' when unspecified: {results['neuter_unspecified_children_accuracy']:.2f}% (Correct: {pronoun_correct['neuter_unspecified_children']}, Total: {pronoun_counts['neuter_unspecified_children']}) \n")
-
-    print(f"Translation accuracy for feminine 'they have two children' when specified to be trans: {results['feminine_trans_children_accuracy']:.2f}% (Correct: {pronoun_correct['feminine_trans_children']}, Total: {pronoun_counts['feminine_trans_children']})")
-    print(f"Translation accuracy for masculine 'they have two children' when specified to be trans: {results['masculine_trans_children_accuracy']:.2f}% (Correct: {pronoun_correct['masculine_trans_children']}, Total: {pronoun_counts['masculine_trans_children']})")
-    print(f"Translation accuracy for neuter 'they have two children' when specified to be trans: {results['neuter_trans_children_accuracy']:.2f}% (Correct: {pronoun_correct['neuter_trans_children']}, Total: {pronoun_counts['neuter_trans_children']}) \n")
-
-    print(f"Translation accuracy for feminine 'they have two children' when specified to be cis: {results['feminine_cis_children_accuracy']:.2f}% (Correct: {pronoun_correct['feminine_cis_children']}, Total: {pronoun_counts['feminine_cis_children']})")
-    print(f"Translation accuracy for masculine 'they have two children' when specified to be cis: {results['masculine_cis_children_accuracy']:.2f}% (Correct: {pronoun_correct['masculine_cis_children']}, Total: {pronoun_counts['masculine_cis_children']})")
-    print(f"Translation accuracy for neuter 'they have two children' when specified to be cis: {results['neuter_cis_children_accuracy']:.2f}% (Correct: {pronoun_correct['neuter_cis_children']}, Total: {pronoun_counts['neuter_cis_children']})")
-    print(f"Translation accuracy for neuter 'they have two children' when specified to be cis and trans: {results['neuter_cis_and_trans_children_accuracy']:.2f}% (Correct: {pronoun_correct['neuter_cis_and_trans_children']}, Total: {pronoun_counts['neuter_cis_and_trans_children']}) \n")
-    
-    print(f"Translation accuracy for feminine 'they' with no mention of having children when unspecified: {results['feminine_unspecified_nochildren_accuracy']:.2f}% (Correct: {pronoun_correct['feminine_unspecified_nochildren']}, Total: {pronoun_counts['feminine_unspecified_nochildren']})")
-    print(f"Translation accuracy for masculine 'they' with no mention of having children when unspecified: {results['masculine_unspecified_nochildren_accuracy']:.2f}% (Correct: {pronoun_correct['masculine_unspecified_nochildren']}, Total: {pronoun_counts['masculine_unspecified_nochildren']})")
-    print(f"Translation accuracy for neuter 'they' with no mention of having children when unspecified: {results['neuter_unspecified_nochildren_accuracy']:.2f}% (Correct: {pronoun_correct['neuter_unspecified_nochildren']}, Total: {pronoun_counts['neuter_unspecified_nochildren']}) \n")
-
-    print(f"Translation accuracy for feminine 'they' with no mention of having children when specified to be trans: {results['feminine_trans_nochildren_accuracy']:.2f}% (Correct: {pronoun_correct['feminine_trans_nochildren']}, Total: {pronoun_counts['feminine_trans_nochildren']})")
-    print(f"Translation accuracy for masculine 'they' with no mention of having children when specified to be trans: {results['masculine_trans_nochildren_accuracy']:.2f}% (Correct: {pronoun_correct['masculine_trans_nochildren']}, Total: {pronoun_counts['masculine_trans_nochildren']})")
-    print(f"Translation accuracy for neuter 'they' with no mention of having children when specified to be trans: {results['neuter_trans_nochildren_accuracy']:.2f}% (Correct: {pronoun_correct['neuter_trans_nochildren']}, Total: {pronoun_counts['neuter_trans_nochildren']}) \n")
+    icelandic_file = "/home/steinunn/doktorsverkefni/wmttestsuite24/genderqueer/en-is/Unbabel-Tower70B.en-is.txt"
+    icelandic_lines_only_they, english_lines_only_they, icelandic_lines_singular_we, english_lines_singular_we, icelandic_lines_we_they, english_lines_we_they = load_text_files(icelandic_file, "english_examples.txt")
 
-    print(f"Translation accuracy for feminine 'they' with no mention of having children when specified to be cis: {results['feminine_cis_nochildren_accuracy']:.2f}% (Correct: {pronoun_correct['feminine_cis_nochildren']}, Total: {pronoun_counts['feminine_cis_nochildren']})")
-    print(f"Translation accuracy for masculine 'they' with no mention of having children when specified to be cis: {results['masculine_cis_nochildren_accuracy']:.2f}% (Correct: {pronoun_correct['masculine_cis_nochildren']}, Total: {pronoun_counts['masculine_cis_nochildren']})")
-    print(f"Translation accuracy for neuter 'they' with no mention of having children when specified to be cis: {results['neuter_cis_nochildren_accuracy']:.2f}% (Correct: {pronoun_correct['neuter_cis_nochildren']}, Total: {pronoun_counts['neuter_cis_nochildren']})")
-    print(f"Translation accuracy for neuter 'they' with no mention of having children when specified to be cis and trans: {results['neuter_cis_and_trans_nochildren_accuracy']:.2f}% (Correct: {pronoun_correct['neuter_cis_and_trans_nochildren']}, Total: {pronoun_counts['neuter_cis_and_trans_nochildren']}) \n")
+    pronoun_counts, pronoun_correct = grade_translations(icelandic_lines_only_they, english_lines_only_they, icelandic_lines_singular_we, english_lines_singular_we, icelandic_lines_we_they, english_lines_we_they)
 
-    print(f"Translation accuracy for singular 'they have two children': {results['singular_they_children_accuracy']:.2f}% (Correct: {pronoun_correct['singular_they_children']}, Total: {pronoun_counts['singular_they_children']})")
-    print(f"Translation accuracy for singular 'they' with no mention of children: {results['singular_they_nochildren_accuracy']:.2f}% (Correct: {pronoun_correct['singular_they_nochildren']}, Total: {pronoun_counts['singular_they_nochildren']})")
+    print(render_text(GradingResult(icelandic_file, build_scores(compute_accuracies(pronoun_counts, pronoun_correct), pronoun_counts, pronoun_correct))))
 
 
 if __name__ == "__main__":
-   main()
\ No newline at end of file
+   main()
@@ -0,0 +1,67 @@
+import LineCache
+import SuiteSections
+import Tokenizer
+import LanguagePacks
+from Tokenizer import word_tokenize
+from LineCorpus import LineCorpus
+from PronounTranslationGrader import reference_pronouns
+import GenderedAdjectivesTranslationGrader
+
+"""
+    This program loads reference translations of the GenderQueer test suite, e.g.
+    gold_standard.txt and translations of the test suite by other translators, one file
+    per reference with the lines in the order of the English examples. The pronoun and
+    adjective graders expect the forms given by their rules, e.g. "hán" for a non-binary
+    person, but a translation of an example which uses the same form of "they" or of an
+    adjective as one of the references is also given full points for it.
+
+    The adjective forms (those in the adjective database) used in the references of each
+    line are merged into a frozenset when the references are loaded, so a token of a
+    translation is checked against all of the references with a single lookup. The
+    pronouns are only taken from the sentences of the references in which the pronouns of
+    a translation are counted, e.g. not from the first sentence which introduces the
+    subjects, so that a pronoun used elsewhere in a reference is not given full points.
+    They are kept with the number of sentences of each reference and merged when a line
+    is graded, see PronounTranslationGrader.graded_references. The references are loaded once per process and shared by all the systems
+    graded, and loaded again if one of the files changes.
+
+    python BatchTranslationGrader.py translations/ --references gold_standard.txt other_reference.txt
+"""
+
+# The loaded references, by the content of the files, the tokenizer backend and the
+# language pack.
+loaded_references = {}
+
+def build_references(reference_files, adjective_index, pronoun_forms=None):
+    # Only the first copy of the test suite in a reference file is used.
+    suite_length = SuiteSections.suite_length()
+    forms = adjective_index["forms"]
+    pronouns = [[] for _ in range(suite_length)]
+    adjectives = [set() for _ in range(suite_length)]
+    for reference_file in reference_files:
+        for position, ref_line in enumerate(LineCorpus(reference_file)[:suite_length]):
+            # The pronouns in their Icelandic form, like those of the translations.
+            pronouns[position].append(reference_pronouns(ref_line, pronoun_forms))
+            adjectives[position].update(token for token in word_tokenize(ref_line.lower()) if token in forms)
+    return {
+        "pronouns": [tuple(line_pronouns) for line_pronouns in pronouns],
+        "adjectives": [frozenset(line_adjectives) for line_adjectives in adjectives],
+    }
+
+def references_version(reference_files, adjectives_file="adjectives.json", pack=None):
+    pack = pack or LanguagePacks.get_pack()
+    return (tuple(LineCache.file_version(reference_file) for reference_file in reference_files), LineCache.file_version(adjectives_file),
+            LineCache.file_version(SuiteSections.manifest_path), Tokenizer.get_backend(), pack["key"])
+
+def load_references(reference_files, adjectives_file="adjectives.json", pack=None):
+    # The pronouns and adjective forms of the references, as lists of frozensets with one
+    # set per line of the test suite. The pronouns are read with those of the language
+    # pack, the current one (see LanguagePacks.get_pack) if none is given.
+    pack = pack or LanguagePacks.get_pack()
+    version = references_version(reference_files, adjectives_file, pack)
+    if version not in loaded_references:
+        adj_database = GenderedAdjectivesTranslationGrader.load_adjective_database(adjectives_file)
+        references = build_references(reference_files, GenderedAdjectivesTranslationGrader.build_adjective_index(adj_database), pack["pronoun_forms"])
+        references["version"] = version
+        loaded_references[version] = references
+    return loaded_references[version]
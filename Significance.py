@@ -0,0 +1,227 @@
+import argparse
+import json
+from itertools import repeat
+
+import numpy as np
+
+import Tokenizer
+import SuiteSections
+import LanguagePacks
+import PronounTranslationGrader
+import GenderedAdjectivesTranslationGrader
+import VectorizedPronounGrader
+from PronounCounters import PRONOUN_CATEGORIES, Category
+from BatchTranslationGrader import find_system_files, load_shared_state, read_system_file, section_references
+
+"""
+    This program tells whether the differences between the scores of MT systems on the
+    GenderQueer test suite are larger than what chance would give. Some categories are
+    small, e.g. the short examples are only a handful, so a difference of a few points between
+    two systems may well be noise.
+
+    The translations of all the systems are graded line by line, which gives for each
+    category the points scored by each system on each line and the points possible on
+    the line. The accuracy of a category is the sum of the points over the sum of the
+    points possible, as in the graders, and two tests are run over the lines of each
+    category:
+
+    - Paired bootstrap resampling: the lines are drawn with replacement, the same draws
+      for all the systems, and the accuracies are computed on each resample. This gives a
+      confidence interval for the accuracy of each system, and a p-value for each pair of
+      systems, the share of resamples in which the difference between them, shifted to a
+      mean of zero, is at least as large as the difference observed.
+    - Approximate randomization: the translations of the two systems are swapped on a
+      random half of the lines, and the p-value is the share of the shuffles in which the
+      difference between them is at least as large as the one observed.
+
+    The resamples are drawn as NumPy arrays and the accuracies of all the systems are
+    computed at once with matrix products, so 10,000 resamples of 100 systems take a few
+    seconds per category. The results are the same for the same seed.
+
+    python Significance.py wmt24/en-is/ --category short --category neuter_cis --output significance.json
+"""
+
+DEFAULT_RESAMPLES = 10000
+DEFAULT_SEED = 0
+CONFIDENCE_LEVEL = 0.95
+ADJECTIVE_GENDERS = GenderedAdjectivesTranslationGrader.GENDERS
+# The categories compared, as (grader, category).
+CATEGORIES = ([("pronouns", "overall")] + [("pronouns", category) for category in PRONOUN_CATEGORIES]
+              + [("adjectives", "overall")] + [("adjectives", gender) for gender in ADJECTIVE_GENDERS] + [("terminology", "correct")])
+
+def pronoun_line_scores(systems_lines, state):
+    # The points and points possible of every pronoun category on every line of the
+    # pronoun sections, as arrays of shape (systems, lines, categories) and (lines, categories).
+    weights = VectorizedPronounGrader.build_weights(state["pronoun_source"], state["references"])
+    occurrences = np.stack([VectorizedPronounGrader.count_pronouns(VectorizedPronounGrader.section_lines(icelandic_lines), weights, state["pronoun_forms"]) for icelandic_lines in systems_lines])
+    return np.einsum("slp,lcp->slc", occurrences, weights["correct_weights"]), weights["count_weights"]
+
+def adjective_line_scores(icelandic_lines, state):
+    # The points and points possible of every line of the adjective sections, overall and
+    # for each gender, as two arrays of shape (lines, 1 + genders).
+    points = []
+    totals = []
+    for section, section_lines, source, accepted in zip(GenderedAdjectivesTranslationGrader.SECTIONS, GenderedAdjectivesTranslationGrader.split_sections(icelandic_lines),
+                                                         (state["adjective_source"][section] for section in GenderedAdjectivesTranslationGrader.SECTIONS), section_references(state, "adjectives")):
+        for ice_line, line_source, line_accepted in zip(section_lines, source, accepted or repeat(None)):
+            results = GenderedAdjectivesTranslationGrader.new_results()
+            correct = GenderedAdjectivesTranslationGrader.grade_line(section, ice_line, line_source, state["adjective_index"], results, line_accepted)
+            points.append([correct] + [sum(results["translation_analysis"][gender].values()) for gender in ADJECTIVE_GENDERS])
+            totals.append([GenderedAdjectivesTranslationGrader.adjectives_per_line(section)] + [sum(results["adjective_counts"][gender].values()) for gender in ADJECTIVE_GENDERS])
+    return np.array(points, dtype=float).reshape(-1, 1 + len(ADJECTIVE_GENDERS)), np.array(totals, dtype=float).reshape(-1, 1 + len(ADJECTIVE_GENDERS))
+
+def term_line_scores(icelandic_lines, state):
+    terminology_grader = state["terminology_grader"]
+    points = []
+    for eng_line, ice_line, terms in zip(state["english_lines"], icelandic_lines, state["line_terms"]):
+        points.append(terminology_grader.grade_translation(eng_line.strip(), ice_line.strip(), terms)[0] if terms else 0)
+    return np.array(points, dtype=float), np.array([len(terms) for terms in state["line_terms"][:len(points)]], dtype=float)
+
+def line_scores(system_files, state):
+    # For each category, the points of each system on the lines that count towards it, of
+    # shape (systems, lines), and the points possible on these lines.
+    systems_lines = [read_system_file(icelandic_file) for icelandic_file in system_files]
+    scores = {}
+
+    pronoun_points, pronoun_totals = pronoun_line_scores(systems_lines, state)
+    overall = [Category[category] for category in PronounTranslationGrader.OVERALL_CATEGORIES]
+    scores[("pronouns", "overall")] = (pronoun_points[:, :, overall].sum(axis=2), pronoun_totals[:, overall].sum(axis=1))
+    for category in PRONOUN_CATEGORIES:
+        scores[("pronouns", category)] = (pronoun_points[:, :, Category[category]], pronoun_totals[:, Category[category]])
+
+    adjective_scores = [adjective_line_scores(icelandic_lines, state) for icelandic_lines in systems_lines]
+    adjective_points = np.stack([points for points, _ in adjective_scores])
+    adjective_totals = adjective_scores[0][1]
+    for i, category in enumerate(["overall"] + ADJECTIVE_GENDERS):
+        scores[("adjectives", category)] = (adjective_points[:, :, i], adjective_totals[:, i])
+
+    term_scores = [term_line_scores(icelandic_lines, state) for icelandic_lines in systems_lines]
+    scores[("terminology", "correct")] = (np.stack([points for points, _ in term_scores]), term_scores[0][1])
+
+    # Only the lines which count towards a category are resampled.
+    return {key: (points[:, totals > 0], totals[totals > 0]) for key, (points, totals) in scores.items()}
+
+def accuracies(points, totals):
+    return points.sum(axis=-1) / totals.sum() * 100 if totals.sum() > 0 else np.zeros(points.shape[:-1])
+
+def bootstrap_accuracies(points, totals, resamples, rng):
+    # The accuracy of every system on each resample, of shape (resamples, systems). A
+    # resample is given by how many times each line was drawn.
+    line_count = len(totals)
+    draws = rng.multinomial(line_count, np.full(line_count, 1 / line_count), size=resamples).astype(float)
+    return (draws @ points.T) / (draws @ totals)[:, None] * 100
+
+def confidence_intervals(resampled, level=CONFIDENCE_LEVEL):
+    low, high = np.percentile(resampled, [(1 - level) / 2 * 100, (1 + level) / 2 * 100], axis=0)
+    return low, high
+
+def pairwise_p_values(samples, observed):
+    # The share of the samples in which the difference between two systems is at least as
+    # large as the one observed, for every pair of systems, of shape (systems, systems).
+    # The samples are drawn under the null hypothesis, e.g. shifted to a mean of zero.
+    resamples, system_count = samples.shape
+    p_values = np.ones((system_count, system_count))
+    for a in range(system_count - 1):
+        differences = np.abs(samples[:, a, None] - samples[:, a + 1:])
+        observed_differences = np.abs(observed[a] - observed[a + 1:])
+        p_values[a, a + 1:] = ((differences >= observed_differences - 1e-9).sum(axis=0) + 1) / (resamples + 1)
+        p_values[a + 1:, a] = p_values[a, a + 1:]
+    return p_values
+
+def bootstrap_p_values(resampled, observed):
+    return pairwise_p_values(resampled - resampled.mean(axis=0), observed)
+
+def randomization_p_values(points, totals, resamples, rng):
+    # Swapping the translations of two systems on a line flips the sign of the difference
+    # of their points on it, so a shuffle is a vector of signs, one per line, and the
+    # shuffled difference of two systems is the difference of their signed sums.
+    signs = rng.integers(0, 2, size=(resamples, len(totals))) * 2.0 - 1
+    return pairwise_p_values(signs @ points.T, points.sum(axis=1))
+
+def compare_systems(patterns, categories=CATEGORIES, resamples=DEFAULT_RESAMPLES, seed=DEFAULT_SEED, level=CONFIDENCE_LEVEL,
+                    english_file="english_examples.txt", adjectives_file=None, terminology_file=None, reference_files=None, language=None):
+    state = load_shared_state(english_file, adjectives_file, terminology_file, reference_files, language)
+    system_files = find_system_files(patterns)
+    scores = line_scores(system_files, state)
+    comparison = {"systems": [file_path for file_path in system_files], "resamples": resamples, "seed": seed, "level": level, "categories": {}}
+    for grader, category in categories:
+        points, totals = scores[(grader, category)]
+        # Every category is drawn with its own generator, so its results do not depend on
+        # which other categories are compared.
+        rng = np.random.default_rng([seed, CATEGORIES.index((grader, category))])
+        observed = accuracies(points, totals)
+        if len(totals):
+            resampled = bootstrap_accuracies(points, totals, resamples, rng)
+            low, high = confidence_intervals(resampled, level)
+            bootstrap = bootstrap_p_values(resampled, observed)
+            randomization = randomization_p_values(points, totals, resamples, rng)
+        else:
+            low = high = observed
+            bootstrap = randomization = np.ones((len(system_files), len(system_files)))
+        comparison["categories"][f"{grader}/{category}"] = {
+            "lines": len(totals),
+            "accuracy": observed.tolist(),
+            "ci_low": low.tolist(),
+            "ci_high": high.tolist(),
+            "bootstrap_p": bootstrap.tolist(),
+            "randomization_p": randomization.tolist(),
+        }
+    return comparison
+
+def parse_category(name):
+    # A category is given as grader/category, or as a pronoun category alone.
+    grader, _, category = name.rpartition("/")
+    key = (grader or "pronouns", category)
+    if key not in CATEGORIES:
+        raise argparse.ArgumentTypeError(f"unknown category '{name}'")
+    return key
+
+def render_comparison(comparison, alpha=0.05):
+    names = [system.rsplit("/", 1)[-1].rsplit(".", 1)[0] for system in comparison["systems"]]
+    width = max([len(name) for name in names] + [6])
+    lines = []
+    for key, result in comparison["categories"].items():
+        lines.append(f"{key} ({result['lines']} lines, {comparison['level'] * 100:g}% confidence intervals)")
+        for name, accuracy, low, high in zip(names, result["accuracy"], result["ci_low"], result["ci_high"]):
+            lines.append(f"  {name:<{width}} {accuracy:6.2f} [{low:6.2f}, {high:6.2f}]")
+        lines.append(f"  Pairs significantly different at p < {alpha} (bootstrap / randomization):")
+        lines.append("  " + " " * width + " " + " ".join(f"{i:>3}" for i in range(len(names))))
+        for i, name in enumerate(names):
+            marks = []
+            for j in range(len(names)):
+                mark = "-" if i == j else ("b" if result["bootstrap_p"][i][j] < alpha else ".") + ("r" if result["randomization_p"][i][j] < alpha else ".")
+                marks.append(f"{mark:>3}")
+            lines.append(f"  {name:<{width}} " + " ".join(marks) + f"  ({i})")
+        lines.append("")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Test the significance of the differences between MT systems on the GenderQueer test suite.")
+    parser.add_argument("systems", nargs="+", help="directories or glob patterns of translation files, one file per system")
+    parser.add_argument("--category", action="append", type=parse_category, help="grader/category to compare, e.g. pronouns/short or adjectives/neuter, all categories by default")
+    parser.add_argument("--resamples", type=int, default=DEFAULT_RESAMPLES, help="number of bootstrap resamples and of shuffles")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--level", type=float, default=CONFIDENCE_LEVEL, help="the level of the confidence intervals")
+    parser.add_argument("--english", default="english_examples.txt", help="the English test suite")
+    parser.add_argument("--language", default=LanguagePacks.get_language(), help="the target language of the translations, see LanguagePacks.py")
+    parser.add_argument("--adjectives", help="the adjective database, that of the language pack by default")
+    parser.add_argument("--terminology", help="the LGBTQAI+ terminology database, that of the language pack by default")
+    parser.add_argument("--tokenizer", choices=sorted(Tokenizer.BACKENDS), help="the tokenizer backend, see Tokenizer.py, that of the language pack by default")
+    parser.add_argument("--sections", default=SuiteSections.manifest_path, help="the section manifest of the test suite, see SuiteSections.py")
+    parser.add_argument("--references", nargs="+", help="reference translations of the test suite whose pronoun and adjective forms are also given full points, see References.py")
+    parser.add_argument("--output", help="write the confidence intervals and p-values to this JSON file")
+    args = parser.parse_args()
+    LanguagePacks.set_language(args.language)
+    if args.tokenizer:
+        Tokenizer.set_backend(args.tokenizer)
+    SuiteSections.set_manifest(args.sections)
+
+    comparison = compare_systems(args.systems, args.category or CATEGORIES, args.resamples, args.seed, args.level,
+                                 args.english, args.adjectives, args.terminology, args.references, args.language)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(comparison, f, indent=2)
+    print(render_comparison(comparison))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+import argparse
+import copy
+import json
+from functools import lru_cache
+
+import Tokenizer
+import SuiteSections
+import LanguagePacks
+import PronounTranslationGrader
+import PronounCounters
+import GenderedAdjectivesTranslationGrader
+from LGBTQAITranslationGrader import LGBTQAITranslationGrader, GRADER_VERSION as TERMINOLOGY_GRADER_VERSION
+from BatchTranslationGrader import build_result, format_table, system_name
+from GradingResults import LineResult
+from References import load_references
+import LineCache
+
+"""
+    This program grades a translation of the GenderQueer test suite one line at a time,
+    reading the English examples and the translation side by side instead of loading the
+    whole files. Each line pair is routed by its line number to the section graders it
+    belongs to, and a result is yielded for every line as soon as it has been graded.
+
+    A translation file may hold several copies of the test suite one after another, e.g.
+    the translations of several MT systems concatenated into one file, or an augmented
+    test suite. The English examples are then read again from the start for each copy and
+    one row of scores is produced per copy, so files of millions of lines are graded in
+    constant memory. The rows are the same as those of BatchTranslationGrader.py.
+
+    The per-line results can be written to a JSON Lines file with --lines. With --cache,
+    the grades of the lines are kept on disk and a line is only graded again when it has
+    changed, which makes grading successive checkpoints of an MT system fast.
+
+    python StreamingTranslationGrader.py translations.txt --lines line_scores.jsonl
+    python StreamingTranslationGrader.py checkpoint_2000.txt --cache
+"""
+
+CACHE_SIZE = 65536
+
+def iter_line_pairs(english_file, icelandic_file, suite_length):
+    # Yields (line_no, english_line, icelandic_line). The English file is opened again
+    # whenever the translation file continues past the end of a copy of the test suite.
+    with open(english_file, 'r', encoding='utf-8') as eng:
+        english_length = sum(1 for _ in eng)
+    if english_length < suite_length:
+        # Otherwise the translation would be graded on the first lines of the test suite only.
+        raise ValueError(f"{english_file} has {english_length} lines, the test suite has {suite_length}")
+    with open(icelandic_file, 'r', encoding='utf-8') as ice:
+        line_no = 0
+        while True:
+            with open(english_file, 'r', encoding='utf-8') as eng:
+                for eng_line, ice_line in zip(eng, ice):
+                    line_no += 1
+                    yield line_no, eng_line, ice_line
+                    if line_no % suite_length == 0:
+                        break
+                else:
+                    return
+
+class StreamingTranslationGrader:
+    def __init__(self, adjectives_file=None, terminology_file=None, cache=None, reference_files=None, language=None):
+        # The pronoun and adjective sections of each line of the test suite, see SuiteSections.py.
+        self.routes = SuiteSections.build_routes()
+        self.suite_length = len(self.routes)
+        self.cache = cache
+        # The databases of the language pack (see LanguagePacks.py) are used unless others
+        # are given. Without a language, that of the current pack.
+        pack = LanguagePacks.set_language(language)
+        # The pronouns of other languages are graded in their Icelandic form, so the grades
+        # cached for a line depend on the pronoun table of the pack.
+        self.pronoun_forms = pack["pronoun_forms"]
+        self.pronoun_forms_version = pack["key"] if pack["pronoun_forms"] is not None else None
+        self.adjectives_version = LineCache.file_version(adjectives_file or pack["adjectives_file"])
+        self.terminology_version = LineCache.file_version(terminology_file or pack["terminology_file"])
+        # The number of adjectives per line of a section is given by the section manifest.
+        self.manifest_version = LineCache.file_version(SuiteSections.manifest_path)
+        if adjectives_file is None:
+            adj_database = pack["adjective_database"]
+            self.adjective_index = pack["adjective_index"]
+        else:
+            adj_database = GenderedAdjectivesTranslationGrader.load_adjective_database(adjectives_file)
+            self.adjective_index = GenderedAdjectivesTranslationGrader.build_adjective_index(adj_database)
+        if terminology_file is None:
+            # A copy which shares the database and the automata of the pack.
+            self.terminology_grader = copy.copy(pack["terminology_grader"])
+            self.terminology_grader.show_details = True
+        else:
+            self.terminology_grader = LGBTQAITranslationGrader(show_details=True, terminology_path=terminology_file)
+        # The pronoun and adjective forms of the reference translations, see References.py.
+        self.references = load_references(reference_files, adjectives_file or pack["adjectives_file"], pack) if reference_files else None
+
+        # The English examples repeat in every copy of the test suite, so their analysis
+        # is cached by content rather than kept for the whole file.
+        self.analyze_pronoun_line = lru_cache(maxsize=CACHE_SIZE)(PronounTranslationGrader.analyze_source_line)
+        self.analyze_adjective_line = lru_cache(maxsize=CACHE_SIZE)(lambda section, eng_line: GenderedAdjectivesTranslationGrader.analyze_source_line(section, eng_line, adj_database))
+        self.identify_terms = lru_cache(maxsize=CACHE_SIZE)(self.terminology_grader.identify_terms)
+
+    def cached(self, grader, key_parts, grade):
+        # Looks the grade up in the line cache, if there is one, and grades the line otherwise.
+        if self.cache is None:
+            return grade()
+        cached_grade = self.cache.get(grader, key_parts)
+        if cached_grade is None:
+            cached_grade = grade()
+            self.cache.put(grader, key_parts, cached_grade)
+        return cached_grade
+
+    def accepted(self, grader, position):
+        # The forms used in the reference translations of the line, None without references.
+        return self.references[grader][position] if self.references is not None else None
+
+    def accepted_pronouns(self, section, eng_line, position, sentence_count):
+        # The pronouns used in the graded sentences of the reference translations of the line.
+        if self.references is None:
+            return None
+        return PronounTranslationGrader.graded_references(section, self.analyze_pronoun_line(section, eng_line), self.references["pronouns"][position], sentence_count)
+
+    def grade_pronouns(self, section, eng_line, ice_line, sentence_count, accepted=None):
+        key_parts = (PronounTranslationGrader.GRADER_VERSION, Tokenizer.get_backend(), section, eng_line, ice_line, sentence_count)
+        if accepted:
+            key_parts += (tuple(sorted(accepted)),)
+        if self.pronoun_forms_version is not None:
+            key_parts += (self.pronoun_forms_version,)
+        # Only the categories the line counts towards are cached.
+        line_counts, line_correct = self.cached("pronouns", key_parts, lambda: self.grade_pronoun_line(section, eng_line, ice_line, sentence_count, accepted))
+        return PronounCounters.from_sparse(line_counts, line_correct)
+
+    def grade_pronoun_line(self, section, eng_line, ice_line, sentence_count, accepted=None):
+        pronoun_counts, pronoun_correct = PronounTranslationGrader.new_pronoun_counters()
+        line_source = self.analyze_pronoun_line(section, eng_line)
+        if section == "only_they":
+            PronounTranslationGrader.grade_only_they_line(ice_line, line_source, pronoun_counts, pronoun_correct, accepted, self.pronoun_forms)
+        elif section == "singular_we":
+            PronounTranslationGrader.grade_singular_we_line(ice_line, line_source, sentence_count, pronoun_counts, pronoun_correct, accepted, self.pronoun_forms)
+        elif section == "we_they":
+            PronounTranslationGrader.grade_we_they_line(ice_line, line_source, sentence_count, pronoun_counts, pronoun_correct, accepted, self.pronoun_forms)
+        return PronounCounters.to_sparse(pronoun_counts), PronounCounters.to_sparse(pronoun_correct)
+
+    def grade_adjectives(self, section, eng_line, ice_line, accepted=None):
+        key_parts = (GenderedAdjectivesTranslationGrader.GRADER_VERSION, Tokenizer.get_backend(), self.adjectives_version, self.manifest_version, section, eng_line, ice_line)
+        if accepted:
+            key_parts += (tuple(sorted(accepted)),)
+        return self.cached("adjectives", key_parts, lambda: self.grade_adjective_line(section, eng_line, ice_line, accepted))
+
+    def grade_adjective_line(self, section, eng_line, ice_line, accepted=None):
+        results = GenderedAdjectivesTranslationGrader.new_results()
+        line_source = self.analyze_adjective_line(section, eng_line)
+        adjectives_correct = GenderedAdjectivesTranslationGrader.grade_line(section, ice_line, line_source, self.adjective_index, results, accepted)
+        return results, adjectives_correct, GenderedAdjectivesTranslationGrader.adjectives_per_line(section)
+
+    def grade_line(self, line_no, eng_line, ice_line, sentence_count):
+        # sentence_count is the number of sentences in the last only_they example, to which
+        # the singular_we and we_they translations are compared.
+        position = (line_no - 1) % self.suite_length
+        pronoun_section, adjective_section = self.routes[position]
+        line_result = LineResult(line_no, (line_no - 1) // self.suite_length, position + 1, pronoun_section, adjective_section)
+
+        if pronoun_section is not None:
+            line_result.pronoun_counts, line_result.pronoun_correct = self.grade_pronouns(pronoun_section, eng_line, ice_line, sentence_count, self.accepted_pronouns(pronoun_section, eng_line, position, sentence_count))
+
+        if adjective_section is not None:
+            line_result.adjective_analysis, line_result.adjectives_correct, line_result.total_adjectives = self.grade_adjectives(adjective_section, eng_line, ice_line, self.accepted("adjectives", position))
+
+        line_result.terms, line_result.terms_correct, line_result.terms_inappropriate, line_result.term_details = self.grade_terms(eng_line.strip(), ice_line.strip())
+        return line_result
+
+    def grade_stream(self, line_pairs):
+        # The last only_they example precedes the singular_we and we_they sections in every
+        # copy of the test suite, so its number of sentences is known when they are reached.
+        sentence_count = None
+        for line_no, eng_line, ice_line in line_pairs:
+            if self.routes[(line_no - 1) % self.suite_length][0] == "only_they":
+                sentence_count = self.analyze_pronoun_line("only_they", eng_line)[1]
+            yield self.grade_line(line_no, eng_line, ice_line, sentence_count)
+
+        if self.cache is not None:
+            self.cache.flush()
+
+    def source_sentence_count(self, english_lines):
+        # The number of sentences in the last only_they example, for graders which do not
+        # receive the lines in order.
+        last_position = max(position for position, (section, _) in enumerate(self.routes) if section == "only_they")
+        return self.analyze_pronoun_line("only_they", english_lines[last_position])[1]
+
+    def grade_terms(self, english_text, icelandic_text):
+        key_parts = (TERMINOLOGY_GRADER_VERSION, self.terminology_version, english_text, icelandic_text)
+        return self.cached("terminology", key_parts, lambda: self.grade_term_line(english_text, icelandic_text))
+
+    def grade_term_line(self, english_text, icelandic_text):
+        identified_terms = self.identify_terms(english_text)
+        correct, inappropriate, term_grades = self.terminology_grader.grade_translation(english_text, icelandic_text, identified_terms)
+        return tuple(identified_terms), correct, inappropriate, tuple(term_grades)
+
+    def grade_files(self, english_file, icelandic_file):
+        return self.grade_stream(iter_line_pairs(english_file, icelandic_file, self.suite_length))
+
+def new_totals():
+    return {
+        "pronouns": PronounCounters.new_counters(),
+        "adjectives": [GenderedAdjectivesTranslationGrader.new_results(), 0, 0],
+        "terminology": [0, 0, 0],
+    }
+
+def add_line_result(totals, line_result):
+    if line_result.pronoun_section is not None:
+        PronounCounters.add_counters(totals["pronouns"], (line_result.pronoun_counts, line_result.pronoun_correct))
+
+    if line_result.adjective_section is not None:
+        adjectives = totals["adjectives"]
+        for key in ("translation_analysis", "adjective_counts"):
+            for gender, sentiments in line_result.adjective_analysis[key].items():
+                for sentiment, count in sentiments.items():
+                    adjectives[0][key][gender][sentiment] += count
+        adjectives[1] += line_result.adjectives_correct
+        adjectives[2] += line_result.total_adjectives
+
+    terminology = totals["terminology"]
+    terminology[0] += len(line_result.terms)
+    terminology[1] += line_result.terms_correct
+    terminology[2] += line_result.terms_inappropriate
+
+def summarize_copies(line_results, icelandic_file, terminology_grader):
+    # Yields one row of scores per copy of the test suite as soon as the copy has been
+    # graded. When the file holds more than one copy, the rows are numbered.
+    totals = None
+    copy_no = 0
+    for line_result in line_results:
+        if totals is not None and line_result.copy != copy_no:
+            yield summary_row(system_name(icelandic_file), totals, terminology_grader, copy_no + 1)
+            totals = None
+        if totals is None:
+            totals = new_totals()
+            copy_no = line_result.copy
+        add_line_result(totals, line_result)
+    if totals is not None:
+        yield summary_row(system_name(icelandic_file), totals, terminology_grader, copy_no + 1 if copy_no > 0 else None)
+
+def summary_row(system, totals, terminology_grader, number=None):
+    total_terms, total_correct, total_inappropriate = totals["terminology"]
+    result = build_result(system, [totals["pronouns"]], [tuple(totals["adjectives"])], (total_terms, total_correct, total_inappropriate, []), terminology_grader)
+    if number is not None:
+        result.system = f"{result.system}/{number}"
+    return result
+
+def write_line_results(line_results, output_file):
+    # Passes the results through while writing them to a JSON Lines file.
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for line_result in line_results:
+            f.write(json.dumps(line_result.to_dict(), ensure_ascii=False) + "\n")
+            yield line_result
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade a translation of the GenderQueer test suite line by line.")
+    parser.add_argument("translations", help="the translation file, which may hold several copies of the test suite")
+    parser.add_argument("--english", default="english_examples.txt", help="the English test suite")
+    parser.add_argument("--language", default=LanguagePacks.get_language(), help="the target language of the translations, see LanguagePacks.py")
+    parser.add_argument("--adjectives", help="the adjective database, that of the language pack by default")
+    parser.add_argument("--terminology", help="the LGBTQAI+ terminology database, that of the language pack by default")
+    parser.add_argument("--tokenizer", choices=sorted(Tokenizer.BACKENDS), help="the tokenizer backend, see Tokenizer.py, that of the language pack by default")
+    parser.add_argument("--sections", default=SuiteSections.manifest_path, help="the section manifest of the test suite, see SuiteSections.py")
+    parser.add_argument("--references", nargs="+", help="reference translations of the test suite whose pronoun and adjective forms are also given full points, see References.py")
+    parser.add_argument("--lines", help="write the per-line results to this JSON Lines file")
+    parser.add_argument("--cache", nargs="?", const=LineCache.CACHE_FILE, help="keep the grades of the lines in this cache file, that of the user's cache if none is given, and only grade lines that are not in it, see LineCache.py")
+    parser.add_argument("--cache-size", type=int, default=LineCache.MAX_SIZE // (1024 * 1024), help="the maximum size of the cache in MB")
+    args = parser.parse_args()
+    LanguagePacks.set_language(args.language)
+    if args.tokenizer:
+        Tokenizer.set_backend(args.tokenizer)
+    SuiteSections.set_manifest(args.sections)
+
+    cache = LineCache.LineCache(args.cache, args.cache_size * 1024 * 1024) if args.cache else None
+    grader = StreamingTranslationGrader(args.adjectives, args.terminology, cache=cache, reference_files=args.references, language=args.language)
+    line_results = grader.grade_files(args.english, args.translations)
+    if args.lines:
+        line_results = write_line_results(line_results, args.lines)
+
+    print(format_table([]))
+    for row in summarize_copies(line_results, args.translations, grader.terminology_grader):
+        print(format_table([row]).split("\n", 1)[1], flush=True)
+    if cache is not None:
+        cache.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import re
+import warnings
+
+import SuiteSections
+
+"""
+    This program identifies the subject(s) of the English examples of the test suite,
+    e.g. "female_plural_trans" for an example about "these trans women", for both the
+    pronoun and the adjective graders. The examples of each section are described by a
+    table of (phrase, subject) pairs. An example is given the subject of the first phrase
+    in the table that appears in it, so a phrase must come before any shorter phrase it
+    contains, e.g. "this woman and this man" before "this woman". The phrases are matched
+    without regard to case.
+
+    The phrases of a section are compiled into a single regular expression, so an example
+    is scanned once whatever the number of phrases rather than once per phrase. Examples
+    which contain none of the phrases have no subject (None) and are not graded; the
+    graders report them with a warning when the English examples are analysed.
+"""
+
+SUBJECT_PATTERNS = {
+    "only_they": [
+        ("these women", "female_plural_unspecified"),
+        ("these trans women", "female_plural_trans"),
+        ("these cis women", "female_plural_cis"),
+        ("these men", "male_plural_unspecified"),
+        ("these trans men", "male_plural_trans"),
+        ("these cis men", "male_plural_cis"),
+        ("this man and this woman", "mixed_unspecified"),
+        ("this woman and this man", "mixed_unspecified"),
+        ("this cis woman and this trans man", "mixed_trans_cis"),
+        ("this trans woman and this cis man", "mixed_trans_cis"),
+        ("this cis woman and this cis man", "mixed_cis"),
+        ("this trans woman and this trans man", "mixed_trans"),
+    ],
+    "singular_we": [
+        ("non-binary person", "non-binary"),
+        ("genderqueer person", "non-binary"),
+        ("genderfluid person", "non-binary"),
+        ("this woman", "female_singular"),
+        ("this man", "male_singular"),
+        ("i’m a woman. my friends are women.", "female_plural"),
+        ("i’m a woman. my friends are men.", "mixed"),
+        ("i’m a woman. my friends are a woman and a man.", "mixed"),
+        ("i’m a man. my friends are men.", "male_plural"),
+        ("i’m a man. my friends are women.", "mixed"),
+        ("i’m a man. my friends are a woman and a man.", "mixed"),
+    ],
+    "we_they": [
+        ("i’m a woman. my friends are women.", ("female_we", "female_they")),
+        ("i’m a woman. my friends are men.", ("mixed_we", "male_they")),
+        ("i’m a woman. my friends are a woman and a man.", ("mixed_we", "mixed_they")),
+        ("i’m a man. my friends are men.", ("male_we", "male_they")),
+        ("i’m a man. my friends are women.", ("mixed_we", "female_they")),
+        ("i’m a man. my friends are a woman and a man.", ("mixed_we", "mixed_they")),
+    ],
+    "names": [
+        ("i’m a woman. my friends mary, olivia and sophia are women.", ("female_we", "female_group1", "female_group2")),
+        ("i’m a woman. my friends mary and sophia are women but my friend john is a man.", ("mixed_we", "female_group1", "mixed_group2")),
+        ("i’m a woman. my friend mary is a woman but my friends john and brian are men.", ("mixed_we", "female_group1", "male_group2")),
+        ("i’m a woman. my friend charles is a man but my friends olivia and sophia are women.", ("mixed_we", "mixed_group1", "female_group2")),
+        ("i’m a woman. my friends charles and john are men but my friend sophia is a woman.", ("mixed_we", "mixed_group1", "mixed_group2")),
+        ("i’m a woman. my friends charles, john and brian are men.", ("mixed_we", "mixed_group1", "male_group2")),
+        ("i’m a man. my friends mary, olivia and sophia are women.", ("mixed_we", "mixed_group1", "female_group2")),
+        ("i’m a man. my friends mary and sophia are women but my friend john is a man.", ("mixed_we", "mixed_group1", "mixed_group2")),
+        ("i’m a man. my friend mary is a woman but my friends john and brian are men.", ("mixed_we", "mixed_group1", "male_group2")),
+        ("i’m a man. my friend charles is a man but my friends olivia and sophia are women.", ("mixed_we", "male_group1", "female_group2")),
+        ("i’m a man. my friends charles and john are men but my friend sophia is a woman.", ("mixed_we", "male_group1", "mixed_group2")),
+        ("i’m a man. my friends charles, john and brian are men.", ("male_we", "male_group1", "male_group2")),
+    ],
+}
+
+class SubjectClassifier:
+    def __init__(self, patterns):
+        # The position of each phrase in the table, the first one for a repeated phrase.
+        self.priorities = {}
+        for priority, (phrase, _) in enumerate(patterns):
+            self.priorities.setdefault(phrase, priority)
+        self.subjects = [subject for _, subject in patterns]
+        # Without groups, the regular expression only tries the phrases at positions where
+        # one of them can start.
+        self.regex = re.compile("|".join(re.escape(phrase) for phrase, _ in patterns))
+
+    def classify(self, text):
+        # The subject of the first phrase of the table that appears in the text. The search
+        # goes on from the character after each match, so that a phrase inside a longer one
+        # is also found.
+        text = text.lower()
+        first = None
+        match = self.regex.search(text)
+        while match is not None:
+            priority = self.priorities[match.group()]
+            if first is None or priority < first:
+                first = priority
+                if first == 0:
+                    break
+            match = self.regex.search(text, match.start() + 1)
+        if first is None:
+            return None
+        subject = self.subjects[first]
+        # The subjects of examples with several groups of people are lists, one per group.
+        return list(subject) if isinstance(subject, tuple) else subject
+
+classifiers = {section: SubjectClassifier(patterns) for section, patterns in SUBJECT_PATTERNS.items()}
+
+def classify(section, text):
+    return classifiers[section].classify(text)
+
+def report_unmatched(grader, section, subjects):
+    # Warns about the examples of a section that match none of its phrases.
+    unmatched = [i for i, subject in enumerate(subjects) if subject is None]
+    if unmatched:
+        spec = SuiteSections.section_spec(grader, section)
+        start = spec["start"] if spec is not None else 0
+        line_numbers = ", ".join(str(start + i + 1) for i in unmatched)
+        warnings.warn(f"Examples of the {section} section which match no subject are not graded by the {grader} grader: lines {line_numbers}", stacklevel=3)
+    return unmatched
@@ -0,0 +1,69 @@
+import json
+import os
+
+"""
+    This program loads the section manifest of the test suite, sections.json, which
+    describes which lines of the test suite each grader grades and how. The pronoun
+    grader grades the only_they, singular_we and we_they sections and the adjective
+    grader the singular_we, we_they and names sections. Each section is given as a range
+    of lines, from "start" (counted from 0) up to but not including "end", and the
+    adjective sections also give the number of adjectives describing the subject(s) in
+    each of their examples. "suite_length" is the number of lines in one copy of the
+    test suite.
+
+    The manifest is loaded once and shared by all the graders. An extended test suite, or
+    a shard of one, can be graded by writing a manifest for it and choosing it with
+    set_manifest or with the GENDERQUEER_SECTIONS environment variable.
+"""
+
+DEFAULT_MANIFEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sections.json")
+GRADERS = ["pronouns", "adjectives"]
+
+manifest_path = os.environ.get("GENDERQUEER_SECTIONS", DEFAULT_MANIFEST_PATH)
+manifest = None
+
+def load_manifest(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        loaded = json.load(f)
+    suite_length = loaded["suite_length"]
+    for grader in GRADERS:
+        for section, spec in loaded.get(grader, {}).items():
+            if not 0 <= spec["start"] <= spec["end"] <= suite_length:
+                raise ValueError(f"The lines of the {grader} section '{section}' in {file_path} should be within 0 and {suite_length}")
+    return loaded
+
+def set_manifest(file_path):
+    global manifest_path, manifest
+    manifest_path = file_path
+    manifest = None
+
+def get_manifest():
+    global manifest
+    if manifest is None:
+        manifest = load_manifest(manifest_path)
+    return manifest
+
+def suite_length():
+    return get_manifest()["suite_length"]
+
+def section_spec(grader, section):
+    return get_manifest().get(grader, {}).get(section)
+
+def split_sections(lines, grader, sections):
+    # The lines of each of the given sections, in that order. A section which is not in
+    # the manifest has no lines.
+    section_lines = []
+    for section in sections:
+        spec = section_spec(grader, section)
+        section_lines.append(lines[spec["start"]:spec["end"]] if spec is not None else lines[:0])
+    return tuple(section_lines)
+
+def build_routes():
+    # The section of each grader that each line of the test suite belongs to, as a tuple
+    # (pronoun section, adjective section) per line, None where a grader skips the line.
+    routes = [[None] * len(GRADERS) for _ in range(suite_length())]
+    for i, grader in enumerate(GRADERS):
+        for section, spec in get_manifest().get(grader, {}).items():
+            for position in range(spec["start"], spec["end"]):
+                routes[position][i] = section
+    return [tuple(route) for route in routes]
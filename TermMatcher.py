@@ -0,0 +1,72 @@
+from collections import deque
+
+class TermMatcher:
+    """
+    This class finds all occurrences of a fixed set of terms in a text in a single pass
+    over the text, using an Aho–Corasick automaton which is built once from the terms.
+    The time it takes to search a text therefore depends on the length of the text and
+    the number of matches, not on the number of terms, which allows the terminology
+    database to grow without slowing down the grading.
+
+    With word_boundaries=True, a term is only matched as a whole word (or words), i.e.
+    when it is neither preceded nor followed by a letter, digit or underscore. Otherwise
+    terms are matched anywhere in the text, like the substring checks of the graders.
+    """
+
+    def __init__(self, terms, word_boundaries=False):
+        self.word_boundaries = word_boundaries
+        self.transitions = [{}]
+        self.outputs = [()]
+        for term in terms:
+            self.add_term(term)
+        self.failures = self.build_failures()
+
+    def add_term(self, term):
+        state = 0
+        for character in term:
+            if character not in self.transitions[state]:
+                self.transitions.append({})
+                self.outputs.append(())
+                self.transitions[state][character] = len(self.transitions) - 1
+            state = self.transitions[state][character]
+        if term not in self.outputs[state]:
+            self.outputs[state] += (term,)
+
+    def build_failures(self):
+        # Breadth-first, so that the failure state of every state is known before the
+        # states below it are visited. Each state also inherits the terms of its failure
+        # state, which are the terms ending in a proper suffix of the state.
+        failures = [0] * len(self.transitions)
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for character, next_state in self.transitions[state].items():
+                failure = failures[state]
+                while failure and character not in self.transitions[failure]:
+                    failure = failures[failure]
+                failures[next_state] = self.transitions[failure].get(character, 0)
+                self.outputs[next_state] += self.outputs[failures[next_state]]
+                queue.append(next_state)
+        return failures
+
+    def is_word_boundary(self, text, start, end):
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        return not (before.isalnum() or before == "_") and not (after.isalnum() or after == "_")
+
+    def find(self, text):
+        # Yields (start, end, term) for every occurrence of a term, overlapping ones included.
+        transitions = self.transitions
+        failures = self.failures
+        state = 0
+        for i, character in enumerate(text):
+            while state and character not in transitions[state]:
+                state = failures[state]
+            state = transitions[state].get(character, 0)
+            for term in self.outputs[state]:
+                start = i + 1 - len(term)
+                if not self.word_boundaries or self.is_word_boundary(text, start, i + 1):
+                    yield start, i + 1, term
+
+    def find_all(self, text):
+        return {term for _, _, term in self.find(text)}
@@ -0,0 +1,159 @@
+from array import array
+from itertools import chain, repeat
+
+import numpy as np
+
+from PronounCounters import PRONOUN_CATEGORIES, Category, COUNT_TYPE, CORRECT_TYPE, by_name
+from PronounTranslationGrader import PRONOUNS, SECTIONS, split_sections, analyze_source, compute_accuracies, pronoun_tokens, scored_tokens, graded_references
+
+"""
+    This program grades the translation of "they" like PronounTranslationGrader.py, but
+    for many translations at once using NumPy. The grading is split in two.
+
+    The English examples are compiled once into two weight arrays over the lines of the
+    test suite and the pronoun categories: the points each line adds to the total of each
+    category, and the points each occurrence of a pronoun (þær, þeir, þau, hán, hún, hann)
+    in the translation of the line adds to the correct translations of each category. The
+    arrays hold the labels of the examples, e.g. a translation of an example about trans
+    women only scores in the feminine, feminine_trans, long and children/nochildren
+    categories, and only for occurrences of "þær".
+
+    Each translation is then tokenized and encoded as an array of pronoun ids, which are
+    counted per line in a single pass. The scores of all categories of all translations are
+    the product of the counts and the weights. They are the same as those of
+    PronounTranslationGrader.py.
+"""
+
+# Every other token is encoded as 0.
+PRONOUN_IDS = {pronoun: i for i, pronoun in enumerate(PRONOUNS, 1)}
+
+# The gender, the specification and the expected translation of "they" for each subject.
+PLURAL_SUBJECTS = {
+    "female_plural_unspecified": ("feminine", "unspecified", "þær"),
+    "female_plural_trans": ("feminine", "trans", "þær"),
+    "female_plural_cis": ("feminine", "cis", "þær"),
+    "male_plural_unspecified": ("masculine", "unspecified", "þeir"),
+    "male_plural_trans": ("masculine", "trans", "þeir"),
+    "male_plural_cis": ("masculine", "cis", "þeir"),
+    "mixed_unspecified": ("neuter", "unspecified", "þau"),
+    "mixed_trans": ("neuter", "trans", "þau"),
+    "mixed_cis": ("neuter", "cis", "þau"),
+    "mixed_trans_cis": ("neuter", "cis_and_trans", "þau"),
+}
+# The translations of the singular "they" given full and half points.
+SINGULAR_SUBJECTS = {"non-binary": ("hán", "þau"), "female_singular": ("hún", "þær"), "male_singular": ("hann", "þeir")}
+WE_THEY_SUBJECTS = {"female_they": ("feminine", "þær"), "male_they": ("masculine", "þeir"), "mixed_they": ("neuter", "þau")}
+
+def line_rules(section, line_source):
+    # The scoring of one line as (category, points added to the total, points per pronoun).
+    if section == "only_they":
+        pronoun, sentence_count, has_children = line_source
+        if pronoun not in PLURAL_SUBJECTS:
+            return []
+        gender, specification, expected = PLURAL_SUBJECTS[pronoun]
+        if sentence_count < 3:
+            # The short examples of mixed groups of cis and trans people are not graded.
+            if specification == "cis_and_trans":
+                return []
+            return [("short", 1, {expected: 1})]
+        children = "children" if has_children else "nochildren"
+        return [(category, 2, {expected: 1}) for category in (f"{gender}_{specification}_{children}", gender, f"{gender}_{specification}", "long")]
+
+    elif section == "singular_we":
+        pronoun, has_children = line_source
+        if pronoun not in SINGULAR_SUBJECTS:
+            return []
+        full, half = SINGULAR_SUBJECTS[pronoun]
+        children = "singular_they_children" if has_children else "singular_they_nochildren"
+        return [(category, 2, {full: 1, half: 0.5}) for category in (children, "singular_they", "long")]
+
+    elif section == "we_they":
+        if line_source is None or line_source[1] not in WE_THEY_SUBJECTS:
+            return []
+        gender, expected = WE_THEY_SUBJECTS[line_source[1]]
+        return [(category, 1, {expected: 1}) for category in (gender, f"{gender}_unspecified", "long")]
+
+def accept_references(rules, accepted):
+    # The pronouns used in a reference translation of the line (see References.py) score
+    # like the one expected.
+    return [(category, count, dict(points, **dict.fromkeys(accepted, max(points.values())))) for category, count, points in rules]
+
+def build_weights(source_analysis, references=None):
+    line_rule_lists = []
+    sentence_counts = []
+    # The translations in the singular_we and we_they sections are compared to the number
+    # of sentences in the last example of the only_they section.
+    last_sentence_count = source_analysis["only_they"][-1][1] if source_analysis["only_they"] else None
+    section_accepted = split_sections(references["pronouns"]) if references is not None else repeat(None)
+    for section, accepted in zip(SECTIONS, section_accepted):
+        for line_source, line_references in zip(source_analysis[section], accepted or repeat(None)):
+            rules = line_rules(section, line_source)
+            line_accepted = graded_references(section, line_source, line_references, last_sentence_count) if line_references else None
+            line_rule_lists.append(accept_references(rules, line_accepted) if line_accepted else rules)
+            if section == "only_they":
+                # The short examples are tokenized in full.
+                sentence_counts.append(line_source[1] if line_source[1] >= 3 else None)
+            else:
+                sentence_counts.append(last_sentence_count)
+
+    count_weights = np.zeros((len(line_rule_lists), len(PRONOUN_CATEGORIES)))
+    correct_weights = np.zeros((len(line_rule_lists), len(PRONOUN_CATEGORIES), len(PRONOUNS) + 1))
+    for i, rules in enumerate(line_rule_lists):
+        for category, count, points in rules:
+            count_weights[i, Category[category]] += count
+            for pronoun, point in points.items():
+                correct_weights[i, Category[category], PRONOUN_IDS[pronoun]] += point
+
+    return {
+        "sentence_counts": sentence_counts,
+        "count_weights": count_weights,
+        "correct_weights": correct_weights,
+    }
+
+def total_counts(weights, line_count):
+    # The totals of the categories over the lines that have been translated.
+    return array(COUNT_TYPE, weights["count_weights"][:line_count].sum(axis=0).astype(int).tolist())
+
+def section_lines(icelandic_lines):
+    return [line for lines in split_sections(icelandic_lines) for line in lines]
+
+def encode_lines(icelandic_lines, sentence_counts, pronoun_forms=None):
+    # The pronoun ids of every token of every line, with the index of the line of each token.
+    line_tokens = [pronoun_tokens(ice_line, pronoun_forms) if sentence_count is None else scored_tokens(ice_line, sentence_count, pronoun_forms)
+                   for ice_line, sentence_count in zip(icelandic_lines, sentence_counts)]
+    token_ids = np.fromiter(map(PRONOUN_IDS.get, chain.from_iterable(line_tokens), repeat(0)), dtype=np.intp)
+    return token_ids, np.repeat(np.arange(len(line_tokens)), [len(ice_tokens) for ice_tokens in line_tokens])
+
+def count_pronouns(pronoun_lines, weights, pronoun_forms=None):
+    # The number of occurrences of each pronoun in the translation of each line of the
+    # three sections, as an array of shape (lines, pronouns + 1).
+    sentence_counts = weights["sentence_counts"]
+    token_ids, token_lines = encode_lines(pronoun_lines, sentence_counts, pronoun_forms)
+    width = len(PRONOUNS) + 1
+    counts = np.bincount(token_lines * width + token_ids, minlength=len(sentence_counts) * width)
+    return counts.reshape(len(sentence_counts), width)
+
+def grade_systems(systems_lines, weights, pronoun_forms=None):
+    # Grades the translations of several systems, each given as a list of lines, and
+    # returns the (pronoun_counts, pronoun_correct) of each system. pronoun_forms is that
+    # of the language pack of the translations, see PronounTranslationGrader.pronoun_tokens.
+    if not systems_lines:
+        return []
+    systems_pronoun_lines = [section_lines(icelandic_lines) for icelandic_lines in systems_lines]
+    pronoun_occurrences = np.stack([count_pronouns(pronoun_lines, weights, pronoun_forms) for pronoun_lines in systems_pronoun_lines])
+    correct = np.tensordot(pronoun_occurrences, weights["correct_weights"], axes=([1, 2], [0, 2]))
+    return [(total_counts(weights, len(pronoun_lines)), array(CORRECT_TYPE, row.tolist())) for pronoun_lines, row in zip(systems_pronoun_lines, correct)]
+
+def analyze_translations(icelandic_lines_only_they, english_lines_only_they, icelandic_lines_singular_we, english_lines_singular_we, icelandic_lines_we_they, english_lines_we_they, source_analysis=None, references=None, pronoun_forms=None):
+    if source_analysis is None:
+        source_analysis = analyze_source(english_lines_only_they, english_lines_singular_we, english_lines_we_they)
+    weights = build_weights(source_analysis, references)
+
+    pronoun_lines = icelandic_lines_only_they + icelandic_lines_singular_we + icelandic_lines_we_they
+    pronoun_occurrences = count_pronouns(pronoun_lines, weights, pronoun_forms)
+    correct = np.tensordot(pronoun_occurrences, weights["correct_weights"], axes=([0, 1], [0, 2]))
+    pronoun_counts = total_counts(weights, len(pronoun_lines))
+    pronoun_correct = array(CORRECT_TYPE, correct.tolist())
+
+    # The counters by category name, like those of PronounTranslationGrader.analyze_translations.
+    return compute_accuracies(pronoun_counts, pronoun_correct), by_name(pronoun_counts), by_name(pronoun_correct)
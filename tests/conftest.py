@@ -0,0 +1,35 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+REPOSITORY_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY_DIRECTORY)
+
+# The language packs and the example index are kept in a cache of their own during the
+# tests rather than in the user's cache. It has to be chosen before the graders are
+# imported, since they read it at import time.
+cache_directory = tempfile.mkdtemp(prefix="genderqueer-tests-")
+os.environ["GENDERQUEER_CACHE"] = cache_directory
+
+def pytest_unconfigure(config):
+    shutil.rmtree(cache_directory, ignore_errors=True)
+
+@pytest.fixture(autouse=True)
+def repository_directory(monkeypatch):
+    # The graders open english_examples.txt and the databases relative to the working
+    # directory by default.
+    monkeypatch.chdir(REPOSITORY_DIRECTORY)
+    return REPOSITORY_DIRECTORY
+
+@pytest.fixture
+def regex_tokenizer():
+    # The regex backend, which does not need NLTK's Punkt model, for tests which only need
+    # some backend.
+    import Tokenizer
+    backend = Tokenizer.get_backend()
+    Tokenizer.set_backend("regex")
+    yield "regex"
+    Tokenizer.set_backend(backend)
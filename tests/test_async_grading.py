@@ -0,0 +1,30 @@
+import asyncio
+import random
+
+import BatchTranslationGrader
+from AsyncTranslationGrader import grade_async
+
+async def iter_hypotheses(pairs):
+    for line_no, hypothesis in pairs:
+        yield line_no, hypothesis
+
+async def collect(pairs, report_every):
+    return [partial async for partial in grade_async(iter_hypotheses(pairs), report_every=report_every)]
+
+def test_async_grading_gives_the_serial_scores(regex_tokenizer):
+    with open("gold_standard.txt", 'r', encoding='utf-8') as f:
+        gold_lines = f.readlines()
+    # The lines in a shuffled order, with a few of them sent first with the wrong pronoun
+    # and then again with the translation which replaces it.
+    pairs = list(enumerate(gold_lines, 1))
+    random.Random(13).shuffle(pairs)
+    resent = [(line_no, hypothesis.replace("hán", "hún").replace("Hán", "Hún")) for line_no, hypothesis in pairs[:20]]
+    partials = asyncio.run(collect(resent + pairs, report_every=50))
+
+    state = BatchTranslationGrader.load_shared_state()
+    final = partials[-1]
+    assert final.complete
+    assert final.lines_graded == len(gold_lines)
+    assert final.result == BatchTranslationGrader.grade_translation("partial", gold_lines, state)
+    assert len(partials) == len(resent + pairs) // 50 + 1
+    assert not any(partial.complete for partial in partials[:-1])
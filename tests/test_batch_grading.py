@@ -0,0 +1,103 @@
+import json
+import shutil
+import sys
+
+import pytest
+
+import BatchTranslationGrader
+import Tokenizer
+
+# A translation of the test suite which differs from the gold standard on every third line,
+# with pronouns, adjectives and terms replaced by wrong or inappropriate ones.
+SUBSTITUTIONS = [
+    ("þau", "þeir"),
+    ("Þau", "Þær"),
+    ("hán", "hún"),
+    ("Hán", "Hann"),
+    ("gáfaðar", "gáfaðir"),
+    ("dónaleg", "dónalegar"),
+    ("trans kona", "kynskiptingur"),
+    ("samkynhneigðir", "hommar"),
+    ("tvíkynhneigð", "kynvillingar"),
+]
+
+# The (correct, total) of the columns of the score table, by system.
+EXPECTED_SCORES = {
+    "gold_standard": {
+        "overall_pronoun_accuracy": (460, 460),
+        "long_accuracy": (444, 444),
+        "short_accuracy": (16, 16),
+        "singular_they_accuracy": (84, 84),
+        "feminine_pronoun_accuracy": (108, 108),
+        "masculine_pronoun_accuracy": (102, 102),
+        "neuter_pronoun_accuracy": (150, 150),
+        "adjectives_accuracy": (306, 306),
+        "terminology_accuracy": (283, 283),
+        "inappropriate_terminology": (0, 283),
+    },
+    "perturbed": {
+        "overall_pronoun_accuracy": (423, 460),
+        "long_accuracy": (407, 444),
+        "short_accuracy": (16, 16),
+        "singular_they_accuracy": (76, 84),
+        "feminine_pronoun_accuracy": (108, 108),
+        "masculine_pronoun_accuracy": (102, 102),
+        "neuter_pronoun_accuracy": (121, 150),
+        "adjectives_accuracy": (300, 306),
+        "terminology_accuracy": (268, 283),
+        "inappropriate_terminology": (20, 283),
+    },
+}
+
+GRADING_OPTIONS = {
+    "serial": [],
+    "workers": ["--workers", "2"],
+    "vectorized": ["--vectorized"],
+}
+
+def perturb(line_no, line):
+    if line_no % 3 == 0:
+        for form, replacement in SUBSTITUTIONS:
+            line = line.replace(form, replacement, 1)
+    return line
+
+def punkt_available():
+    try:
+        Tokenizer.nltk_sent_tokenize("They are my neighbors. They have two children.")
+    except (ImportError, LookupError):
+        return False
+    return True
+
+@pytest.fixture
+def systems_directory(tmp_path, repository_directory):
+    systems = tmp_path / "systems"
+    systems.mkdir()
+    shutil.copy("gold_standard.txt", systems / "gold_standard.txt")
+    with open("gold_standard.txt", 'r', encoding='utf-8') as f:
+        perturbed_lines = [perturb(line_no, line) for line_no, line in enumerate(f, 1)]
+    with open(systems / "perturbed.txt", 'w', encoding='utf-8') as f:
+        f.writelines(perturbed_lines)
+    return systems
+
+@pytest.fixture(params=["regex", "nltk"])
+def tokenizer_backend(request):
+    if request.param == "nltk" and not punkt_available():
+        pytest.skip("NLTK or its Punkt model is not installed")
+    backend = Tokenizer.get_backend()
+    yield request.param
+    Tokenizer.set_backend(backend)
+
+@pytest.mark.parametrize("grading", sorted(GRADING_OPTIONS))
+def test_grading_paths_give_the_baseline_scores(grading, tokenizer_backend, systems_directory, tmp_path, monkeypatch):
+    output_file = tmp_path / "scores.json"
+    monkeypatch.setattr(sys, "argv", ["BatchTranslationGrader.py", str(systems_directory), "--tokenizer", tokenizer_backend,
+                                      "--format", "json", "--output", str(output_file)] + GRADING_OPTIONS[grading])
+    BatchTranslationGrader.main()
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        results = json.load(f)
+    scores = {}
+    for result in results:
+        by_category = {(score["grader"], score["category"]): score for score in result["scores"]}
+        scores[result["system"]] = {column: (by_category[key]["correct"], by_category[key]["total"]) for column, key in BatchTranslationGrader.TABLE_COLUMNS.items()}
+    assert scores == EXPECTED_SCORES
@@ -0,0 +1,34 @@
+import json
+
+import DiagnosticIndex
+from LGBTQAITranslationGrader import RULES_KEY
+from StreamingTranslationGrader import StreamingTranslationGrader, summarize_copies
+
+CUSTOM_RULE = {
+    "name": "trans_kona",
+    "forms": ["trans kona"],
+    "points": 0.25,
+    "kind": "custom",
+    "detail": "Custom (test): '{term}' translated as '{acceptable}'",
+}
+
+def test_term_evidence_holds_the_points_of_the_scoring_rules(regex_tokenizer, tmp_path):
+    with open("terminology.json", 'r', encoding='utf-8') as f:
+        terminology_db = json.load(f)
+    terminology_db[RULES_KEY].insert(0, CUSTOM_RULE)
+    terminology_file = tmp_path / "terminology.json"
+    with open(terminology_file, 'w', encoding='utf-8') as f:
+        json.dump(terminology_db, f, ensure_ascii=False)
+
+    grader = StreamingTranslationGrader(terminology_file=str(terminology_file))
+    with open("english_examples.txt", 'r', encoding='utf-8') as f:
+        english_lines = f.readlines()
+    with DiagnosticIndex.DiagnosticIndex(str(tmp_path / "diagnostics.sqlite")) as index:
+        index.add_system("gold_standard.txt", grader, english_lines)
+        custom_records = index.query(grader="terminology", category="custom")
+        points = sum(row["points"] for category in ("correct", "custom", "warning") for row in index.summary("terminology", category))
+
+    assert custom_records
+    assert {(row["item"], row["matched"], row["points"]) for row in custom_records} == {("trans woman", "trans kona", 0.25)}
+    result, = summarize_copies(grader.grade_files("english_examples.txt", "gold_standard.txt"), "gold_standard.txt", grader.terminology_grader)
+    assert points == result.score("terminology", "correct").correct
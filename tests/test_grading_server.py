@@ -0,0 +1,67 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import BatchTranslationGrader
+import SuiteSections
+from GradingServer import LocalGradingClient, create_server
+
+# Requests which are valid JSON but not a translation of the test suite.
+WRONGLY_SHAPED_PAYLOADS = [
+    [],
+    {},
+    {"hypotheses": "Þau eiga tvö börn."},
+    {"hypotheses": ["Þau eiga tvö börn."]},
+    {"translations": ["Þau eiga tvö börn."]},
+    {"translations": {"system": None}},
+    {"translations": {"system": [1] * SuiteSections.suite_length()}},
+]
+
+@pytest.fixture
+def state(regex_tokenizer):
+    return BatchTranslationGrader.load_shared_state()
+
+@pytest.fixture
+def gold_lines():
+    with open("gold_standard.txt", 'r', encoding='utf-8') as f:
+        return f.readlines()
+
+def test_local_client_gives_the_scores_of_the_batch_grader(state, gold_lines):
+    client = LocalGradingClient(state)
+    expected = BatchTranslationGrader.grade_translation("gold_standard", gold_lines, state)
+    assert client.grade(gold_lines, "gold_standard") == expected
+    perturbed_lines = [line.replace("hán", "hún") for line in gold_lines]
+    assert client.grade_batch({"gold_standard": gold_lines, "perturbed": perturbed_lines}) == [
+        expected, BatchTranslationGrader.grade_translation("perturbed", perturbed_lines, state)]
+
+@pytest.mark.parametrize("data", [b'{"hypotheses": [', b"hypotheses", b"", "{\"system\": \"þýðing\"}".encode('latin-1')])
+def test_malformed_json_is_answered_with_400(state, data):
+    status, body = LocalGradingClient(state).request(data)
+    assert status == 400
+    assert body["error"]
+
+@pytest.mark.parametrize("payload", WRONGLY_SHAPED_PAYLOADS)
+def test_wrongly_shaped_payloads_are_answered_with_400(state, payload):
+    client = LocalGradingClient(state)
+    status, body = client.request(json.dumps(payload).encode('utf-8'))
+    assert status == 400
+    assert body["error"]
+    with pytest.raises(ValueError):
+        client.post(payload)
+
+def test_server_answers_malformed_json_with_400(state):
+    server = create_server(state, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        request = urllib.request.Request(f"http://127.0.0.1:{server.server_address[1]}/grade", data=b'{"hypotheses": [')
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(request, timeout=10)
+        assert error.value.code == 400
+        assert json.loads(error.value.read())["error"]
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,76 @@
+import pytest
+
+import BatchTranslationGrader
+import LanguagePacks
+from StreamingTranslationGrader import StreamingTranslationGrader, summarize_copies
+
+# A pack whose feminine and masculine plural pronouns are swapped, so that a translation is
+# graded differently than with the Icelandic pack.
+SWAPPED_PACK = {
+    "name": "Icelandic, swapped plurals",
+    "pronouns": {
+        "feminine_plural": ["þeir"],
+        "masculine_plural": ["þær"],
+        "neuter_plural": ["þau"],
+        "neuter_singular": ["hán"],
+        "feminine_singular": ["hún"],
+        "masculine_singular": ["hann"],
+    },
+    "adjectives": "adjectives.json",
+    "terminology": "terminology.json",
+}
+SWAPPED_FORMS = [("þær", "\0"), ("Þær", "\1"), ("þeir", "þær"), ("Þeir", "Þær"), ("\0", "þeir"), ("\1", "Þeir")]
+
+def swap_plurals(line):
+    for form, replacement in SWAPPED_FORMS:
+        line = line.replace(form, replacement)
+    return line
+
+def pronoun_scores(result):
+    return {score.category: (score.correct, score.total) for score in result.scores if score.grader == "pronouns"}
+
+@pytest.fixture
+def swapped_pack(monkeypatch, repository_directory):
+    monkeypatch.setattr(LanguagePacks, "registered_packs", {})
+    monkeypatch.setattr(LanguagePacks, "language", LanguagePacks.language)
+    monkeypatch.setattr(LanguagePacks, "current_pack", LanguagePacks.current_pack)
+    LanguagePacks.register_language_pack("is-swapped", SWAPPED_PACK, repository_directory)
+    return "is-swapped"
+
+@pytest.fixture
+def systems(tmp_path):
+    systems = tmp_path / "systems"
+    systems.mkdir()
+    with open("gold_standard.txt", 'r', encoding='utf-8') as f:
+        gold_lines = f.readlines()
+    (systems / "gold_standard.txt").write_text("".join(gold_lines), encoding='utf-8')
+    (systems / "swapped.txt").write_text("".join(swap_plurals(line) for line in gold_lines), encoding='utf-8')
+    return systems
+
+def grade(systems, system, language, grading):
+    # The translation of the system graded with the given pack, after a pack for the
+    # other language has been loaded.
+    if grading == "streaming":
+        grader = StreamingTranslationGrader(language=language)
+        StreamingTranslationGrader(language="is-swapped" if language == "is" else "is")
+        system_file = str(systems / f"{system}.txt")
+        result, = summarize_copies(grader.grade_files("english_examples.txt", system_file), system_file, grader.terminology_grader)
+        return pronoun_scores(result)
+    state = BatchTranslationGrader.load_shared_state(language=language)
+    BatchTranslationGrader.load_shared_state(language="is-swapped" if language == "is" else "is")
+    if grading == "vectorized":
+        pronoun_partials, = BatchTranslationGrader.grade_pronouns_vectorized([str(systems / f"{system}.txt")], state)
+        return pronoun_scores(BatchTranslationGrader.grade_system(str(systems / f"{system}.txt"), state, pronoun_partials))
+    return pronoun_scores(BatchTranslationGrader.grade_system(str(systems / f"{system}.txt"), state))
+
+@pytest.mark.parametrize("grading", ["serial", "vectorized", "streaming"])
+def test_two_packs_are_graded_in_the_same_process(grading, regex_tokenizer, swapped_pack, systems):
+    gold = grade(systems, "gold_standard", "is", grading)
+    assert gold["feminine"] == (108, 108)
+    assert gold["masculine"] == (102, 102)
+    # The pronouns of a translation are read with the pack it was graded with, not with
+    # the pack loaded last.
+    assert grade(systems, "swapped", "is-swapped", grading) == gold
+    swapped = grade(systems, "gold_standard", "is-swapped", grading)
+    assert swapped["feminine"][0] < 108 and swapped["masculine"][0] < 102
+    assert grade(systems, "swapped", "is", grading) == swapped
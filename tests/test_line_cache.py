@@ -0,0 +1,56 @@
+import pytest
+
+import LineCache
+from StreamingTranslationGrader import StreamingTranslationGrader, summarize_copies
+
+# A line of the we_they section, graded by all three graders, and a translation of it with
+# the wrong pronoun and adjectives.
+LINE_NO = 300
+
+def grade(translation_file, cache=None):
+    grader = StreamingTranslationGrader(cache=cache)
+    line_results = list(grader.grade_files("english_examples.txt", translation_file))
+    row, = summarize_copies(line_results, translation_file, grader.terminology_grader)
+    return line_results, row
+
+@pytest.fixture
+def gold_lines():
+    with open("gold_standard.txt", 'r', encoding='utf-8') as f:
+        return f.readlines()
+
+@pytest.fixture
+def translation_file(tmp_path, gold_lines):
+    translation_file = tmp_path / "translation.txt"
+    translation_file.write_text("".join(gold_lines), encoding='utf-8')
+    return str(translation_file)
+
+def test_a_cached_line_is_graded_as_before(regex_tokenizer, tmp_path, translation_file):
+    cache_file = str(tmp_path / "grades.sqlite")
+    with LineCache.LineCache(cache_file) as cache:
+        first_results, first_row = grade(translation_file, cache)
+        assert cache.misses > 0
+
+    with LineCache.LineCache(cache_file) as cache:
+        second_results, second_row = grade(translation_file, cache)
+        assert cache.misses == 0
+        assert cache.hits > 0
+    assert second_results == first_results
+    assert second_row == first_row == grade(translation_file)[1]
+
+def test_a_changed_line_is_graded_again(regex_tokenizer, tmp_path, translation_file, gold_lines):
+    cache_file = str(tmp_path / "grades.sqlite")
+    with LineCache.LineCache(cache_file) as cache:
+        grade(translation_file, cache)
+
+    changed_line = gold_lines[LINE_NO - 1].replace("Þær", "Þeir").replace("hugrakkar", "hugrakkir")
+    assert changed_line != gold_lines[LINE_NO - 1]
+    with open(translation_file, 'w', encoding='utf-8') as f:
+        f.writelines(gold_lines[:LINE_NO - 1] + [changed_line] + gold_lines[LINE_NO:])
+
+    with LineCache.LineCache(cache_file) as cache:
+        results, row = grade(translation_file, cache)
+        # The pronoun, adjective and terminology grades of the changed line only.
+        assert cache.misses == 3
+    uncached_results, uncached_row = grade(translation_file)
+    assert results == uncached_results
+    assert row == uncached_row
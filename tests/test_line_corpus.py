@@ -0,0 +1,51 @@
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import LineCorpus
+from LineCorpus import LineCorpus as Corpus
+
+# Lines with Icelandic letters, a Windows line ending and no line break at the end.
+CONTENT = "Þau eiga tvö börn.\nHán er nágranni minn.\r\n\nÞær eru hugrakkar.".encode('utf-8')
+LINES = ["Þau eiga tvö börn.\n", "Hán er nágranni minn.\n", "\n", "Þær eru hugrakkar."]
+
+@pytest.fixture
+def corpus_file(tmp_path):
+    corpus_file = tmp_path / "corpus.txt"
+    corpus_file.write_bytes(CONTENT)
+    return str(corpus_file)
+
+@pytest.fixture
+def saved_index(monkeypatch, tmp_path):
+    # Every file is given a saved index.
+    monkeypatch.setattr(LineCorpus, "MIN_SAVED_SIZE", 0)
+    return str(tmp_path / "index")
+
+def test_lines_are_read_like_a_text_file(corpus_file):
+    corpus = Corpus(corpus_file)
+    assert list(corpus) == LINES
+    assert len(corpus) == len(LINES)
+    assert corpus[-1] == LINES[-1]
+    assert list(corpus[1:3]) == LINES[1:3]
+    assert corpus[:2] + corpus[3:] == LINES[:2] + LINES[3:]
+
+def test_a_corpus_has_the_same_lines_after_pickling_to_a_worker(corpus_file, saved_index):
+    corpus = Corpus(corpus_file, saved_index)
+    assert list(pickle.loads(pickle.dumps(corpus))) == LINES
+    # A worker which is not forked from this process opens the file again.
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        assert executor.submit(list, corpus).result() == LINES
+        assert executor.submit(list, corpus[1:]).result() == LINES[1:]
+
+def test_a_saved_index_is_replaced_when_the_file_changes(corpus_file, saved_index):
+    assert list(Corpus(corpus_file, saved_index)) == LINES
+    index_file = LineCorpus.index_path(corpus_file, saved_index)
+    assert os.path.exists(index_file)
+    assert list(Corpus(corpus_file, saved_index)) == LINES
+
+    with open(corpus_file, 'ab') as f:
+        f.write("\nÞeir eru fyndnir.\n".encode('utf-8'))
+    assert list(Corpus(corpus_file, saved_index)) == LINES[:-1] + [LINES[-1] + "\n", "Þeir eru fyndnir.\n"]
@@ -0,0 +1,51 @@
+import shutil
+
+import pytest
+
+import BatchTranslationGrader
+from StreamingTranslationGrader import StreamingTranslationGrader, summarize_copies
+
+# A singular "they" example, "This non-binary person is my neighbor. They live next door to
+# me. They have two children.", graded on its last two sentences, in which "hán" is given
+# full points and "þau" half points.
+LINE_NO = 170
+HALF_POINT_TRANSLATION = "Þessi kynsegin manneskja er nágranni minn. Þau búa við hliðina á mér. Þau eiga tvö börn.\n"
+# A reference which uses "þau" only in the first sentence, which is not graded.
+FIRST_SENTENCE_REFERENCE = "Þau segja að þessi kynsegin manneskja sé nágranni minn. Hán býr við hliðina á mér. Hán á tvö börn.\n"
+
+def write_with_line(path, line):
+    with open("gold_standard.txt", 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    lines[LINE_NO - 1] = line
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+    return str(path)
+
+def singular_they_points(systems, reference_files, grading):
+    if grading == "streaming":
+        grader = StreamingTranslationGrader(reference_files=reference_files)
+        system_file = str(systems / "half_points.txt")
+        result, = summarize_copies(grader.grade_files("english_examples.txt", system_file), system_file, grader.terminology_grader)
+    else:
+        result, = BatchTranslationGrader.grade_systems([str(systems)], reference_files=reference_files, vectorized=grading == "vectorized")
+    return result.score("pronouns", "singular_they").correct
+
+@pytest.fixture
+def systems(tmp_path):
+    systems = tmp_path / "systems"
+    systems.mkdir()
+    write_with_line(systems / "half_points.txt", HALF_POINT_TRANSLATION)
+    return systems
+
+@pytest.mark.parametrize("grading", ["serial", "vectorized", "streaming"])
+def test_a_pronoun_outside_the_graded_sentences_is_not_given_full_points(grading, regex_tokenizer, systems, tmp_path):
+    reference_file = write_with_line(tmp_path / "reference.txt", FIRST_SENTENCE_REFERENCE)
+    # The two half points lost to "þau".
+    assert singular_they_points(systems, None, grading) == 83
+    assert singular_they_points(systems, [reference_file], grading) == 83
+
+@pytest.mark.parametrize("grading", ["serial", "vectorized", "streaming"])
+def test_a_pronoun_of_the_graded_sentences_is_given_full_points(grading, regex_tokenizer, systems, tmp_path):
+    reference_file = tmp_path / "reference.txt"
+    shutil.copy(systems / "half_points.txt", reference_file)
+    assert singular_they_points(systems, [str(reference_file)], grading) == 84
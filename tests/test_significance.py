@@ -0,0 +1,43 @@
+import shutil
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import BatchTranslationGrader
+import Significance
+
+CATEGORIES = [("pronouns", "overall"), ("pronouns", "neuter"), ("adjectives", "overall"), ("terminology", "correct")]
+
+@pytest.fixture
+def systems(tmp_path):
+    systems = tmp_path / "systems"
+    systems.mkdir()
+    shutil.copy("gold_standard.txt", systems / "gold_standard.txt")
+    with open("gold_standard.txt", 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    # Wrong pronouns, adjectives and terms on every other line.
+    with open(systems / "perturbed.txt", 'w', encoding='utf-8') as f:
+        for line_no, line in enumerate(lines, 1):
+            if line_no % 2 == 0:
+                for form, replacement in [("þau", "þeir"), ("Þau", "Þeir"), ("hán", "hún"), ("Hán", "Hún"), ("gáfaðar", "gáfaðir"), ("trans kona", "kynskiptingur")]:
+                    line = line.replace(form, replacement)
+            f.write(line)
+    return str(systems)
+
+def test_p_values_are_the_same_for_the_same_seed(regex_tokenizer, systems):
+    comparison = Significance.compare_systems([systems], CATEGORIES, resamples=500, seed=7)
+    assert Significance.compare_systems([systems], CATEGORIES, resamples=500, seed=7) == comparison
+    # Each category is drawn with its own generator, whatever the other categories.
+    alone = Significance.compare_systems([systems], CATEGORIES[1:2], resamples=500, seed=7)
+    assert alone["categories"]["pronouns/neuter"] == comparison["categories"]["pronouns/neuter"]
+
+    neuter = comparison["categories"]["pronouns/neuter"]
+    assert neuter["bootstrap_p"][0][1] < 0.05 and neuter["randomization_p"][0][1] < 0.05
+    assert neuter["ci_low"][1] <= neuter["accuracy"][1] <= neuter["ci_high"][1]
+
+def test_accuracies_are_those_of_the_batch_grader(regex_tokenizer, systems):
+    comparison = Significance.compare_systems([systems], CATEGORIES, resamples=10, seed=7)
+    results = BatchTranslationGrader.grade_systems([systems])
+    for grader, category in CATEGORIES:
+        assert comparison["categories"][f"{grader}/{category}"]["accuracy"] == pytest.approx([result.accuracy(grader, category) for result in results])
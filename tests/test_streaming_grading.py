@@ -0,0 +1,39 @@
+import pytest
+
+import BatchTranslationGrader
+from StreamingTranslationGrader import StreamingTranslationGrader, summarize_copies
+
+def perturb(line_no, line):
+    # Wrong pronouns, adjectives and terms on every other line.
+    if line_no % 2 == 0:
+        for form, replacement in [("þau", "þeir"), ("hán", "hún"), ("gáfaðar", "gáfaðir"), ("trans kona", "kynskiptingur")]:
+            line = line.replace(form, replacement, 1)
+    return line
+
+@pytest.fixture
+def copies(tmp_path):
+    with open("gold_standard.txt", 'r', encoding='utf-8') as f:
+        gold_lines = f.readlines()
+    perturbed_lines = [perturb(line_no, line) for line_no, line in enumerate(gold_lines, 1)]
+    copies_file = tmp_path / "copies.txt"
+    copies_file.write_text("".join(gold_lines + perturbed_lines), encoding='utf-8')
+    return str(copies_file), [gold_lines, perturbed_lines]
+
+def test_streaming_gives_the_batch_scores_of_every_copy(regex_tokenizer, copies):
+    copies_file, copy_lines = copies
+    grader = StreamingTranslationGrader()
+    rows = list(summarize_copies(grader.grade_files("english_examples.txt", copies_file), copies_file, grader.terminology_grader))
+
+    state = BatchTranslationGrader.load_shared_state()
+    expected = [BatchTranslationGrader.grade_translation(f"copies/{copy_no}", lines, state) for copy_no, lines in enumerate(copy_lines, 1)]
+    assert rows == expected
+    assert rows[0].scores != rows[1].scores
+
+def test_a_short_english_file_is_rejected(regex_tokenizer, copies, tmp_path):
+    copies_file, _ = copies
+    with open("english_examples.txt", 'r', encoding='utf-8') as f:
+        english_lines = f.readlines()
+    english_file = tmp_path / "english_examples.txt"
+    english_file.write_text("".join(english_lines[:-1]), encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(StreamingTranslationGrader().grade_files(str(english_file), copies_file))
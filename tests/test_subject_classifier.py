@@ -0,0 +1,96 @@
+import pytest
+
+import PronounTranslationGrader
+import GenderedAdjectivesTranslationGrader
+from SubjectClassifier import SubjectClassifier
+
+# The if/elif chains which identified the subjects before SubjectClassifier, as their
+# phrases in the order they were tested, with the case they were written in. The we_they
+# and names chains of the adjective grader were matched against the English example as it
+# is, the others against the lowercased example. The we_they chain of the pronoun grader
+# held the same phrases as that of the adjective grader, lowercased.
+ONLY_THEY_CHAIN = [
+    ("these women", "female_plural_unspecified"),
+    ("these trans women", "female_plural_trans"),
+    ("these cis women", "female_plural_cis"),
+    ("these men", "male_plural_unspecified"),
+    ("these trans men", "male_plural_trans"),
+    ("these cis men", "male_plural_cis"),
+    ("this man and this woman", "mixed_unspecified"),
+    ("this woman and this man", "mixed_unspecified"),
+    ("this cis woman and this trans man", "mixed_trans_cis"),
+    ("this trans woman and this cis man", "mixed_trans_cis"),
+    ("this cis woman and this cis man", "mixed_cis"),
+    ("this trans woman and this trans man", "mixed_trans"),
+]
+SINGULAR_WE_CHAIN = [
+    ("non-binary person", "non-binary"),
+    ("genderqueer person", "non-binary"),
+    ("genderfluid person", "non-binary"),
+    ("this woman", "female_singular"),
+    ("this man", "male_singular"),
+    ("i’m a woman. my friends are women.", "female_plural"),
+    ("i’m a woman. my friends are men.", "mixed"),
+    ("i’m a woman. my friends are a woman and a man.", "mixed"),
+    ("i’m a man. my friends are men.", "male_plural"),
+    ("i’m a man. my friends are women.", "mixed"),
+    ("i’m a man. my friends are a woman and a man.", "mixed"),
+]
+WE_THEY_CHAIN = [
+    ("I’m a woman. My friends are women.", ["female_we", "female_they"]),
+    ("I’m a woman. My friends are men.", ["mixed_we", "male_they"]),
+    ("I’m a woman. My friends are a woman and a man.", ["mixed_we", "mixed_they"]),
+    ("I’m a man. My friends are men.", ["male_we", "male_they"]),
+    ("I’m a man. My friends are women.", ["mixed_we", "female_they"]),
+    ("I’m a man. My friends are a woman and a man.", ["mixed_we", "mixed_they"]),
+]
+NAMES_CHAIN = [
+    ("I’m a woman. My friends Mary, Olivia and Sophia are women.", ["female_we", "female_group1", "female_group2"]),
+    ("I’m a woman. My friends Mary and Sophia are women but my friend John is a man.", ["mixed_we", "female_group1", "mixed_group2"]),
+    ("I’m a woman. My friend Mary is a woman but my friends John and Brian are men.", ["mixed_we", "female_group1", "male_group2"]),
+    ("I’m a woman. My friend Charles is a man but my friends Olivia and Sophia are women.", ["mixed_we", "mixed_group1", "female_group2"]),
+    ("I’m a woman. My friends Charles and John are men but my friend Sophia is a woman.", ["mixed_we", "mixed_group1", "mixed_group2"]),
+    ("I’m a woman. My friends Charles, John and Brian are men.", ["mixed_we", "mixed_group1", "male_group2"]),
+    ("I’m a man. My friends Mary, Olivia and Sophia are women.", ["mixed_we", "mixed_group1", "female_group2"]),
+    ("I’m a man. My friends Mary and Sophia are women but my friend John is a man.", ["mixed_we", "mixed_group1", "mixed_group2"]),
+    ("I’m a man. My friend Mary is a woman but my friends John and Brian are men.", ["mixed_we", "mixed_group1", "male_group2"]),
+    ("I’m a man. My friend Charles is a man but my friends Olivia and Sophia are women.", ["mixed_we", "male_group1", "female_group2"]),
+    ("I’m a man. My friends Charles and John are men but my friend Sophia is a woman.", ["mixed_we", "male_group1", "mixed_group2"]),
+    ("I’m a man. My friends Charles, John and Brian are men.", ["male_we", "male_group1", "male_group2"]),
+]
+
+def baseline_subject(chain, text):
+    for phrase, subject in chain:
+        if phrase in text:
+            return subject
+    return None
+
+@pytest.fixture(scope="module")
+def english_lines():
+    with open("english_examples.txt", 'r', encoding='utf-8') as f:
+        return f.readlines()
+
+def test_pronoun_subjects_are_those_of_the_baseline(english_lines):
+    only_they, singular_we, we_they = PronounTranslationGrader.split_sections(english_lines)
+    for lines, identify, chain in [(only_they, PronounTranslationGrader.identify_subject_only_they, ONLY_THEY_CHAIN),
+                                   (singular_we, PronounTranslationGrader.identify_subject_only_we_or_singular, SINGULAR_WE_CHAIN),
+                                   (we_they, PronounTranslationGrader.identify_subject_we_and_they, [(phrase.lower(), subject) for phrase, subject in WE_THEY_CHAIN])]:
+        subjects = [identify(line.lower()) for line in lines]
+        assert subjects == [baseline_subject(chain, line.lower()) for line in lines]
+        assert lines and None not in subjects
+
+def test_adjective_subjects_are_those_of_the_baseline(english_lines):
+    singular_we, we_they, names = GenderedAdjectivesTranslationGrader.split_sections(english_lines)
+    for lines, identify, chain, lowercase in [(singular_we, GenderedAdjectivesTranslationGrader.identify_subject_only_we_or_singular, SINGULAR_WE_CHAIN, True),
+                                              (we_they, GenderedAdjectivesTranslationGrader.identify_subject_we_and_they, WE_THEY_CHAIN, False),
+                                              (names, GenderedAdjectivesTranslationGrader.identify_subject_names, NAMES_CHAIN, False)]:
+        texts = [line.lower() if lowercase else line for line in lines]
+        subjects = [identify(text) for text in texts]
+        assert subjects == [baseline_subject(chain, text) for text in texts]
+        assert lines and None not in subjects
+
+def test_a_phrase_inside_a_longer_one_is_found():
+    classifier = SubjectClassifier([("this woman", "female"), ("woman and this", "mixed")])
+    assert classifier.classify("This man and this woman and this man.") == "female"
+    assert classifier.classify("A woman and this man.") == "mixed"
+    assert classifier.classify("These men.") is None
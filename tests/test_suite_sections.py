@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+import BatchTranslationGrader
+import SuiteSections
+from StreamingTranslationGrader import StreamingTranslationGrader, summarize_copies
+
+def adjective_total(grading):
+    if grading == "streaming":
+        grader = StreamingTranslationGrader()
+        result, = summarize_copies(grader.grade_files("english_examples.txt", "gold_standard.txt"), "gold_standard.txt", grader.terminology_grader)
+    else:
+        with open("gold_standard.txt", 'r', encoding='utf-8') as f:
+            result = BatchTranslationGrader.grade_translation("gold_standard", f.readlines(), BatchTranslationGrader.load_shared_state())
+    score = result.score("adjectives", "overall")
+    return score.correct, score.total
+
+@pytest.fixture
+def manifest_file(tmp_path):
+    manifest_path = SuiteSections.manifest_path
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    manifest_file = tmp_path / "sections.json"
+    yield manifest, manifest_file
+    SuiteSections.set_manifest(manifest_path)
+
+@pytest.mark.parametrize("grading", ["serial", "streaming"])
+def test_a_section_manifest_override_is_honoured(grading, regex_tokenizer, manifest_file):
+    manifest, manifest_file = manifest_file
+    assert adjective_total(grading) == (306, 306)
+
+    # Without the names section, whose 12 examples have 3 adjectives each.
+    del manifest["adjectives"]["names"]
+    manifest_file.write_text(json.dumps(manifest), encoding='utf-8')
+    SuiteSections.set_manifest(str(manifest_file))
+    assert adjective_total(grading) == (270, 270)
+
+def test_a_section_outside_the_test_suite_is_rejected(manifest_file):
+    manifest, manifest_file = manifest_file
+    manifest["pronouns"]["we_they"]["end"] = manifest["suite_length"] + 1
+    manifest_file.write_text(json.dumps(manifest), encoding='utf-8')
+    SuiteSections.set_manifest(str(manifest_file))
+    with pytest.raises(ValueError):
+        SuiteSections.get_manifest()
@@ -0,0 +1,22 @@
+from TermMatcher import TermMatcher
+from LGBTQAITranslationGrader import LGBTQAITranslationGrader
+
+def test_whole_words_are_not_matched_inside_longer_words():
+    matcher = TermMatcher(["pan", "pansexual"], word_boundaries=True)
+    assert matcher.find_all("They are pansexual.") == {"pansexual"}
+    assert matcher.find_all("They are pan.") == {"pan"}
+
+def test_whole_words_are_matched_next_to_punctuation():
+    matcher = TermMatcher(["bi"], word_boundaries=True)
+    assert matcher.find_all("They are bi. They have two children.") == {"bi"}
+    assert matcher.find_all("They are bisexual.") == set()
+
+def test_substrings_are_matched_without_word_boundaries():
+    matcher = TermMatcher(["pan", "pankynhneigð"])
+    assert matcher.find_all("Þær eru pankynhneigðar.") == {"pan", "pankynhneigð"}
+    assert list(matcher.find("Þær eru pan.")) == [(8, 11, "pan")]
+
+def test_pan_is_not_identified_in_pansexual():
+    grader = LGBTQAITranslationGrader(show_details=False)
+    assert grader.identify_terms("These women are my neighbors. They are pansexual. They have two children.") == ["pansexual"]
+    assert grader.identify_terms("These women are my neighbors. They are bi. They have two children.") == ["bi"]